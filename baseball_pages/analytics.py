@@ -0,0 +1,129 @@
+# Page view logging that never makes the page wait
+# Events go into a small in-memory queue and a background thread picks them up in batches and sends each one
+# to the webhooks as the same form post main.py used to make (the webhooks see exactly what they always did)
+import atexit  # to flush what's left when the app shuts down
+import datetime  # for event timestamps
+import queue  # for the bounded event queue
+import threading  # for the background sender
+import time  # for batching waits and retry backoff
+import requests  # for sending the webhooks
+from baseball_pages import timing  # for the network stage timings
+
+# Webhooks that receive a copy of every page view
+ZAPIER = "https://hooks.zapier.com/hooks/catch/22833993/2nj036y/"
+N8N = "https://john-mcintosh-practice.app.n8n.cloud/webhook/387e4a84-07b9-402d-816d-3bae9d689d06"
+WEBHOOKS = [ZAPIER, N8N]
+
+# Zapier has always been sent "view" (except for the Dashboard) and its own name for the TSNE page;
+# its Zaps filter on these, so they're kept as they were
+ZAPIER_EVENTS = {"Dashboard": "View"}
+ZAPIER_PAGES = {"Year by Year TSNE": "Year-by-Year TSNE"}
+
+
+# Form fields posted to a webhook for one page view
+def form_payload(url, page, timestamp):
+    if url == ZAPIER:
+        return {"event": ZAPIER_EVENTS.get(page, "view"), "page viewed": ZAPIER_PAGES.get(page, page),
+                "timestamp": timestamp}
+    return {"event": "View", "page viewed": page, "timestamp": timestamp}
+
+
+class PageViewDispatcher:
+    # endpoints: webhook URLs, max_queue: events held before new ones are dropped,
+    # batch_size / batch_wait: how many events to group and how long to wait for more,
+    # timeout: seconds per request, retries / backoff: extra attempts and the first wait between them
+    def __init__(self, endpoints=None, max_queue=1000, batch_size=20, batch_wait=1.0,
+                 timeout=3.0, retries=3, backoff=0.5):
+        self.endpoints = list(WEBHOOKS if endpoints is None else endpoints)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.sessions = {url: requests.Session() for url in self.endpoints}  # One pooled connection per webhook
+        self.stats = {"queued": 0, "sent": 0, "dropped": 0, "failed": 0}  # Views queued / dropped, posts sent / failed
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="page-view-dispatcher", daemon=True)
+        self._thread.start()
+
+    # Add an event without ever blocking; if the queue is full the event is dropped
+    def track(self, page):
+        event = (page, datetime.datetime.utcnow().isoformat())  # Time of the view, not of the send
+        try:
+            self.queue.put_nowait(event)
+            self.stats["queued"] += 1
+            return True
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+    # Background loop: wait for one event, collect up to a batch, then send each event of it
+    def _run(self):
+        while not self._stop.is_set() or not self.queue.empty():
+            try:
+                batch = [self.queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            for page, timestamp in batch:
+                for url in self.endpoints:
+                    self._send(url, form_payload(url, page, timestamp))
+                self.queue.task_done()
+
+    # Post one page view as form fields over the webhook's pooled connection, retrying with backoff
+    def _send(self, url, payload):
+        for attempt in range(self.retries + 1):
+            try:
+                with timing.span("network", "page view webhook"):
+                    response = self.sessions[url].post(url, data=payload, timeout=self.timeout)
+                if response.status_code < 500 and response.status_code != 429:
+                    self.stats["sent" if response.ok else "failed"] += 1
+                    return response.ok
+            except requests.RequestException:
+                pass  # Network errors are retried like server errors
+            if attempt < self.retries and not self._stop.is_set():
+                time.sleep(self.backoff * (2 ** attempt))
+        self.stats["failed"] += 1
+        return False
+
+    # Wait until everything queued so far has been sent (or the timeout runs out)
+    def flush(self, timeout=5.0):
+        end = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < end:
+            time.sleep(0.05)
+        return self.queue.unfinished_tasks == 0
+
+    # Send what's left and stop the background thread
+    def close(self, timeout=5.0):
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout)
+        for session in self.sessions.values():
+            session.close()
+
+
+_dispatcher = None  # Shared dispatcher, started on the first page view
+_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = PageViewDispatcher()
+            atexit.register(_dispatcher.close, 2.0)
+        return _dispatcher
+
+
+# Log a page view in the background
+def track_page_view(page):
+    return get_dispatcher().track(page)
@@ -0,0 +1,177 @@
+# Downloads the data files from GitHub when they are missing or out of date
+# Files are fetched at the same time over one pooled session, streamed to a temp file and renamed into place,
+# and re-checked later with conditional requests so unchanged files cost one small 304 response.
+# Only files this module downloaded (and that nobody has changed since) are ever re-checked or replaced;
+# files that were built or edited locally are left alone.
+# Downloads are checked against the SHA-256 values in data/checksums.json (checked in next to the decade files)
+# before they replace anything. After updating the files on GitHub, refresh it with:
+#   python -m baseball_pages.bootstrap --write-checksums
+import os  # for file paths
+import json  # for the download metadata file
+import time  # for revalidation timing
+import hashlib  # for checksums
+import tempfile  # for temp download files
+import threading  # to guard the metadata file
+from concurrent.futures import ThreadPoolExecutor  # for downloading at the same time
+import requests  # for HTTP requests
+from requests.adapters import HTTPAdapter  # for connection pooling
+from baseball_pages import data_store  # for the data folder and file names
+from baseball_pages import timing  # for the network stage timings
+
+GITHUB_REPO = "https://raw.githubusercontent.com/jjjjmc2003/BaseballThesis/main/data/"
+META_FILE = ".downloads.json"  # ETag, Last-Modified and checksum of each downloaded file
+CHECKSUM_FILE = os.path.join(data_store.DATA_DIR, "checksums.json")  # Expected SHA-256 of each file on GitHub
+_lock = threading.Lock()
+
+
+# SHA-256 of a file on disk
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Expected SHA-256 of each file ({} if there's no checksum file)
+def load_checksums(path=CHECKSUM_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_meta(data_dir):
+    path = os.path.join(data_dir, META_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}  # A broken metadata file just means everything gets re-checked
+
+
+def save_meta(data_dir, meta):
+    path = os.path.join(data_dir, META_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# Session with enough pooled connections for every worker
+def make_session(workers):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Fetch one file; returns (status, detail, new metadata)
+# status is "downloaded", "not modified", "local" (a local file that isn't ours to replace), "cached" or "error"
+# A download whose SHA-256 isn't expected_sha256 (when given) is thrown away
+def fetch_file(session, base_url, data_dir, file_name, old, expected_sha256=None, timeout=15):
+    dest = os.path.join(data_dir, file_name)
+    headers = {}
+
+    # Only re-check a file we downloaded that still matches what we downloaded
+    if os.path.exists(dest):
+        if not old or old.get("sha256") != file_sha256(dest):
+            return "local", "", None
+        if old.get("etag"):
+            headers["If-None-Match"] = old["etag"]
+        if old.get("last_modified"):
+            headers["If-Modified-Since"] = old["last_modified"]
+
+    try:
+        with session.get(base_url + file_name, headers=headers, stream=True, timeout=timeout) as r:
+            if r.status_code == 304:
+                return "not modified", "", old
+            if r.status_code != 200:
+                return "error", f"HTTP {r.status_code}", old
+
+            # Stream into a temp file next to the destination, hashing as we go
+            h = hashlib.sha256()
+            size = 0
+            fd, tmp = tempfile.mkstemp(dir=data_dir, prefix=f".{file_name}.", suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+                        h.update(chunk)
+                        size += len(chunk)
+
+                # Check the download before it replaces anything
+                expected_size = r.headers.get("Content-Length")
+                if expected_size is not None and "Content-Encoding" not in r.headers and int(expected_size) != size:
+                    raise IOError(f"incomplete download ({size} of {expected_size} bytes)")
+                if expected_sha256 and h.hexdigest() != expected_sha256:
+                    raise IOError("checksum mismatch")
+                os.replace(tmp, dest)  # Atomic rename so readers never see a partial file
+            except Exception:
+                os.remove(tmp)
+                raise
+
+            meta = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified"),
+                    "sha256": h.hexdigest(), "size": size}
+            return "downloaded", "", meta
+    except Exception as e:
+        if os.path.exists(dest):
+            return "cached", str(e), old  # Keep using the local copy if the check failed
+        return "error", str(e), old
+
+
+# Make sure every file is present, downloading missing ones and re-checking the ones we downloaded once every
+# max_age seconds; base_url can point at a local test server
+# checksums maps file names to their expected SHA-256 (data/checksums.json if not given)
+def ensure_data(files=None, base_url=GITHUB_REPO, data_dir=None, workers=8, max_age=3600, checksums=None):
+    data_dir = data_dir or data_store.DATA_DIR
+    files = files or data_store.DECADE_FILES + [data_store.YEARLY_FILES["All Players"]]
+    checksums = load_checksums() if checksums is None else checksums
+    os.makedirs(data_dir, exist_ok=True)
+
+    with _lock:
+        meta = load_meta(data_dir)
+        now = time.time()
+        # Missing files, plus downloaded ones that weren't checked recently (local files have no metadata entry)
+        todo = [f for f in files if not os.path.exists(os.path.join(data_dir, f))
+                or (f in meta and now - meta[f].get("checked", 0) > max_age)]
+        results = {f: ("cached", "") for f in files if f not in todo}
+        if not todo:
+            return results
+
+        session = make_session(workers)
+        try:
+            with timing.span("network", f"data files ({len(todo)})"), ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {f: pool.submit(fetch_file, session, base_url, data_dir, f, meta.get(f),
+                                          checksums.get(f)) for f in todo}
+                for f, future in futures.items():
+                    status, detail, new_meta = future.result()
+                    results[f] = (status, detail)
+                    if new_meta and status in ("downloaded", "not modified"):
+                        meta[f] = dict(new_meta, checked=now)
+                    elif status == "local":
+                        meta.pop(f, None)  # Edited since we downloaded it, so it's a local file from now on
+        finally:
+            session.close()
+        save_meta(data_dir, meta)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse  # for the command line
+    parser = argparse.ArgumentParser(description="Download the data files, or refresh data/checksums.json")
+    parser.add_argument("--write-checksums", action="store_true",
+                        help="save the SHA-256 of the decade files in data/ as the expected checksums")
+    args = parser.parse_args()
+    if args.write_checksums:
+        checksums = {f: file_sha256(os.path.join(data_store.DATA_DIR, f)) for f in data_store.DECADE_FILES}
+        with open(CHECKSUM_FILE, "w") as f:
+            json.dump(checksums, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved {len(checksums)} checksums to {CHECKSUM_FILE}")
+    else:
+        for name, (status, detail) in ensure_data().items():
+            print(f"{name}: {status} {detail}".rstrip())
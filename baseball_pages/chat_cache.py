@@ -0,0 +1,140 @@
+# Saved chatbot answers, shared by every user and kept across restarts
+# Answers are stored in a small SQLite file keyed on the normalized prompt and the data version.
+# A new question that is worded a little differently from a saved one (same words, same data summary and
+# players, and the same years, stats and direction like "highest" / "lowest") reuses the saved answer instead
+# of waiting on the API again.
+import os  # for file paths
+import contextlib  # for closing the connections
+import re  # for normalizing text
+import time  # for TTL and LRU timestamps
+import sqlite3  # for the cache file
+import hashlib  # for the cache keys
+import threading  # so sessions don't write at the same time
+from baseball_pages import data_store  # for the cache folder
+from baseball_pages import chat_context  # for the stats a question names
+
+CACHE_FILE = os.path.join(data_store.CACHE_DIR, "chat_responses.sqlite")
+
+# Common words that don't change what a question is asking
+STOPWORDS = {"a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "is", "are", "was", "were", "what",
+             "which", "who", "how", "did", "do", "does", "me", "tell", "about", "please", "by", "with", "mlb"}
+
+
+# Words that flip or change what a question is after ("highest" and "lowest" share every other word)
+DIRECTION_WORDS = (r"\b(high|higher|highest|low|lower|lowest|most|more|least|less|fewest|fewer|best|better|"
+                   r"worst|worse|top|bottom|max|maximum|min|minimum|jr|sr|ii|iii|not|no|without)\b")
+ALL_METRICS = {col for _, cols in chat_context.METRIC_WORDS for col in cols}
+
+
+# Lowercase and collapse spaces so small formatting differences give the same key
+def normalize(text):
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+# Set of meaningful words in a question
+def tokens(text):
+    return {t for t in re.findall(r"[a-z0-9%/+]+", normalize(text)) if t not in STOPWORDS}
+
+
+# What must match for two differently worded questions to share an answer: years, direction words and stats
+def meaning(question):
+    q = normalize(question)
+    return (frozenset(re.findall(r"\d{2,4}", q)), frozenset(re.findall(DIRECTION_WORDS, q)),
+            frozenset(chat_context.named_metrics(question, ALL_METRICS)))
+
+
+# Jaccard similarity of two token sets
+def token_set_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ResponseCache:
+    # max_entries: answers kept before the least recently used are removed
+    # ttl: seconds an answer stays valid; similarity: how close a question must be to reuse an answer
+    def __init__(self, path=CACHE_FILE, max_entries=1000, ttl=7 * 24 * 3600, similarity=0.8):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as db:
+            db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, version TEXT, context TEXT, question TEXT, tokens TEXT,
+                answer TEXT, created REAL, last_used REAL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_lookup ON responses (version, context)")
+
+    # Connection for one block of work: commits at the end (or rolls back on an error) and is always closed,
+    # since sqlite3's own `with` only commits and leaves the file open
+    @contextlib.contextmanager
+    def _connect(self):
+        with contextlib.closing(sqlite3.connect(self.path, timeout=10)) as db:
+            with db:
+                yield db
+
+    @staticmethod
+    def make_key(prompt, version):
+        return hashlib.sha256(f"{version}\n{normalize(prompt)}".encode("utf-8")).hexdigest()
+
+    # Saved answer for a question, or None
+    # Returns (answer, "exact" or "similar") so the page can say where the answer came from
+    def get(self, question, prompt, version, context=""):
+        now = time.time()
+        key = self.make_key(prompt, version)
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))  # Drop expired answers
+            row = db.execute("SELECT answer FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                return row[0], "exact"
+
+            # Look for a near-duplicate question asked against the same data summary
+            wanted = tokens(question)
+            wanted_meaning = meaning(question)  # "HR in 1998" must not match "HR in 1999", nor "most" "fewest"
+            best, best_score = None, self.similarity
+            for other_key, other_question, other_tokens, answer in db.execute(
+                    "SELECT key, question, tokens, answer FROM responses WHERE version = ? AND context = ?",
+                    (version, context)):
+                if meaning(other_question) != wanted_meaning:
+                    continue
+                other = set(other_tokens.split())
+                score = token_set_similarity(wanted, other)
+                if score >= best_score:
+                    best, best_score = (other_key, answer), score
+            if best:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, best[0]))
+                return best[1], "similar"
+        return None
+
+    # Save an answer, then trim the cache back to max_entries
+    def put(self, question, prompt, version, answer, context=""):
+        now = time.time()
+        key = self.make_key(prompt, version)
+        with self._lock, self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (key, version, context, question, " ".join(sorted(tokens(question))), answer, now, now))
+            db.execute("""DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)""", (self.max_entries,))
+
+    def clear(self):
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_cache = None  # Shared cache, opened on first use
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
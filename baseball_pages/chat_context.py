@@ -0,0 +1,169 @@
+# Token-budgeted data context for the chatbot prompts
+# Instead of pasting whole describe() tables, only the metrics a question is about are shown, in small
+# pipe-separated tables, and detail is dropped until the prompt fits the token budget
+import os  # for the budget setting and log file
+import re  # for matching metric names in questions
+import json  # for the prompt size log
+import math  # for rounding up token estimates
+import time  # for log timestamps
+import logging  # for the prompt size log
+from baseball_pages import data_store  # for the cache folder
+
+TOKEN_BUDGET = int(os.environ.get("CHAT_TOKEN_BUDGET", "1500"))  # Max estimated tokens for a whole prompt
+PROMPT_LOG = os.path.join(data_store.CACHE_DIR, "prompt_sizes.jsonl")
+ANSWER_LOG = os.path.join(data_store.CACHE_DIR, "answer_paths.jsonl")
+MAX_LOG_BYTES = int(float(os.environ.get("CHAT_LOG_MB", 5)) * 1024 * 1024)  # Size before a log is rotated
+logger = logging.getLogger(__name__)
+
+# Most detailed first; detail is dropped in this order until the table fits
+DETAIL_LEVELS = [["mean", "std", "min", "50%", "max"], ["mean", "min", "max"], ["mean", "max"], ["mean"]]
+DEFAULT_METRICS = ["BA", "OBP", "SLG", "HR", "SO", "BB", "HR/PA", "K%", "BB%"]  # When no metric is named
+
+# Words in a question and the columns they point to
+METRIC_WORDS = [
+    (r"home ?runs?|homers?|\bhrs?\b", ["HR", "HR/PA"]),
+    (r"power", ["HR/PA", "SLG", "HR"]),
+    (r"strike ?outs?|\bk%|\bks?\b|\bso\b", ["SO", "K%"]),
+    (r"walks?|\bbb%?|\bbases? on balls", ["BB", "BB%"]),
+    (r"batting average|\bba\b|\bavg\b", ["BA"]),
+    (r"on[- ]base|\bobp\b", ["OBP"]),
+    (r"slugging|\bslg\b", ["SLG"]),
+    (r"\bops\+?", ["OPS", "OPS+"]),
+    (r"steal|stolen|\bsb\b", ["SB", "CS"]),
+    (r"\bwar\b|wins above", ["WAR"]),
+    (r"\brbis?\b|runs batted", ["RBI"]),
+    (r"(?<!home )\bruns\b(?! batted)", ["R"]),
+    (r"\bhits\b", ["H"]),
+    (r"doubles", ["2B"]),
+    (r"triples", ["3B"]),
+    (r"\bage\b|\bold\b|young", ["Age"]),
+    (r"\bgames\b", ["G"]),
+    (r"plate appearances?|\bpa\b", ["PA"]),
+    (r"contact", ["BA", "SO", "K%"]),
+    (r"discipline|patience", ["BB%", "K%", "OBP"]),
+]
+
+
+# Rough token count (about 4 characters per token for English text and numbers)
+def estimate_tokens(text):
+    return math.ceil(len(text) / 4)
+
+
+# Metrics a question names, in the order they're mentioned (empty if it names none)
+def named_metrics(question, available):
+    q = question.lower()
+    found = []
+    for pattern, cols in sorted(METRIC_WORDS, key=lambda item: _first_match(item[0], q)):
+        if _first_match(pattern, q) < len(q):
+            found += [c for c in cols if c in available and c not in found]
+    return found
+
+
+# Metrics a question is about (DEFAULT_METRICS if it names none)
+def relevant_metrics(question, available):
+    return named_metrics(question, available) or [c for c in DEFAULT_METRICS if c in available]
+
+
+def _first_match(pattern, text):
+    match = re.search(pattern, text)
+    return match.start() if match else len(text)
+
+
+# Short number text: 0.262, 24.5, 145, 26
+def format_value(value):
+    if value is None or value != value:  # Missing or NaN
+        return ""
+    if float(value).is_integer():  # Counts like 26 HR
+        return str(int(value))
+    if abs(value) >= 100:
+        return f"{value:.0f}"
+    if abs(value) >= 10:
+        return f"{value:.1f}"
+    return f"{value:.3f}"
+
+
+# One row per metric, one column per statistic
+def stats_table(stats, metrics, detail):
+    lines = ["metric|" + "|".join(detail)]
+    for m in metrics:
+        lines.append(m + "|" + "|".join(format_value(stats.get(m, {}).get(s)) for s in detail))
+    return "\n".join(lines)
+
+
+# One row per group (like decades), one column per metric and statistic
+def grouped_table(groups, metrics, detail, label):
+    columns = metrics if detail == ["mean"] else [f"{m} {s}" for m in metrics for s in detail]
+    lines = [label + "|" + "|".join(columns)]
+    for name, stats in groups.items():
+        values = [format_value(stats.get(m, {}).get(s)) for m in metrics for s in detail]
+        lines.append(str(name) + "|" + "|".join(values))
+    return "\n".join(lines)
+
+
+# One player's season rows: Year, Team, Age and PA, then the metrics
+def player_table(title, rows, metrics):
+    columns = [c for c in ["Year", "Team", "Age", "PA"] + metrics if c in rows.columns]
+    columns = list(dict.fromkeys(columns))  # PA could be asked for as a metric too
+    lines = [title, "|".join(columns)]
+    for row in rows[columns].itertuples(index=False):
+        lines.append("|".join(v if isinstance(v, str) else str(int(v)) if c in ("Year", "Age") and v == v
+                              else format_value(v) for c, v in zip(columns, row)))
+    return "\n".join(lines)
+
+
+# Drop metrics, then the seasons with the fewest PA, until a player's table fits in the token budget
+def fit_player_table(title, rows, metrics, budget):
+    while len(metrics) > 1 and estimate_tokens(player_table(title, rows, metrics)) > budget:
+        metrics = metrics[:-1]
+    if estimate_tokens(player_table(title, rows, metrics)) > budget and "PA" in rows.columns:
+        line_tokens = estimate_tokens(player_table(title, rows.head(1), metrics)) or 1
+        keep = max(budget // line_tokens, 1)
+        rows = rows.loc[rows["PA"].sort_values(ascending=False).index[:keep]].sort_index()
+    return player_table(title, rows, metrics)
+
+
+# Drop detail, then metrics, until render(metrics, detail) fits in the token budget
+# Returns (text, metrics used, detail used)
+def fit_table(render, metrics, budget):
+    for detail in DETAIL_LEVELS:
+        text = render(metrics, detail)
+        if estimate_tokens(text) <= budget:
+            return text, metrics, detail
+    detail = DETAIL_LEVELS[-1]
+    while len(metrics) > 1:
+        metrics = metrics[:-1]  # Metrics mentioned last go first
+        text = render(metrics, detail)
+        if estimate_tokens(text) <= budget:
+            break
+    return render(metrics, detail), metrics, detail
+
+
+# Record how big each prompt was (logger, plus one JSON line per request in data/cache/prompt_sizes.jsonl)
+def log_prompt(question, summary, prompt, budget, metrics, detail, players=None):
+    info = {"time": round(time.time(), 3), "question": question, "summary": summary,
+            "tokens": estimate_tokens(prompt), "chars": len(prompt), "budget": budget,
+            "metrics": metrics, "detail": detail, "players": players or []}
+    logger.info("prompt %s tokens (budget %s) for summary %s", info["tokens"], budget, summary)
+    append_log(PROMPT_LOG, info)
+    return info
+
+
+# Record which path answered a question: "local" (straight from the data), "cache" (saved answer) or "gpt"
+def log_answer(question, path, ms, intent=None):
+    info = {"time": round(time.time(), 3), "question": question, "path": path, "ms": ms, "intent": intent}
+    logger.info("answered by %s in %s ms", path, ms)
+    append_log(ANSWER_LOG, info)
+    return info
+
+
+# Add one JSON line to a log file in data/cache
+# Once the file passes max_bytes it is moved to path + ".1" (replacing the older one), like the timings log
+def append_log(path, info, max_bytes=MAX_LOG_BYTES):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+            os.replace(path, path + ".1")  # Keep one older file, drop anything before it
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(info) + "\n")
+    except OSError:
+        pass  # Logging should never stop an answer
@@ -0,0 +1,184 @@
+# Prompt building for the chatbot, kept outside Streamlit
+# The describe() numbers the prompts use are worked out once per data version (per year, per decade and
+# overall), saved to data/cache, and turned into a small table that fits the token budget for each question
+import os  # for file paths
+import re  # for finding years
+import json  # for saving the summaries
+from functools import lru_cache  # to keep summaries in memory per data version
+from baseball_pages import data_store  # for loading the data
+from baseball_pages import chat_context  # for fitting the data into the token budget
+from baseball_pages import player_index  # for player names
+
+SUMMARY_FILE = os.path.join(data_store.CACHE_DIR, "chat_summaries.json")
+SUMMARY_FORMAT = 2  # Bump when the saved layout changes
+
+
+# Function that finds all the years (1950–2010) mentioned in a question
+def extract_years_from_question(q):
+    return re.findall(r"\b(19[5-9][0-9]|200[0-9]|2010)\b", q)
+
+
+# Check if the question is asking about trends or comparisons over time
+def is_broad_question(q):
+    q_lower = q.lower()  # make it lowercase so it's easier to match
+    keywords = [  # keywords likely to be used in a broad question
+        "trend", "change", "over time", "best year", "which year", "what year", "all time",
+        "best hitters", "most", "top hitters", "power hitting", "compare decades"
+    ]
+    # Return True if any of these words or multiple years are found
+    return any(phrase in q_lower for phrase in keywords) or len(extract_years_from_question(q)) > 1
+
+
+# describe() numbers for every numeric column as {metric: {"mean": ..., "max": ...}}
+def describe_stats(df):
+    numeric = df.select_dtypes("number").drop(columns=["Rk", "Year"], errors="ignore").astype("float64")
+    described = numeric.describe()
+    return {m: {s: float(v) for s, v in described[m].items() if v == v} for m in described.columns}
+
+
+# Stats for each decade from 1950 to 2010
+def summarize_by_decade(df):
+    summary = {}
+    for decade_start in range(1950, 2010, 10):
+        decade_df = df[(df["Year"] >= decade_start) & (df["Year"] < decade_start + 10)]  # Filter for decade
+        if not decade_df.empty:
+            summary[f"{decade_start}s"] = describe_stats(decade_df)
+    return summary
+
+
+# Work out every summary a prompt can use: "decades", "overall" and one per year ("1950", "1951", ...)
+def build_summaries(df):
+    summaries = {"decades": summarize_by_decade(df), "overall": describe_stats(df)}
+    for year, year_df in df.groupby("Year", sort=True):  # One pass over the data instead of one filter per year
+        summaries[str(int(year))] = describe_stats(year_df)
+    return summaries
+
+
+# Summaries for the current data, from memory, then the saved file, then built from the data
+@lru_cache(maxsize=2)
+def load_summaries(version):
+    if os.path.exists(SUMMARY_FILE):
+        try:
+            with open(SUMMARY_FILE, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") == version and saved.get("format") == SUMMARY_FORMAT:
+                return saved["summaries"]
+        except (OSError, ValueError):
+            pass  # Rebuild a broken file
+
+    summaries = build_summaries(data_store.load_yearly("All Players"))
+    try:
+        os.makedirs(data_store.CACHE_DIR, exist_ok=True)
+        tmp = SUMMARY_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "format": SUMMARY_FORMAT, "summaries": summaries}, f, ensure_ascii=False)
+        os.replace(tmp, SUMMARY_FILE)
+    except OSError:
+        pass  # Still usable for this process even if it can't be saved
+    return summaries
+
+
+# Which summary a question uses: "decades", a year like "1998", or "overall"
+def summary_key(question, summaries):
+    if is_broad_question(question):  # If question is about multiple years
+        return "decades"  # Use decade summary
+    year_match = extract_years_from_question(question)  # Find specific year
+    if year_match and year_match[0] in summaries:
+        return year_match[0]  # Stats for that year
+    return "overall"  # Show full stats
+
+
+# Small table of the stats a question is about, cut down to fit in `budget` tokens
+def summary_for_question(question, summaries, budget=chat_context.TOKEN_BUDGET):
+    key = summary_key(question, summaries)
+    available = summaries["overall"].keys()
+    metrics = chat_context.relevant_metrics(question, available)
+
+    if key == "decades":
+        def render(metrics, detail):
+            return "By decade:\n" + chat_context.grouped_table(summaries["decades"], metrics, detail, "decade")
+    else:
+        stats = summaries[key]
+        title = f"{key} season" if key != "overall" else "All seasons 1950-2010"
+        players = int(stats.get("PA", {}).get("count", 0))
+
+        def render(metrics, detail):
+            return f"{title} ({players} player rows):\n" + chat_context.stats_table(stats, metrics, detail)
+
+    text, metrics, detail = chat_context.fit_table(render, metrics, budget)
+    return text, key, metrics, detail
+
+
+# Season rows of the players named in the question (search is a player_index.NameSearch)
+# Returns (text, IDs); the players share `budget` tokens
+def players_for_question(question, search, budget):
+    years = [int(y) for y in extract_years_from_question(question)]
+    pids = search.find(question, years)
+    if not pids:
+        return "", []
+    metrics = chat_context.relevant_metrics(question, search.index.yearly_df.columns)
+    tables = []
+    for pid in pids:
+        rows = search.index.season_rows(pid)
+        if years and rows["Year"].isin(years).any():  # Only the seasons asked about
+            rows = rows[rows["Year"].isin(years)]
+        title = f"{player_index.fix_encoding(search.index.name(pid))} seasons:"
+        tables.append(chat_context.fit_player_table(title, rows, metrics, budget // len(pids)))
+    return "\n\n".join(tables), pids
+
+
+# Make a prompt to send to ChatGPT based on the question and the precomputed summaries
+# The whole prompt is kept within `budget` estimated tokens (CHAT_TOKEN_BUDGET, 1500 by default)
+# If a name search is given, the season rows of players named in the question come first (up to half the budget)
+def generate_prompt(question, summaries, budget=None, search=None):
+    return build_prompt(question, summaries, budget, search)[0]
+
+
+# Same as generate_prompt, but also returns the IDs of the players whose rows are in the prompt
+def build_prompt(question, summaries, budget=None, search=None):
+    budget = budget or chat_context.TOKEN_BUDGET
+    fixed = chat_context.estimate_tokens(PROMPT_TEMPLATE.format(summary_text="", question=question))
+    player_text, pids = players_for_question(question, search, (budget - fixed) // 2) if search else ("", [])
+    used = chat_context.estimate_tokens(player_text + "\n\n") if player_text else 0
+    summary_text, key, metrics, detail = summary_for_question(question, summaries, budget - fixed - used)
+    if player_text:
+        summary_text = player_text + "\n\n" + summary_text
+    prompt = PROMPT_TEMPLATE.format(summary_text=summary_text, question=question)
+    chat_context.log_prompt(question, key, prompt, budget, metrics, detail, pids)  # Record the prompt size
+    return prompt, pids
+
+
+# Prompt for "outside knowledge" questions, which aren't limited to our data
+def outside_prompt(question):
+    return OUTSIDE_TEMPLATE.format(question=question)
+
+
+# Prompt and cache context for any question, the same way the chatbot page builds them
+# Returns (prompt, context) where context is "outside" or the summary key the prompt used, followed by the IDs
+# of the players in the prompt ("1998|griffke02"), so a saved answer is only reused for the same players
+def prompt_for_question(question, summaries, search=None, budget=None):
+    if "outside knowledge" in question.lower():
+        return outside_prompt(question), "outside"
+    prompt, pids = build_prompt(question, summaries, budget, search)
+    return prompt, "|".join([summary_key(question, summaries)] + pids)
+
+
+# Message sent to ChatGPT
+PROMPT_TEMPLATE = """You are a baseball analyst trained on MLB data from 1950 to 2010.
+
+Use the following data summary to answer the user's question.
+
+DATA SUMMARY: 
+{summary_text}
+
+QUESTION:
+{question} 
+
+Answer:"""
+
+# Message sent to ChatGPT when the user asks for outside knowledge
+OUTSIDE_TEMPLATE = """You are a knowledgeable baseball assistant. Please answer the following question using general knowledge and reasoning beyond any specific dataset:
+
+{question}
+
+Answer:"""
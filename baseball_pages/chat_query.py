@@ -0,0 +1,248 @@
+# Quick answers to simple stat questions straight from the yearly data, without calling GPT
+# Three kinds of question are recognized:
+#   leaderboard  "Who led MLB in HR in 1998?", "Top 5 K% in the 1990s"
+#   average      "Average K% in 1968", "League batting average between 1990 and 1995"
+#   compare      "Compare Hank Aaron and Willie Mays home runs", "How many HR did Bobby Bonds hit in 1973?"
+# Anything else (trends, opinions, "outside knowledge", teams, per-game numbers, several separate years)
+# returns None and goes to GPT as before
+import re  # for reading the questions
+import time  # for timing answers
+from functools import lru_cache  # to keep one engine per data version
+import pandas as pd  # for data processing
+from baseball_pages import data_store  # for loading the data
+from baseball_pages import chat_context  # for metric names and number formatting
+from baseball_pages import chat_prompts  # for finding years
+from baseball_pages import player_index  # for finding players
+
+ID_COL = player_index.ID_COL
+QUALIFIED_PA = 502  # PA needed to lead in a rate stat (3.1 per game over 162 games)
+# Rate stats and the column they're weighted by when several seasons or players are combined
+RATE_WEIGHTS = {"BA": "AB", "SLG": "AB", "OBP": "PA", "OPS": "PA", "OPS+": "PA", "Rbat+": "PA",
+                "rOBA": "PA", "HR/PA": "PA", "K%": "PA", "BB%": "PA"}
+NOT_SUMMED = set(RATE_WEIGHTS) | {"Age"}  # Averaged rather than added up
+LOWER_IS_BETTER = {"SO", "K%", "CS", "GIDP"}  # "Best" means lowest for these
+
+LEADER_WORDS = r"\b(led|lead|leads|leader|leaders|most|top|highest|best|fewest|lowest|least|worst)\b"
+LOWEST_WORDS = r"\b(fewest|lowest|least|worst)\b"
+AVERAGE_WORDS = r"\b(average|avg|mean|typical|league)\b"
+# Questions about teams, eras or trends, which these answers don't cover
+OTHER_WORDS = r"\b(which|what) (decade|year|season|team|era|league|position)\b|\btrend|\bchange|over time|\bwhy\b"
+# Team totals and per-game / per-team numbers, which the player seasons here can't answer
+TEAM_WORDS = (r"\b(teams?|club|clubs|franchises?|rosters?|per game|a game|per team|yankees|red sox|white sox|"
+              r"orioles|browns|athletics|a's|senators|twins|rangers|angels|tigers|indians|royals|pilots|brewers|"
+              r"blue jays|mariners|rays|dodgers|giants|cubs|cardinals|reds|redlegs|pirates|braves|phillies|mets|"
+              r"astros|colt 45s|expos|nationals|padres|marlins|rockies|diamondbacks|d-backs)\b|\bper-game\b")
+NUMBER_WORDS = {"three": 3, "five": 5, "ten": 10, "twenty": 20}
+# Time periods question_years doesn't understand: open ranges ("since 2000"), short decades ("the 90s"),
+# decades outside 1950-2010 ("the 2010s") and relative periods ("the last 5 years", "the early 70s")
+UNCLEAR_YEARS = (r"\b(since|after|before|until|till|through|thru|prior to|up to|onward|onwards|era|century)\b|"
+                 r"(?<![\w'])'?\d0'?s\b|\b(2010|18\d0|19[0-4]0)'?s\b|\b(early|late|mid)[- ]|"
+                 r"\b(last|past|first|recent|next) (\d+|few|two|three|five|ten|couple)\b")
+
+
+# Years a question is about as (list of years, label, span), or ([], "1950-2010", True) if it names none
+# Handles single years ("1998"), decades ("the 1990s") and ranges ("between 1990 and 1995");
+# span is True when the years should be taken together rather than one at a time
+# Returns None for any other way of naming a time period (see UNCLEAR_YEARS) or years outside 1950-2010
+def question_years(question):
+    if re.search(UNCLEAR_YEARS, question.lower()):
+        return None
+    if any(not 1950 <= int(y) <= 2010 for y in re.findall(r"\b(1[89]\d\d|20\d\d)'?s?\b", question)):
+        return None
+    between = re.search(r"(?:between|from)\s+(\d{4})\s+(?:and|to|-)\s+(\d{4})", question)
+    if between:
+        start, end = sorted(int(y) for y in between.groups())
+        return list(range(max(start, 1950), min(end, 2010) + 1)), f"{start}-{end}", True
+    decades = re.findall(r"\b(19[5-9]0|2000)'?s\b", question)
+    if decades:
+        years = [y for d in decades for y in range(int(d), int(d) + 10) if y <= 2010]
+        return years, ", ".join(f"the {d}s" for d in decades), True
+    years = sorted({int(y) for y in chat_prompts.extract_years_from_question(question)})
+    if years:
+        return years, ", ".join(str(y) for y in years), False
+    return [], "1950-2010", True
+
+
+# The metric a question is mostly about: the rate version if it says "rate" or "%" (K% rather than SO)
+def main_metric(question, metrics):
+    if re.search(r"%|\brate|per (pa|plate)", question.lower()):
+        for m in metrics:
+            if m in RATE_WEIGHTS:
+                return m
+    return metrics[0]
+
+
+# Work out what kind of question this is, or None if it needs GPT
+def parse_question(question, engine):
+    q = question.lower()
+    if "outside knowledge" in q or re.search(OTHER_WORDS, q) or re.search(TEAM_WORDS, q):
+        return None
+    metrics = chat_context.named_metrics(question, engine.columns)
+    if not metrics:
+        return None
+    found = question_years(question)
+    if found is None:
+        return None
+    years, label, span = found
+    if len(years) > 1 and not span:  # "1998 and 2001": one answer per year is more than these answers give
+        return None
+    parsed = {"metric": main_metric(question, metrics), "metrics": metrics, "years": years, "label": label,
+              "span": span}
+
+    players = engine.search.find(question, years) if engine.search else []
+    if players:
+        return dict(parsed, intent="compare", players=players)
+
+    plain = q.replace("batting average", "")  # "Highest batting average" is a leaderboard, not an average
+    if re.search(LEADER_WORDS, plain):
+        top = re.search(r"\btop\s+(\d+|three|five|ten|twenty)\b", plain)
+        n = 5 if not top else int(top.group(1)) if top.group(1).isdigit() else NUMBER_WORDS[top.group(1)]
+        lowest = bool(re.search(LOWEST_WORDS, plain))
+        if parsed["metric"] in LOWER_IS_BETTER and re.search(r"\b(best|worst)\b", plain):
+            lowest = bool(re.search(r"\bbest\b", plain))  # Best strikeout rate is the lowest one
+        return dict(parsed, intent="leaderboard", n=min(max(n, 1), 25), ascending=lowest)
+    if re.search(AVERAGE_WORDS, plain) and years:
+        return dict(parsed, intent="average")
+    return None
+
+
+# Player name as shown to users: "Ken Griffey Jr.*" -> "Ken Griffey Jr."
+def display_name(label):
+    return player_index.fix_encoding(player_index.split_name(label)[0])
+
+
+class QueryEngine:
+    def __init__(self, yearly_df, search=None):
+        df = yearly_df[yearly_df[ID_COL] != "-9999"]  # Drop the League Average rows
+        # Traded players have a "2TM"/"3TM" total row plus one row per team; keep only the totals
+        team = df["Team"].astype("string").fillna("")
+        split = df.duplicated([ID_COL, "Year"], keep=False) & ~team.str.endswith("TM")
+        self.seasons = df[~split].reset_index(drop=True)
+        self.columns = set(self.seasons.columns)
+        self.search = search
+        self.year_pos = self.seasons.groupby("Year", observed=True).indices  # Year -> row positions
+        self.player_pos = self.seasons.groupby(ID_COL, observed=True).indices  # ID -> row positions
+
+    def rows_for(self, years):
+        if not years:
+            return self.seasons
+        positions = [self.year_pos[y] for y in years if y in self.year_pos]
+        if not positions:
+            return self.seasons.iloc[[]]
+        return self.seasons.iloc[sorted(p for pos in positions for p in pos)]
+
+    # Value of a metric over several rows: added up for counts, weighted by PA or AB for rates
+    @staticmethod
+    def combine(rows, metric):
+        values = rows[metric].astype("float64")
+        if metric not in NOT_SUMMED:
+            return values.sum()
+        weight = RATE_WEIGHTS.get(metric)
+        if weight is None or weight not in rows.columns:
+            return values.mean()
+        w = rows[weight].astype("float64").where(values.notna(), 0)
+        return (values.fillna(0) * w).sum() / w.sum() if w.sum() else float("nan")
+
+    def leaderboard(self, metric, years, label, n=5, ascending=False):
+        rows = self.rows_for(years).dropna(subset=[metric])
+        seasons = max(len(years), 1) if years else 61
+        if len(years) == 1 or metric in NOT_SUMMED:
+            # Single seasons; rate stats and "fewest" lists only count qualified seasons
+            if metric in NOT_SUMMED or ascending:
+                rows = rows[rows["PA"] >= QUALIFIED_PA]
+            top = rows.sort_values(metric, ascending=ascending).head(n)
+            table = pd.DataFrame({"Player": [display_name(p) for p in top["Player"]], "Year": top["Year"].astype(int),
+                                  "Team": top["Team"].astype(str), metric: top[metric].astype("float64")})
+            scope = f"qualified seasons, {QUALIFIED_PA}+ PA" if metric in NOT_SUMMED or ascending else "seasons"
+        else:
+            # Totals over the years asked about
+            totals = rows.groupby(ID_COL, observed=True).agg(value=(metric, "sum"), PA=("PA", "sum"),
+                                                             Player=("Player", "first"))
+            if ascending:
+                totals = totals[totals["PA"] >= QUALIFIED_PA * seasons]
+            top = totals.sort_values("value", ascending=ascending).head(n)
+            table = pd.DataFrame({"Player": [display_name(p) for p in top["Player"]],
+                                  metric: top["value"].to_numpy()})
+            scope = "totals"
+        if table.empty:
+            return None
+        word = "Lowest" if ascending else "Highest"
+        lead = table.iloc[0]
+        text = f"{word} {metric} in {label} ({scope}): **{lead['Player']}** with {chat_context.format_value(lead[metric])}"
+        if "Year" in table.columns and len(years) != 1:
+            text += f" in {lead['Year']}"
+        lines = [f"{i}. {r['Player']}" + (f" ({r['Year']}, {r['Team']})" if "Year" in table.columns else "")
+                 + f": {chat_context.format_value(r[metric])}" for i, r in enumerate(table.to_dict("records"), 1)]
+        return text + ".\n\n" + "\n".join(lines), table
+
+    def average(self, metric, years, label, span=True):
+        # A range or decade is one group; separately named years get a row each
+        groups = [(label, years)] if span else [(str(y), [y]) for y in years]
+        records = []
+        for name, group in groups:
+            rows = self.rows_for(group).dropna(subset=[metric])
+            if rows.empty:
+                continue
+            record = {"Years": name, "Players": len(rows), f"{metric} per player": rows[metric].astype("float64").mean()}
+            if metric in RATE_WEIGHTS:
+                record[f"{metric} league-wide"] = self.combine(rows, metric)
+            records.append(record)
+        if not records:
+            return None
+        table = pd.DataFrame(records)
+        lines = []
+        for r in records:
+            line = (f"Average {metric} in {r['Years']}: **{chat_context.format_value(r[f'{metric} per player'])}** "
+                    f"per player ({r['Players']} players)")
+            if f"{metric} league-wide" in r:
+                line += f"; league-wide, weighted by {RATE_WEIGHTS[metric]}: {chat_context.format_value(r[f'{metric} league-wide'])}"
+            lines.append(line + ".")
+        return "\n\n".join(lines), table
+
+    def compare(self, pids, metrics, years, label):
+        table = {"Stat": ["Seasons", "PA"] + [m for m in metrics if m != "PA"]}
+        names = []
+        for pid in pids:
+            rows = self.seasons.iloc[self.player_pos.get(pid, [])]
+            if years:
+                rows = rows[rows["Year"].isin(years)]
+            if rows.empty:
+                continue
+            name = display_name(rows["Player"].iat[0])
+            names.append(name)
+            table[name] = [len(rows), rows["PA"].sum()] + [self.combine(rows, m) for m in table["Stat"][2:]]
+        if not names:
+            return None
+        table = pd.DataFrame(table)
+        scope = label if years else "career (1950-2010)"
+        if len(names) == 1 and len(metrics) <= 2:
+            stats = ", ".join(f"{chat_context.format_value(v)} {m}" for m, v in zip(table["Stat"][2:], table[names[0]][2:]))
+            return f"**{names[0]}** in {scope}: {stats}.", table
+        lines = [f"{m}: " + " | ".join(f"{n} {chat_context.format_value(table.at[i, n])}" for n in names)
+                 for i, m in enumerate(table["Stat"])]
+        return f"{' vs '.join(names)} ({scope}):\n\n" + "\n\n".join(lines), table
+
+    # Answer a question from the data, or None if it needs GPT
+    # Returns {"intent", "text", "table", "ms"}
+    def answer(self, question):
+        start = time.perf_counter()
+        parsed = parse_question(question, self)
+        if parsed is None:
+            return None
+        if parsed["intent"] == "leaderboard":
+            result = self.leaderboard(parsed["metric"], parsed["years"], parsed["label"], parsed["n"], parsed["ascending"])
+        elif parsed["intent"] == "average":
+            result = self.average(parsed["metric"], parsed["years"], parsed["label"], parsed["span"])
+        else:
+            result = self.compare(parsed["players"], parsed["metrics"], parsed["years"], parsed["label"])
+        if result is None:
+            return None
+        text, table = result
+        return {"intent": parsed["intent"], "text": text, "table": table,
+                "ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+# One engine per data version (pass data_store.data_version())
+@lru_cache(maxsize=2)
+def load_engine(version):
+    return QueryEngine(data_store.load_yearly("All Players"), player_index.load_name_search(version))
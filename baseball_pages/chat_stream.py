@@ -0,0 +1,39 @@
+# Streaming answers from the chat model
+# The answer is handed back piece by piece as the model writes it, so the page can show it right away
+# instead of waiting for the whole completion
+import os  # for the base URL setting
+from openai import OpenAI  # works with the real API or any OpenAI-compatible server
+
+MODEL = "gpt-3.5-turbo"
+
+
+# OpenAI client; base_url points it at another OpenAI-compatible server (like mock_openai_server.py)
+# If base_url is not given, OPENAI_BASE_URL from the environment is used, then the real API
+def make_client(api_key, base_url=None):
+    return OpenAI(api_key=api_key, base_url=base_url or os.environ.get("OPENAI_BASE_URL") or None)
+
+
+# Yield the answer text as it arrives
+# on_done is called with the full answer, only if the stream finished (not if it was closed part way)
+def stream_answer(client, prompt, model=MODEL, on_done=None):
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    )
+    parts = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                yield text
+        if on_done is not None:
+            on_done("".join(parts))
+    finally:
+        # Also runs when the page is interrupted by a new question, so the request doesn't keep running
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
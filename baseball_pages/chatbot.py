@@ -2,8 +2,20 @@
 import streamlit as st  # This is the web apps import
 import pandas as pd  # for data processing
 import os  # used to check if files exist
-import re  # for finding years
-from openai import OpenAI  # import to use ChatGPT inside our app
+import time  # for timing answers
+from contextlib import closing  # to stop a stream that gets interrupted
+from baseball_pages import data_store  # for cached data loading
+from baseball_pages import chat_prompts  # for building the prompts
+from baseball_pages import chat_cache  # for reusing saved answers
+from baseball_pages import chat_stream  # for showing answers as they are written
+from baseball_pages import player_index  # for finding players named in questions
+from baseball_pages import chat_query  # for answering simple stat questions without GPT
+from baseball_pages import chat_context  # for logging which path answered
+from baseball_pages import timing  # for load / compute / network timings
+
+
+# How each answer path is shown in the chat history
+SOURCE_NAMES = {"local": "📊 the data (no GPT call)", "cache": "⚡ a saved GPT answer", "gpt": "🧠 GPT"}
 
 
 def show():  # This function runs the whole chatbot app
@@ -45,9 +57,10 @@ def show():  # This function runs the whole chatbot app
     # create a place to store chat history if one not already made
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+        st.session_state.chat_sources = []  # Which path answered each question
 
     # Try to find CSV data file with player stats
-    data = ["data/combined_yearly_stats_all_players.csv"]
+    data = [os.path.join(data_store.DATA_DIR, data_store.YEARLY_FILES["All Players"])]
     existing_files = [f for f in data if os.path.exists(f)]  # Keep only files that exist
 
     # If no data file is found, show a warning and stop running
@@ -55,68 +68,25 @@ def show():  # This function runs the whole chatbot app
         st.warning("Combined data file not found in the data/ folder.")
         return
 
-    # Try loading the file into a pandas DataFrame
+    # Try loading the precomputed data summaries and the player name search (built once per data version)
     try:
-        df = pd.read_csv(existing_files[0], encoding="ISO-8859-1")
+        with timing.span("load", "chat data"):
+            summaries = chat_prompts.load_summaries(data_store.data_version())
+            search = player_index.load_name_search(data_store.data_version())
+            engine = chat_query.load_engine(data_store.data_version())
     except Exception as e:
         st.error(f"Error loading data: {e}")  # Show error if loading fails
         return
 
-    # Function that finds all the years (1950–2010) mentioned in a question
-    def extract_years_from_question(q):
-        return re.findall(r"\b(19[5-9][0-9]|200[0-9]|2010)\b", q)
-
-    # Check if the question is asking about trends or comparisons over time
-    def is_broad_question(q):
-        q_lower = q.lower()  # make it lowercase so it's easier to match
-        keywords = [  # keywords likely to be used in a broad question
-            "trend", "change", "over time", "best year", "which year", "what year", "all time",
-            "best hitters", "most", "top hitters", "power hitting", "compare decades"
-        ]
-        # Return True if any of these words or multiple years are found
-        return any(phrase in q_lower for phrase in keywords) or len(extract_years_from_question(q)) > 1
-
-    # Make a summary of the stats for each decade
-    def summarize_by_decade(df):
-        summary = ""
-        # Go through each decade from 1950 to 2010
-        for decade_start in range(1950, 2010, 10):
-            decade_df = df[(df["Year"] >= decade_start) & (df["Year"] < decade_start + 10)]  # Filter for decade
-            if not decade_df.empty:
-                stats = decade_df.describe().to_string()  # Get stats summary
-                summary += f"\n📅 {decade_start}s Summary:\n{stats}\n"
-        return summary  # Return all summaries together
-
-    # Make a prompt to send to ChatGPT based on the question and filtered data
-    def generate_prompt(question, context_df):
-        if is_broad_question(question):  # If question is about multiple years
-            summary_text = summarize_by_decade(context_df)  # Use decade summary
-        else:
-            year_match = extract_years_from_question(question)  # Find specific year
-            if year_match:
-                year = int(year_match[0])  # Convert year to number
-                context_df = context_df[context_df["Year"] == year]  # Filter by that year
-            summary_text = context_df.describe(include='all').to_string()  # Show full stats
-
-        # Return a full message to send to ChatGPT
-        return f"""You are a baseball analyst trained on MLB data from 1950 to 2010.
-
-Use the following data summary to answer the user's question.
-
-DATA SUMMARY: 
-{summary_text}
-
-QUESTION:
-{question} 
-
-Answer:"""
-
     # If there are old questions/answers, show them in an expandable list
     if st.session_state.chat_history:
         st.markdown("### 🗂️ Chat History")
         for i, (q, a) in enumerate(st.session_state.chat_history, 1):
             with st.expander(f"Q{i}: {q}"):  # Click to expand each question
                 st.write(a)  # Show the answer
+                sources = st.session_state.get("chat_sources", [])
+                if i <= len(sources):
+                    st.caption(f"Answered by: {SOURCE_NAMES.get(sources[i - 1], sources[i - 1])}")
 
     # Function to turn chat history into plain text
     def get_txt_history():
@@ -137,6 +107,7 @@ Answer:"""
     if st.session_state.chat_history:
         if st.button("🧹 Clear History"):
             st.session_state.chat_history = []  # Empty it out
+            st.session_state.chat_sources = []
             st.rerun()  # Refresh the app
 
     # Let the user type in a question
@@ -147,42 +118,67 @@ Answer:"""
 
     # When the user types a question and presses enter
     if user_question and user_question != st.session_state.get("last_question", ""):
-        try:
-            # Create an OpenAI client using the secret API key
-            client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-
-            # If they mention “outside knowledge”, give GPT freedom to use general info
-            if "outside knowledge" in user_question.lower():
-                prompt = f"""You are a knowledgeable baseball assistant. Please answer the following question using general knowledge and reasoning beyond any specific dataset:
-
-{user_question}
-
-Answer:"""
-            else:
-                # Otherwise build the prompt based on our dataset
-                prompt = generate_prompt(user_question, df)
-
-            # Show loading spinner while we wait
-            with st.spinner("Thinking... 💭"):
-                # Ask ChatGPT and get the answer
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}]
-                )
-
-            # Grab the answer from GPT's response
-            answer = response.choices[0].message.content
-            # Save the question and answer to our chat history
-            st.session_state.chat_history.append((user_question, answer))
+        # Simple stat questions (leaders, averages, player comparisons) are answered straight from the data
+        with timing.span("compute", "answer from data"):
+            local = None if "outside knowledge" in user_question.lower() else engine.answer(user_question)
+        if local:
+            st.markdown("### 📊 From the Data:")
+            st.success(local["text"])
+            st.dataframe(local["table"], hide_index=True)
+            st.caption(f"⚡ Answered from the data in {local['ms']} ms, no GPT call")
+            chat_context.log_answer(user_question, "local", local["ms"], local["intent"])
+            st.session_state.chat_history.append((user_question, local["text"]))
+            st.session_state.setdefault("chat_sources", []).append("local")
             st.session_state["last_question"] = user_question
-
-            # Show the answer nicely
-            st.markdown("### 🧠 GPT’s Analysis:")
-            st.success(answer)
-
-        except Exception as e:
-            # If something goes wrong, show an error
-            st.error(f"GPT API Error: {e}")
+        else:
+            try:
+                start = time.perf_counter()
+                # Create an OpenAI client using the secret API key (OPENAI_BASE_URL can point it at a local server)
+                client = chat_stream.make_client(st.secrets["OPENAI_API_KEY"], st.secrets.get("OPENAI_BASE_URL"))
+
+                # If they mention “outside knowledge”, GPT gets freedom to use general info,
+                # otherwise the prompt is built from our dataset (context says which summary and players it used)
+                with timing.span("compute", "prompt"):
+                    prompt, context = chat_prompts.prompt_for_question(user_question, summaries, search)
+
+                # Reuse a saved answer to the same (or nearly the same) question if there is one
+                cache = chat_cache.get_cache()
+                version = data_store.data_version()
+                with timing.span("load", "saved answers"):
+                    hit = cache.get(user_question, prompt, version, context)
+
+                st.markdown("### 🧠 GPT’s Analysis:")
+                if hit:
+                    answer = hit[0]
+                    st.success(answer)
+                    st.caption("⚡ Answered from saved responses")
+                else:
+                    # Show the answer while ChatGPT writes it
+                    # Typing a new question reruns the page, which stops this loop and closes the stream
+                    box = st.empty()
+                    box.info("Thinking... 💭")
+                    answer = ""
+
+                    def save(full):  # Only finished answers are saved
+                        cache.put(user_question, prompt, version, full, context)
+
+                    with timing.span("network", "GPT answer"), \
+                            closing(chat_stream.stream_answer(client, prompt, on_done=save)) as pieces:
+                        for piece in pieces:
+                            answer += piece
+                            box.success(answer + " ▌")  # Cursor while still writing
+                    box.success(answer)
+
+                # Save the question and answer to our chat history
+                source = "cache" if hit else "gpt"
+                chat_context.log_answer(user_question, source, round((time.perf_counter() - start) * 1000, 2))
+                st.session_state.chat_history.append((user_question, answer))
+                st.session_state.setdefault("chat_sources", []).append(source)
+                st.session_state["last_question"] = user_question
+
+            except Exception as e:
+                # If something goes wrong, show an error
+                st.error(f"GPT API Error: {e}")
 
     # If we have chat history, let the user download it
     if "chat_history" in st.session_state and st.session_state.chat_history:
@@ -0,0 +1,132 @@
+# Precomputed aggregate "cube" of the stats
+# Player rows are grouped once by Year (or Decade), League, Team, primary position and whether the player
+# had 100+ PA, keeping the row count plus the sum, count and mean of every metric in each group.
+# Trend pages add up the small slices they need instead of re-scanning every player row.
+import os  # for file paths and modification times
+import pandas as pd  # for data processing
+from baseball_pages import data_store  # for loading the source data
+
+DIMENSIONS = ["Lg", "Team", "Pos", "Qualified"]  # Grouped along with Year or Decade
+YEARLY_CUBE = os.path.join(data_store.CACHE_DIR, "combined_yearly_cube.parquet")
+DECADE_CUBE = os.path.join(data_store.CACHE_DIR, "decade_cube.parquet")
+
+# Baseball-Reference position codes
+POSITIONS = {"1": "P", "2": "C", "3": "1B", "4": "2B", "5": "3B", "6": "SS",
+             "7": "LF", "8": "CF", "9": "RF", "D": "DH", "H": "PH"}
+
+
+# Primary position from a Pos string like "*89/H" (the first position listed, ignoring * and /)
+def primary_position(pos):
+    codes = pos.astype("string").str.replace(r"[*/]", "", regex=True).str[0]
+    return codes.map(POSITIONS)
+
+
+# Numeric columns worth aggregating (everything except the rank, the time column and the text columns,
+# which read as all-blank floats in a piece of a file that only has the League Average row)
+def metric_columns(df, time_col):
+    skip = {"Rk", time_col} | set(DIMENSIONS) | set(data_store.CATEGORY_COLS)
+    return [c for c in df.select_dtypes("number").columns if c not in skip]
+
+
+# Build the cube from player rows; time_col is "Year" for the yearly data or "Decade" for the decade files
+def build_cube(df, time_col="Year"):
+    df = df.copy()
+    if "HR/PA" not in df.columns:  # The decade files don't have the rate stats yet
+        df["HR/PA"] = df["HR"] / df["PA"]
+        df["K%"] = df["SO"] / df["PA"]
+        df["BB%"] = df["BB"] / df["PA"]
+    df["Pos"] = primary_position(df["Pos"]) if "Pos" in df.columns else pd.NA
+    df["Qualified"] = df["PA"] >= 100  # Same rule as the starters only files
+    for col in ["Lg", "Team", "Pos"]:  # Keep rows with no league or team (like League Average) as their own group
+        df[col] = df[col].astype("string").fillna("")
+
+    metrics = metric_columns(df, time_col)
+    df[metrics] = df[metrics].astype("float64")  # Add up compact float32 / small int columns at full precision
+    keys = [time_col] + DIMENSIONS
+
+    grouped = df.groupby(keys, sort=True)
+    sums = grouped[metrics].sum()
+    counts = grouped[metrics].count()
+    cube = pd.DataFrame({"Players": grouped.size()})
+    for m in metrics:
+        cube[f"{m} sum"] = sums[m]
+        cube[f"{m} count"] = counts[m]
+        cube[f"{m} mean"] = sums[m] / counts[m]
+    return cube.reset_index()
+
+
+# Add cubes built from separate pieces of data (for example one per season) into one cube
+def merge_cubes(cubes, time_col="Year"):
+    cubes = [c for c in cubes if c is not None and not c.empty]
+    if not cubes:
+        return pd.DataFrame()
+    keys = [time_col] + DIMENSIONS
+    merged = pd.concat(cubes, ignore_index=True)
+    value_cols = [c for c in merged.columns if c not in keys and not c.endswith(" mean")]
+    merged = merged.groupby(keys, sort=True)[value_cols].sum().reset_index()
+    for col in [c for c in value_cols if c.endswith(" sum")]:
+        m = col[:-4]
+        merged[f"{m} mean"] = merged[f"{m} sum"] / merged[f"{m} count"]
+    # Keep the same column order as build_cube
+    order = keys + ["Players"] + [c for col in value_cols if col.endswith(" sum")
+                                  for c in (col, col[:-4] + " count", col[:-4] + " mean")]
+    return merged[order]
+
+
+# Player-weighted mean of each metric for every value of `by`, from the cube
+# starters_only keeps only 100+ PA players; filters narrow the slice, e.g. Lg="AL"
+def slice_means(cube, by, metrics, starters_only=False, **filters):
+    sel = cube
+    if starters_only:
+        sel = sel[sel["Qualified"]]
+    for col, value in filters.items():
+        sel = sel[sel[col] == value]
+    cols = [f"{m} sum" for m in metrics] + [f"{m} count" for m in metrics]
+    totals = sel.groupby(by)[cols].sum()
+    return pd.DataFrame({m: totals[f"{m} sum"] / totals[f"{m} count"] for m in metrics})
+
+
+def save_cube(cube, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    cube.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+# True if the cube file exists and is newer than all of its sources
+def is_fresh(path, sources):
+    if not os.path.exists(path):
+        return False
+    built = os.path.getmtime(path)
+    return all(built >= os.path.getmtime(src) for src in sources if os.path.exists(src))
+
+
+# Cube of the combined yearly data (written by combine_yearly_data.py, rebuilt here if it's missing or stale)
+def load_yearly_cube():
+    source = os.path.join(data_store.DATA_DIR, data_store.YEARLY_FILES["All Players"])
+    if is_fresh(YEARLY_CUBE, [source]):
+        return pd.read_parquet(YEARLY_CUBE)
+    cube = build_cube(data_store.load_yearly("All Players"), "Year")
+    try:
+        save_cube(cube, YEARLY_CUBE)
+    except Exception:
+        pass  # Still usable even if it can't be saved
+    return cube
+
+
+# Cube of the decade files, with the decade as an int "Decade" column
+def load_decade_cube():
+    sources = [os.path.join(data_store.DATA_DIR, f) for f in data_store.DECADE_FILES]
+    if is_fresh(DECADE_CUBE, sources):
+        return pd.read_parquet(DECADE_CUBE)
+    cubes = []
+    for decade, df in data_store.load_decades().items():
+        df = df.copy()
+        df["Decade"] = int(decade)
+        cubes.append(build_cube(df, "Decade"))
+    cube = merge_cubes(cubes, "Decade")
+    try:
+        save_cube(cube, DECADE_CUBE)
+    except Exception:
+        pass
+    return cube
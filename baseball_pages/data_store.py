@@ -0,0 +1,131 @@
+# Shared data access for every page
+# The raw Baseball-Reference CSVs are parsed once and saved as Parquet files in data/cache,
+# every later load reads the typed Parquet copy instead of re-parsing the CSV
+import os  # for file paths and modification times
+import hashlib  # for building a data version string
+import pandas as pd  # for data processing
+
+DATA_DIR = "data"  # Folder where all data is stored
+CACHE_DIR = os.path.join(DATA_DIR, "cache")  # Folder for the Parquet copies
+decades = ["1950", "1960", "1970", "1980", "1990", "2000", "2010"]  # Decades we have files for
+DECADE_FILES = [f"{decade}stats.csv" for decade in decades]  # Decade file names
+YEARLY_FILES = {  # Combined yearly files made by combine_yearly_data.py
+    "All Players": "combined_yearly_stats_all_players.csv",
+    "Starters Only (PA ≥ 100)": "combined_yearly_stats_starters_only.csv",
+}
+
+
+# Column schema used to shrink the frames in memory
+# Repeated strings become categoricals, rate stats become float32 and counting stats become the
+# smallest integer type that fits (or float32 when the column has blanks, like the League Average row)
+CATEGORY_COLS = ["Player", "Team", "Lg", "Pos", "Awards", "Player-additional", "Hitter Type"]
+RATE_COLS = ["WAR", "BA", "OBP", "SLG", "OPS", "rOBA", "HR/PA", "K%", "BB%", "ISO", "ContactScore", "PowerScore"]
+
+
+# Convert a stats frame to the compact schema (safe to call more than once)
+def compact(df):
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORY_COLS:
+            if df[col].dtype != "category":
+                df[col] = df[col].astype("category")
+        elif col in RATE_COLS:
+            df[col] = df[col].astype("float32")
+        elif pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            values = df[col]
+            if values.isna().any() or not (values.dropna() % 1 == 0).all():
+                df[col] = values.astype("float32")  # Counts with blanks stay floats (still exact below 16 million)
+            else:
+                df[col] = pd.to_numeric(values, downcast="integer")
+    return df
+
+
+# Memory used by a frame in MB (including the strings)
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+# Read one of the raw CSV files and fix up the column names
+def read_stats_csv(path):
+    df = pd.read_csv(path, encoding="ISO-8859-1")
+    df.columns = df.columns.str.replace("ï»¿", "").str.replace("\ufeff", "").str.strip()  # Remove the BOM and spaces
+    return df
+
+
+# Path of the Parquet copy for a CSV file name
+def cache_path(file_name):
+    return os.path.join(CACHE_DIR, os.path.splitext(file_name)[0] + ".parquet")
+
+
+# Load a CSV from the data folder, using the Parquet copy when it is up to date
+def load_table(file_name):
+    src = os.path.join(DATA_DIR, file_name)
+    dest = cache_path(file_name)
+    if not os.path.exists(src):  # The source file is required so stale copies are never served
+        raise FileNotFoundError(src)
+
+    # Use the cached copy if it was written after the CSV last changed
+    if os.path.exists(dest) and os.path.getmtime(dest) >= os.path.getmtime(src):
+        try:
+            return compact(pd.read_parquet(dest))  # No-op for copies already saved in the compact schema
+        except Exception:
+            pass  # Fall through and rebuild a broken cache file
+
+    df = compact(read_stats_csv(src))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = dest + ".tmp"
+        df.to_parquet(tmp, index=False)  # Write to a temp file first
+        os.replace(tmp, dest)  # Then swap it in so readers never see half a file
+    except Exception:
+        pass  # A read-only disk or missing pyarrow just means we serve the CSV every time
+    return df
+
+
+# Load every decade file that exists, keyed by decade
+def load_decades():
+    data = {}
+    for file_name in DECADE_FILES:
+        if os.path.exists(os.path.join(DATA_DIR, file_name)):
+            data[file_name[:4]] = load_table(file_name)
+    return data
+
+
+# Load one of the combined yearly files ("All Players" or "Starters Only (PA ≥ 100)")
+def load_yearly(choice="All Players"):
+    return load_table(YEARLY_FILES[choice])
+
+
+# Short string that changes whenever any of the source CSVs change
+def data_version():
+    h = hashlib.sha1()
+    for file_name in DECADE_FILES + list(YEARLY_FILES.values()):
+        path = os.path.join(DATA_DIR, file_name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            h.update(f"{file_name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return h.hexdigest()[:12]
+
+
+# Memory of each source file as parsed from the CSV and after compact(), in MB
+def memory_report():
+    rows = []
+    for name in DECADE_FILES + list(YEARLY_FILES.values()):
+        path = os.path.join(DATA_DIR, name)
+        if os.path.exists(path):
+            raw = read_stats_csv(path)
+            rows.append({"file": name, "rows": len(raw), "before_mb": memory_mb(raw),
+                         "after_mb": memory_mb(compact(raw))})
+    report = pd.DataFrame(rows)
+    if not report.empty:
+        report["saved_%"] = 100 * (1 - report["after_mb"] / report["before_mb"])
+    return report
+
+
+# Running this file builds the Parquet copies ahead of time and prints the memory saved
+if __name__ == "__main__":
+    for name in DECADE_FILES + list(YEARLY_FILES.values()):
+        if os.path.exists(os.path.join(DATA_DIR, name)):
+            load_table(name)
+            print(f"Cached {name} -> {cache_path(name)}")
+    print(memory_report().round(2).to_string(index=False))
@@ -0,0 +1,126 @@
+# Import necessary libraries
+import streamlit as st  # Streamlit for creating the web app
+import pandas as pd  # Pandas for data manipulation
+import matplotlib.pyplot as plt  # Matplotlib for creating visualizations
+from baseball_pages import bootstrap  # Data file downloads
+from baseball_pages import cube  # Precomputed aggregates for the trend pages
+from baseball_pages import data_store  # Data version for the cache
+from baseball_pages import figures  # Draws each chart once per set of inputs and reuses the image
+from baseball_pages import timing  # Load / compute / render timings
+
+decades = ["1950", "1960", "1970", "1980", "1990", "2000", "2010"]  # List of decades
+
+
+# Function to process data based on the selected dataset
+def process_data(data, player_type):
+    key_stats = ["BA", "OBP", "SLG", "HR", "SO", "BB", "PA"]  # Key statistics to analyze
+    missing_cols = [col for col in key_stats if f"{col} sum" not in data.columns]  # Check for missing columns
+    if data.empty or missing_cols:  # If there are missing columns
+        st.warning(f"Warning: Missing columns: {missing_cols}")  # Show a warning message
+        return pd.DataFrame(), pd.Series(dtype=float), pd.Series(dtype=float), pd.Series(dtype=float)
+
+    # Average of each stat per decade, read from the cube instead of the player rows
+    means = cube.slice_means(data, "Decade", key_stats + ["HR/PA", "K%", "BB%"],
+                             starters_only=player_type == "Starters Only (PA ≥ 100)")
+    means.rename(columns={"SO": "K"}, inplace=True)  # Rename "SO" to "K" for consistency
+    means.index = means.index.astype(str)  # Use the decade as the key
+
+    return means.T, means["HR"].rename("Avg HR per Player"), means["K"].rename("Avg K per Player"), \
+        means["BB"].rename("Avg BB per Player")  # Return processed data
+
+
+# Function to plot trends for hitting metrics
+def plot_trends(summary_stats, title, player_type):
+    if summary_stats.empty:  # Check if the summary statistics are empty
+        st.warning("No valid data to plot.")  # Show a warning if no data is available
+        return  # Exit the function
+
+    summary_stats = summary_stats.T  # Transpose the DataFrame for plotting
+    summary_stats.index = summary_stats.index.astype(int)  # Convert the index to integers
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(10, 5))  # Create a matplotlib figure and axis
+        for col in ["BA", "OBP", "SLG", "HR/PA", "K%", "BB%"]:  # Loop through the columns to plot
+            if col in summary_stats.columns:  # Check if the column exists in the DataFrame
+                ax.plot(summary_stats.index, summary_stats[col], marker='o', label=col)  # Plot the column
+
+        ax.set_xlabel("Decade")  # Set the x-axis label
+        ax.set_ylabel("Metric Value")  # Set the y-axis label
+        ax.set_title(title)  # Set the plot title
+        ax.legend()  # Add a legend to the plot
+        ax.grid()  # Add a grid to the plot
+        return fig
+
+    figures.show_figure(draw, ("trends", title, player_type))  # Display the plot (drawn once per dataset)
+
+
+# Function to plot averages for individual metrics
+def plot_avg_totals(avg_series, title, ylabel, player_type):
+    avg_series.index = avg_series.index.astype(int)  # Convert the index to integers
+
+    def draw():
+        fig, ax = plt.subplots(figsize=(10, 5))  # Create a matplotlib figure and axis
+        ax.plot(avg_series.index, avg_series.values, marker='o', linestyle='-', label=title)  # Plot the series
+
+        ax.set_xlabel("Decade")  # Set the x-axis label
+        ax.set_ylabel(ylabel)  # Set the y-axis label
+        ax.set_title(title)  # Set the plot title
+        ax.legend()  # Add a legend to the plot
+        ax.grid()  # Add a grid to the plot
+        return fig
+
+    figures.show_figure(draw, ("avg_totals", title, player_type))  # Display the plot (drawn once per dataset)
+
+
+def show():
+    # Title for the Decade Hitting Trends Analysis page
+    st.title("Decade Hitting Trends Analysis")
+
+    files = [f"{decade}stats.csv" for decade in decades]  # Generate file names for each decade
+
+    # Download missing files from the GitHub repository (all at once) and re-check old ones
+    for file, (status, detail) in bootstrap.ensure_data(files).items():
+        if status == "downloaded":
+            st.success(f"Downloaded: {file}")  # Show a success message
+        elif status == "error":
+            st.error(f"❌ Failed to download {file}: {detail}")  # Show an error message
+
+    # Function to load the precomputed decade cube (built once from the decade files, again when they change)
+    @st.cache_data  # Cache the function to optimize performance (one copy per data version)
+    def load_data(version):
+        try:
+            return cube.load_decade_cube()  # Counts, sums and means per decade, league, team and position
+        except Exception as e:  # Handle exceptions
+            st.error(f"❌ Error loading data: {e}")  # Show an error message
+            return pd.DataFrame()
+
+    with timing.span("load", "decade cube"):
+        data = load_data(data_store.data_version())  # Load the data using the load_data function
+
+    # Show a confirmation message if data is successfully loaded
+    if not data.empty:
+        st.write("Successfully loaded all available data!")
+
+    # Radio button for dataset selection
+    player_type = st.radio("Choose dataset:", ["All Players", "Starters Only (PA ≥ 100)"])  # Dataset options
+
+    # Process the data based on the selected dataset
+    with timing.span("compute", "decade means"):
+        summary_stats_avg, avg_HR, avg_K, avg_BB = process_data(data, player_type)
+
+    # Sidebar dropdown for plot selection
+    plot_option = st.sidebar.selectbox(
+        "Select a plot:",  # Label for the dropdown
+        ["Hitting Trends - Averages", "Average HRs per Player", "Average Strikeouts per Player",
+         "Average Walks per Player"]  # Plot options
+    )
+
+    # Display the selected plot
+    if plot_option == "Hitting Trends - Averages":
+        plot_trends(summary_stats_avg, "Hitting Trends - Averages (1950-2010)", player_type)
+    elif plot_option == "Average HRs per Player":
+        plot_avg_totals(avg_HR, "Average Home Runs Per Player Per Decade", "Avg HRs per Player", player_type)
+    elif plot_option == "Average Strikeouts per Player":
+        plot_avg_totals(avg_K, "Average Strikeouts Per Player Per Decade", "Avg Strikeouts per Player", player_type)
+    elif plot_option == "Average Walks per Player":
+        plot_avg_totals(avg_BB, "Average Walks Per Player Per Decade", "Avg Walks per Player", player_type)
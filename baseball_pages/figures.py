@@ -0,0 +1,98 @@
+# Cache for rendered matplotlib charts
+# Each chart is drawn once per set of inputs (data version plus things like the decade, season or dataset picked),
+# saved as PNG or SVG bytes, and shown from those bytes on later reruns instead of being drawn again.
+# Figures are closed as soon as they are saved so they don't pile up in pyplot's memory.
+import io  # for saving figures to bytes
+import os  # for the cache size settings
+import threading  # the cache is shared by every session
+from collections import OrderedDict  # for least-recently-used order
+import matplotlib.pyplot as plt  # for closing figures
+import streamlit as st  # for showing the images
+from baseball_pages import data_store  # for the data version
+from baseball_pages import timing  # for the render stage timings
+
+MAX_FIGURES = int(os.environ.get("FIGURE_CACHE_SIZE", 128))  # Charts kept before the oldest is dropped
+MAX_BYTES = int(os.environ.get("FIGURE_CACHE_MB", 64)) * 1024 * 1024  # Total size kept
+DPI = 200  # Same as st.pyplot
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+# Save a figure to PNG or SVG bytes and close it
+def render(fig, fmt="png", dpi=DPI):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown figure format {fmt!r}, expected one of {list(FORMATS)}")
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class FigureCache:
+    def __init__(self, max_entries=MAX_FIGURES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> bytes, oldest first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self.entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = data
+            self.size += len(data)
+            # Drop the least recently used charts until both limits are met
+            while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+                _, old = self.entries.popitem(last=False)
+                self.size -= len(old)
+
+    # Bytes for a chart: from the cache, or drawn with draw() (which returns a figure) and saved
+    def figure(self, key, draw, fmt="png"):
+        key = key + (fmt,)
+        data = self.get(key)
+        if data is None:
+            data = render(draw(), fmt)
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+_cache = None  # Shared cache, made on first use
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FigureCache()
+        return _cache
+
+
+# Show a chart in Streamlit, drawing it only the first time these inputs are seen
+# key is a tuple naming the chart and its inputs, like ("hitter_types", "1990"); the data version is added to it
+def show_figure(draw, key, fmt="png"):
+    with timing.span("render", "/".join(str(part) for part in key)):
+        data = get_cache().figure((data_store.data_version(),) + tuple(key), draw, fmt)
+        st.image(data.decode("utf-8") if fmt == "svg" else data, use_container_width=True)
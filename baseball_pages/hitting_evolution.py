@@ -1,63 +1,43 @@
 def show():
     # Import necessary libraries inside the function so it only loads when this page is run
     import streamlit as st # For creating the web app
-    import pandas as pd # For handling data tables
-    import numpy as np  # For numerical operations like smoothing
     import os  # For checking file paths
     import matplotlib.pyplot as plt  # For making charts
-    from sklearn.decomposition import PCA  # For running PCA
-    from sklearn.preprocessing import StandardScaler  # For normalizing data
-    from sklearn.cluster import KMeans  # For clustering years into groups
     from matplotlib.lines import Line2D  # For creating custom legends
+    from baseball_pages import data_store  # For cached data loading
+    from baseball_pages import models  # For the saved PCA / KMeans models
+    from baseball_pages import kselect  # For the saved elbow curves
+    from baseball_pages import trajectory  # For smoothing the yearly path
+    from baseball_pages import figures  # For drawing each chart once and reusing the image
+    from baseball_pages import timing  # For load / compute / render timings
 
     # App title at the top
     st.title("Hitting Evolution (1950–2010)")
 
 
-    DATA_DIR = "data" # Folder where all data is stored
-    decades = ["1950", "1960", "1970", "1980", "1990", "2000", "2010"]
-    files = [f"{decade}stats.csv" for decade in decades]
-    full_years_file = os.path.join(DATA_DIR, "combined_yearly_stats_all_players.csv")
-
-
-    decade_data = {} # Dictionary to store each decade's dataframe
-    for file in files:
-        path = os.path.join(DATA_DIR, file) # Create full path
-        if os.path.exists(path):  # Make sure the file exists
-            df = pd.read_csv(path, encoding="ISO-8859-1")  # Read the file
-            df.columns = df.columns.str.strip()  # Remove extra spaces from column names
-            decade_data[file[:4]] = df  # Store in dict using the decade as the key
-
-    # Stats to include in PC
-    key_stats = ["BA", "OBP", "SLG", "HR", "SO", "BB", "PA"]
-    decade_avg = {} # Will store average stats per decade
-    for decade, df in decade_data.items():
-        df = df[key_stats].copy()  # Take only key stats
-        df.rename(columns={"SO": "K"}, inplace=True) # Rename strikeouts to 'K'
-        df["HR/PA"] = df["HR"] / df["PA"]  # Add home runs per plate appearance
-        df["K%"] = df["K"] / df["PA"]  # Add strikeout rate
-        df["BB%"] = df["BB"] / df["PA"]  # Add walk rate
-        decade_avg[decade] = df.mean() # Store the average for each decade
-    summary_stats_avg = pd.DataFrame(decade_avg).T # Turn dict into dataframe
-
-    # PCA on decade data
-    scaler = StandardScaler() # Normalize the stats
-    pca_features = ["BA", "OBP", "SLG", "HR/PA", "K%", "BB%"]
-    scaled = scaler.fit_transform(summary_stats_avg[pca_features])
-    pca = PCA(n_components=2)  # Reduce to 2D
-    decade_pca_scores = pca.fit_transform(scaled) # Run PCA
-    decade_pca_df = pd.DataFrame(decade_pca_scores, columns=["PC1", "PC2"], index=summary_stats_avg.index)  # Save result
+    full_years_file = os.path.join(data_store.DATA_DIR, data_store.YEARLY_FILES["All Players"])
+
+
+    # StandardScaler + PCA on the decade averages and KMeans on the seasons, fit once per data version
+    # and saved to data/cache/models (see models.py)
+    with timing.span("load", "models"):
+        evolution = models.load_models(data_store.data_version())["evolution"]
+    pca_features = evolution["features"]
+    pca = evolution["pca"]
+    decade_pca_df = evolution["decade_scores"]  # Decade averages on PC1 / PC2
 
     # PCA Decades
     st.header("Decade-Based PCA of Hitting Trends")  # Section title
-    fig, ax = plt.subplots()  # Create chart
-    ax.scatter(decade_pca_df["PC1"], decade_pca_df["PC2"], color="blue") # Plot points
-    for i, txt in enumerate(decade_pca_df.index):
-        ax.annotate(txt, (decade_pca_df["PC1"][i], decade_pca_df["PC2"][i]))  # Label each point
-    ax.set_xlabel("Principal Component 1 (Contact Component)")
-    ax.set_ylabel("Principal Component 2 (Power Component)")
-    ax.set_title("PCA Analysis of Decade Seasons (Contact vs Power)")
-    st.pyplot(fig) # Show plot in Streamlit
+    def draw_decade_pca():
+        fig, ax = plt.subplots()  # Create chart
+        ax.scatter(decade_pca_df["PC1"], decade_pca_df["PC2"], color="blue") # Plot points
+        for i, txt in enumerate(decade_pca_df.index):
+            ax.annotate(txt, (decade_pca_df["PC1"].iloc[i], decade_pca_df["PC2"].iloc[i]))  # Label each point
+        ax.set_xlabel("Principal Component 1 (Contact Component)")
+        ax.set_ylabel("Principal Component 2 (Power Component)")
+        ax.set_title("PCA Analysis of Decade Seasons (Contact vs Power)")
+        return fig
+    figures.show_figure(draw_decade_pca, ("evolution", "decade_pca")) # Show plot in Streamlit (drawn once per data version)
     st.markdown(f"**Explained Variance:** PC1: {pca.explained_variance_ratio_[0]*100:.2f}%, "
                 f"PC2: {pca.explained_variance_ratio_[1]*100:.2f}%")
 
@@ -76,13 +56,15 @@ def show():
     """)
 
     #PCA Feature Contributions
-    loadings = pd.DataFrame(pca.components_.T, index=pca_features, columns=["PC1", "PC2"]) #get loadings of PCA
-    fig_load, ax_load = plt.subplots(figsize=(10, 5)) #Plot loadings
-    loadings.plot(kind='bar', ax=ax_load) #bar plot
-    ax_load.set_title("PCA Feature Contributions to PC1 and PC2")
-    ax_load.set_ylabel("Contribution Magnitude")
-    ax_load.set_xlabel("Hitting Metrics")
-    st.pyplot(fig_load)
+    loadings = evolution["loadings"] #get loadings of PCA
+    def draw_loadings():
+        fig_load, ax_load = plt.subplots(figsize=(10, 5)) #Plot loadings
+        loadings.plot(kind='bar', ax=ax_load) #bar plot
+        ax_load.set_title("PCA Feature Contributions to PC1 and PC2")
+        ax_load.set_ylabel("Contribution Magnitude")
+        ax_load.set_xlabel("Hitting Metrics")
+        return fig_load
+    figures.show_figure(draw_loadings, ("evolution", "loadings", "decades"))
     st.dataframe(loadings.style.format("{:.2f}"))
 
     st.markdown("""**PCA Weight Interpretation:**  
@@ -95,18 +77,10 @@ def show():
     """)
 
     # load dataset and stats
-    if os.path.exists(full_years_file):
-        full_df = pd.read_csv(full_years_file, encoding="ISO-8859-1")
-        full_df.columns = full_df.columns.str.strip()
-        full_df["HR/PA"] = full_df["HR"] / full_df["PA"]
-        full_df["K%"] = full_df["SO"] / full_df["PA"]
-        full_df["BB%"] = full_df["BB"] / full_df["PA"]
-
-        # Average the key stats by year
-        year_grouped = full_df.groupby("Year")[pca_features].mean().dropna() #clean data by dropping na
-        projected_scaled = scaler.transform(year_grouped)
-        year_scores = pca.transform(projected_scaled)
-        year_pca_df = pd.DataFrame(year_scores, columns=["PC1", "PC2"], index=year_grouped.index)
+    if os.path.exists(full_years_file) and evolution["year_scores"] is not None:
+        # Yearly averages of the key stats, projected onto the decade PCA
+        year_grouped = evolution["year_means"]
+        year_pca_df = evolution["year_scores"].copy()  # Copy so the saved model isn't changed
 
         # # Define color for each decade
         def get_decade_color(year):
@@ -121,27 +95,29 @@ def show():
 
         # Year-by-Year PCA
         st.header("Year-by-Year Contact vs Power PCA")
-        fig2, ax2 = plt.subplots() #plot the plots
-        for year in year_pca_df.index: #look over year_pca dataframe
-            color = get_decade_color(year) #use decade color
-            label_color = 'red' if year % 10 == 0 else 'black' # make label of every beginning of decade (like 1950 or 60) red
-            ax2.scatter(year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"], color=color) #make a scatter plot using PC1 and 2
-            ax2.annotate(str(year), (year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"]), fontsize=7, color=label_color) #label the year
-        ax2.set_xlabel("Principal Component 1 (Contact Component)")
-        ax2.set_ylabel("Principal Component 2 (Power Component)")
-        ax2.set_title("Yearly PCA of MLB Hitting (Contact vs Power)")
-
-        legend_elements = [ #legend to understand what each color means
-            Line2D([0], [0], marker='o', color='w', label='1950s', markerfacecolor='black'),
-            Line2D([0], [0], marker='o', color='w', label='1960s', markerfacecolor='blue'),
-            Line2D([0], [0], marker='o', color='w', label='1970s', markerfacecolor='green'),
-            Line2D([0], [0], marker='o', color='w', label='1980s', markerfacecolor='red'),
-            Line2D([0], [0], marker='o', color='w', label='1990s', markerfacecolor='purple'),
-            Line2D([0], [0], marker='o', color='w', label='2000s', markerfacecolor='brown'),
-            Line2D([0], [0], marker='o', color='w', label='2010s', markerfacecolor='magenta')
-        ]
-        ax2.legend(handles=legend_elements, title="Decade")
-        st.pyplot(fig2)
+        def draw_year_pca():
+            fig2, ax2 = plt.subplots() #plot the plots
+            for year in year_pca_df.index: #look over year_pca dataframe
+                color = get_decade_color(year) #use decade color
+                label_color = 'red' if year % 10 == 0 else 'black' # make label of every beginning of decade (like 1950 or 60) red
+                ax2.scatter(year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"], color=color) #make a scatter plot using PC1 and 2
+                ax2.annotate(str(year), (year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"]), fontsize=7, color=label_color) #label the year
+            ax2.set_xlabel("Principal Component 1 (Contact Component)")
+            ax2.set_ylabel("Principal Component 2 (Power Component)")
+            ax2.set_title("Yearly PCA of MLB Hitting (Contact vs Power)")
+
+            legend_elements = [ #legend to understand what each color means
+                Line2D([0], [0], marker='o', color='w', label='1950s', markerfacecolor='black'),
+                Line2D([0], [0], marker='o', color='w', label='1960s', markerfacecolor='blue'),
+                Line2D([0], [0], marker='o', color='w', label='1970s', markerfacecolor='green'),
+                Line2D([0], [0], marker='o', color='w', label='1980s', markerfacecolor='red'),
+                Line2D([0], [0], marker='o', color='w', label='1990s', markerfacecolor='purple'),
+                Line2D([0], [0], marker='o', color='w', label='2000s', markerfacecolor='brown'),
+                Line2D([0], [0], marker='o', color='w', label='2010s', markerfacecolor='magenta')
+            ]
+            ax2.legend(handles=legend_elements, title="Decade")
+            return fig2
+        figures.show_figure(draw_year_pca, ("evolution", "year_pca"))
 
         st.markdown("""**Interpretation:**  
         This chart zooms in from decades to individual seasons, and the story gets even more interesting. 
@@ -159,15 +135,15 @@ def show():
         """)
 
         # Plot PCA loadings for Year-by-Year PCA
-        loadings = pca.components_
-        feature_names = pca_features
-        loadings_df = pd.DataFrame(loadings.T, columns=["PC1", "PC2"], index=feature_names)
-        fig_weights, ax_weights = plt.subplots(figsize=(10, 6))
-        loadings_df.plot(kind='bar', ax=ax_weights)
-        ax_weights.set_title("PCA Feature Contributions to PC1 and PC2")
-        ax_weights.set_ylabel("Contribution Magnitude")
-        ax_weights.set_xlabel("Hitting Metrics")
-        st.pyplot(fig_weights)
+        loadings_df = evolution["loadings"]
+        def draw_year_loadings():
+            fig_weights, ax_weights = plt.subplots(figsize=(10, 6))
+            loadings_df.plot(kind='bar', ax=ax_weights)
+            ax_weights.set_title("PCA Feature Contributions to PC1 and PC2")
+            ax_weights.set_ylabel("Contribution Magnitude")
+            ax_weights.set_xlabel("Hitting Metrics")
+            return fig_weights
+        figures.show_figure(draw_year_loadings, ("evolution", "loadings", "years"))
         st.dataframe(loadings_df.style.format("{:.2f}"))
 
         # Interpretation
@@ -182,47 +158,66 @@ def show():
 
         # KMeans Clustering
         st.header("Clustered Year by Year PCA") #title
-        kmeans = KMeans(n_clusters=4, random_state=42) #amount of clusters and the random state
-        year_pca_df["Cluster"] = kmeans.fit_predict(year_pca_df[["PC1", "PC2"]]) #cluster on the year pca
-        fig3, ax3 = plt.subplots() #plot it
-        for cluster in sorted(year_pca_df["Cluster"].unique()): #
-            subset = year_pca_df[year_pca_df["Cluster"] == cluster]
-            ax3.scatter(subset["PC1"], subset["PC2"], label=f"Cluster {cluster}")
-            for year in subset.index:
-                ax3.annotate(str(year), (subset.loc[year, "PC1"], subset.loc[year, "PC2"]), fontsize=7)
-        ax3.set_title("KMeans Clustering of Yearly Hitting PCA (Contact vs Power)")
-        ax3.set_xlabel("Principal Component 1 (Contact Component)")
-        ax3.set_ylabel("Principal Component 2 (Power Component)")
-        ax3.legend()
-        st.pyplot(fig3)
+        year_pca_df["Cluster"] = evolution["clusters"] #4 clusters on the year pca (random_state 42)
+        def draw_clusters():
+            fig3, ax3 = plt.subplots() #plot it
+            for cluster in sorted(year_pca_df["Cluster"].unique()): #
+                subset = year_pca_df[year_pca_df["Cluster"] == cluster]
+                ax3.scatter(subset["PC1"], subset["PC2"], label=f"Cluster {cluster}")
+                for year in subset.index:
+                    ax3.annotate(str(year), (subset.loc[year, "PC1"], subset.loc[year, "PC2"]), fontsize=7)
+            ax3.set_title("KMeans Clustering of Yearly Hitting PCA (Contact vs Power)")
+            ax3.set_xlabel("Principal Component 1 (Contact Component)")
+            ax3.set_ylabel("Principal Component 2 (Power Component)")
+            ax3.legend()
+            return fig3
+        figures.show_figure(draw_clusters, ("evolution", "clusters"))
 
         # Cluster descriptions
         st.write("**Cluster Averages:**")
-        full_with_years = full_df.groupby("Year")[pca_features].mean().dropna()
+        full_with_years = year_grouped.copy()
         full_with_years["Cluster"] = year_pca_df["Cluster"]
-        st.dataframe(full_with_years.groupby("Cluster").mean().style.format("{:.3f}"))
-
-        # Define a range of cluster numbers to test
-        cluster_range = range(1, 11)
+        with timing.span("compute", "cluster averages"):
+            cluster_means = full_with_years.groupby("Cluster").mean()
+        st.dataframe(cluster_means.style.format("{:.3f}"))
 
-        # Store the sum of squared distances (inertia) for each number of clusters
-        inertia = []
-
-        # Perform K-Means clustering for each number of clusters
-        for k in cluster_range:
-            kmeans = KMeans(n_clusters=k, random_state=42)
-            kmeans.fit(year_pca_df[["PC1", "PC2"]])  # Use the PCA-transformed data
-            inertia.append(kmeans.inertia_)
+        # Inertia and silhouette for k = 1 to 10 (computed in parallel once per data version, see kselect.py)
+        with timing.span("load", "elbow seasons"):
+            elbow = kselect.load_elbow(data_store.data_version(), "seasons")
 
         # Plot the elbow curve
         # Plot the elbow curve correctly for Streamlit
-        fig_elbow, ax_elbow = plt.subplots(figsize=(8, 5))
-        ax_elbow.plot(cluster_range, inertia, marker='o', linestyle='-')
-        ax_elbow.set_xlabel("Number of Clusters")
-        ax_elbow.set_ylabel("Inertia (Sum of Squared Distances)")
-        ax_elbow.set_title("Elbow Method for Optimal Clusters")
-        ax_elbow.grid(True)
-        st.pyplot(fig_elbow)  # Display the elbow plot in Streamlit
+        def draw_elbow():
+            fig_elbow, ax_elbow = plt.subplots(figsize=(8, 5))
+            ax_elbow.plot(elbow.index, elbow["inertia"], marker='o', linestyle='-')
+            ax_elbow.set_xlabel("Number of Clusters")
+            ax_elbow.set_ylabel("Inertia (Sum of Squared Distances)")
+            ax_elbow.set_title("Elbow Method for Optimal Clusters")
+            ax_elbow.grid(True)
+            ax_sil = ax_elbow.twinx()  # Silhouette on a second axis (higher means better separated clusters)
+            ax_sil.plot(elbow.index, elbow["silhouette"], marker='s', linestyle='--', color='orange')
+            ax_sil.set_ylabel("Silhouette Score", color='orange')
+            return fig_elbow
+        figures.show_figure(draw_elbow, ("evolution", "elbow", "seasons"))  # Display the elbow plot in Streamlit
+
+        # Same curve for every player season instead of the 61 season averages
+        if st.checkbox(f"Show the elbow curve for individual player seasons ({kselect.MIN_PA}+ PA)"):
+            with st.spinner("Clustering player seasons..."), timing.span("load", "elbow players"):
+                player_elbow = kselect.load_elbow(data_store.data_version(), "players")
+            def draw_player_elbow():
+                fig_players, ax_players = plt.subplots(figsize=(8, 5))
+                ax_players.plot(player_elbow.index, player_elbow["inertia"], marker='o', linestyle='-')
+                ax_players.set_xlabel("Number of Clusters")
+                ax_players.set_ylabel("Inertia (Sum of Squared Distances)")
+                ax_players.set_title("Elbow Method for Player Seasons")
+                ax_players.grid(True)
+                ax_players_sil = ax_players.twinx()
+                ax_players_sil.plot(player_elbow.index, player_elbow["silhouette"], marker='s', linestyle='--',
+                                    color='orange')
+                ax_players_sil.set_ylabel("Silhouette Score", color='orange')
+                return fig_players
+            figures.show_figure(draw_player_elbow, ("evolution", "elbow", "players"))
+            st.caption(f"Biggest bend in the curve at k={kselect.elbow_k(player_elbow)}")
 
         st.markdown("""**Interpretation:**  
         Each cluster groups years with similar hitting profiles. For example, one group may include seasons 
@@ -250,38 +245,31 @@ def show():
         # Trend Line Through Years
         st.header("Trend Line of Year by Year PCA")
         st.write("Every 5 years labeled")
-        fig4, ax4 = plt.subplots()
-        ax4.plot(year_pca_df["PC1"], year_pca_df["PC2"], color='yellow', label = 'Trend Line')
-        ax4.scatter(year_pca_df["PC1"], year_pca_df["PC2"], color='gray', label = 'Seasons')
-        for year in year_pca_df.index:
-            if year % 5 == 0:
-                ax4.annotate(str(year), (year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"]), fontsize=10, color="blue")
-        ax4.set_xlabel("Principal Component 1 (Contact Component)")
-        ax4.set_ylabel("Principal Component 2 (Power Component)")
-        ax4.set_title("Trend Line of Yearly Hitting PCA (Contact vs Power)")
-        ax4.legend()
-        st.pyplot(fig4)
+        def draw_trend():
+            fig4, ax4 = plt.subplots()
+            ax4.plot(year_pca_df["PC1"], year_pca_df["PC2"], color='yellow', label = 'Trend Line')
+            ax4.scatter(year_pca_df["PC1"], year_pca_df["PC2"], color='gray', label = 'Seasons')
+            for year in year_pca_df.index:
+                if year % 5 == 0:
+                    ax4.annotate(str(year), (year_pca_df.loc[year, "PC1"], year_pca_df.loc[year, "PC2"]), fontsize=10, color="blue")
+            ax4.set_xlabel("Principal Component 1 (Contact Component)")
+            ax4.set_ylabel("Principal Component 2 (Power Component)")
+            ax4.set_title("Trend Line of Yearly Hitting PCA (Contact vs Power)")
+            ax4.legend()
+            return fig4
+        figures.show_figure(draw_trend, ("evolution", "trend"))
 
         # Apply smoothing to PC1 and PC2
         st.header("Smoothed Trend Line of Year by Year Hitting PCA (Contact vs Power)")
         st.write("Only every 5 years shown, projected directly onto the smoothed path")
 
-        #  Define smoothing
-        def smooth_series(series, window_size=5):
-            n = len(series)
-            smoothed = np.zeros(n)
-            for i in range(n):
-                indices = list(range(max(0, i - 2), min(n, i + 3)))
-                smoothed[i] = np.mean([series[j] for j in indices])
-            return smoothed
-
-        # --- Smooth PC1 and PC2
+        # --- Smooth PC1 and PC2 (centered 5-year mean, narrower at the first and last years; see trajectory.py)
         years = year_pca_df.index.tolist()
         pc1 = year_pca_df["PC1"].values
         pc2 = year_pca_df["PC2"].values
 
-        smoothed_pc1 = smooth_series(pc1)
-        smoothed_pc2 = smooth_series(pc2)
+        with timing.span("compute", "smoothed path"):
+            smoothed_pc1, smoothed_pc2 = trajectory.smooth_path(pc1, pc2, method="mean", window=5)
 
         # Get positions of every 5th year
         projection_years = [year for year in years if year % 5 == 0]
@@ -294,19 +282,21 @@ def show():
             projection_coords.append((x, y, proj_year))
 
         # Plot smoothed line and projections only
-        fig5, ax5 = plt.subplots(figsize=(8, 6))
-        ax5.plot(smoothed_pc1, smoothed_pc2, color='orange', linewidth=2, label='Smoothed Trend Line')
-
-        # Label projected years only
-        for x, y, year in projection_coords:
-            ax5.scatter(x, y, color='blue', s=40)
-            ax5.annotate(str(year), (x, y), fontsize=10, color='blue')
-
-        ax5.set_xlabel("Principal Component 1 (Contact Component)")
-        ax5.set_ylabel("Principal Component 2 (Power Component)")
-        ax5.set_title("Smoothed Trend Line of Yearly Hitting PCA (Contact vs Power)")
-        ax5.legend(["Smoothed Trend Line"])
-        st.pyplot(fig5)
+        def draw_smoothed_trend():
+            fig5, ax5 = plt.subplots(figsize=(8, 6))
+            ax5.plot(smoothed_pc1, smoothed_pc2, color='orange', linewidth=2, label='Smoothed Trend Line')
+
+            # Label projected years only
+            for x, y, year in projection_coords:
+                ax5.scatter(x, y, color='blue', s=40)
+                ax5.annotate(str(year), (x, y), fontsize=10, color='blue')
+
+            ax5.set_xlabel("Principal Component 1 (Contact Component)")
+            ax5.set_ylabel("Principal Component 2 (Power Component)")
+            ax5.set_title("Smoothed Trend Line of Yearly Hitting PCA (Contact vs Power)")
+            ax5.legend(["Smoothed Trend Line"])
+            return fig5
+        figures.show_figure(draw_smoothed_trend, ("evolution", "smoothed_trend"))
 
         st.markdown("""**Interpretation:**  
         The trajectory line shows a clear directional evolution from high contact/low power years in the 1950s
@@ -0,0 +1,103 @@
+# Choosing the number of KMeans clusters (elbow curve)
+# Inertia and silhouette for each k are worked out in parallel (one process per k) and saved per data version,
+# so the curve is only computed once. Large inputs, like every player season, use MiniBatchKMeans and a
+# sampled silhouette score so they stay quick.
+import os  # for file paths
+import json  # for saving the curves
+import glob  # for removing old curves
+from functools import lru_cache  # to keep the curves in memory per data version
+import numpy as np  # for the arrays
+import pandas as pd  # for the results table
+from joblib import Parallel, delayed, parallel_config  # for running each k in its own process
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from baseball_pages import data_store  # for the data
+from baseball_pages import models  # for the saved PCA
+
+ELBOW_DIR = models.MODEL_DIR
+K_RANGE = range(1, 11)
+PARALLEL_MIN_ROWS = 2000  # Smaller inputs are quicker without starting processes
+MINIBATCH_MIN_ROWS = 50000  # Inputs this big use MiniBatchKMeans
+SILHOUETTE_SAMPLE = 5000  # Rows used for the silhouette score (it compares every pair of rows)
+MIN_PA = 100  # Player seasons used for the player-level curve (same as the Starters Only data)
+
+
+# Inertia and silhouette for one k
+def evaluate_k(X, k, random_state=42, sample_size=SILHOUETTE_SAMPLE):
+    if len(X) >= MINIBATCH_MIN_ROWS:
+        model = MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=4096, n_init=3)
+    else:
+        model = KMeans(n_clusters=k, random_state=random_state)
+    labels = model.fit_predict(X)
+    silhouette = np.nan
+    if 1 < k < len(X) and len(np.unique(labels)) > 1:
+        sample = min(sample_size, len(X)) if sample_size else None
+        silhouette = silhouette_score(X, labels, sample_size=sample, random_state=random_state)
+    return {"k": k, "inertia": float(model.inertia_), "silhouette": float(silhouette)}
+
+
+# Inertia and silhouette for every k in k_range, one process per k when the input is big enough
+# n_jobs=-1 uses every core; each process runs single-threaded so the cores aren't oversubscribed
+def elbow_curve(X, k_range=K_RANGE, random_state=42, n_jobs=-1):
+    X = np.asarray(X, dtype=float)
+    k_range = [k for k in k_range if k <= len(X)]
+    if len(X) < PARALLEL_MIN_ROWS or n_jobs == 1:
+        rows = [evaluate_k(X, k, random_state) for k in k_range]
+    else:
+        with parallel_config(backend="loky", inner_max_num_threads=1):
+            rows = Parallel(n_jobs=n_jobs)(delayed(evaluate_k)(X, k, random_state) for k in k_range)
+    return pd.DataFrame(rows).set_index("k")
+
+
+# k with the biggest bend in the inertia curve (largest second difference)
+def elbow_k(curve):
+    inertia = curve["inertia"].to_numpy()
+    if len(inertia) < 3:
+        return int(curve.index[0])
+    bend = inertia[:-2] - 2 * inertia[1:-1] + inertia[2:]
+    return int(curve.index[1 + int(np.argmax(bend))])
+
+
+# Points to cluster: "seasons" is the yearly averages on the PCA (what the Hitting Evolution page clusters),
+# "players" is every player season with MIN_PA+ PA projected onto the same PCA
+def cluster_inputs(version, level="seasons"):
+    evolution = models.load_models(version)["evolution"]
+    if level == "seasons":
+        return evolution["year_scores"][["PC1", "PC2"]].to_numpy()
+    yearly = data_store.load_yearly("All Players")
+    rows = yearly[yearly["PA"] >= MIN_PA][evolution["features"]].astype("float64").dropna()
+    return evolution["pca"].transform(evolution["scaler"].transform(rows))
+
+
+def elbow_path(version, level):
+    return os.path.join(ELBOW_DIR, f"elbow_{level}_{version}.json")
+
+
+# Elbow curve for a data version (pass data_store.data_version()): from memory, then disk, then computed
+@lru_cache(maxsize=4)
+def load_elbow(version, level="seasons"):
+    path = elbow_path(version, level)
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            return pd.DataFrame(saved["rows"]).set_index("k")
+        except (OSError, ValueError, KeyError):
+            pass  # Recompute a broken file
+
+    X = cluster_inputs(version, level)
+    curve = elbow_curve(X)
+    try:
+        os.makedirs(ELBOW_DIR, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "level": level, "n": len(X),
+                       "rows": curve.reset_index().to_dict("records")}, f)
+        os.replace(tmp, path)
+        # Only keep curves for the newest few data versions, like the model files
+        old = sorted(glob.glob(os.path.join(ELBOW_DIR, f"elbow_{level}_*.json")), key=os.path.getmtime)
+        for stale in old[:-models.KEEP_VERSIONS]:
+            os.remove(stale)
+    except OSError:
+        pass  # Still usable for this process even if it can't be saved
+    return curve
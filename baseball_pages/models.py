@@ -0,0 +1,128 @@
+# Fitted models shared by the pages, saved once per data version
+# The StandardScaler / PCA / KMeans behind the Hitting Evolution page and the MinMaxScaler behind the
+# Contact / Power scores are fit the first time a data version is seen, saved to data/cache/models, and
+# loaded from there after that (across sessions and restarts)
+import os  # for file paths
+import glob  # for removing old model files
+from functools import lru_cache  # to keep the models in memory per data version
+import joblib  # for saving the fitted models
+import numpy as np  # for the thresholds
+import pandas as pd  # for data processing
+import sklearn  # for the version the models were saved with
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+from sklearn.decomposition import PCA
+from sklearn.cluster import KMeans
+from baseball_pages import data_store  # for loading the data
+from baseball_pages import cube  # for the yearly averages
+from baseball_pages import scoring  # for the Contact / Power scores
+
+MODEL_DIR = os.path.join(data_store.CACHE_DIR, "models")
+KEEP_VERSIONS = 3  # Model files kept for older data versions
+
+# Hitting Evolution settings (same as the page always used)
+KEY_STATS = ["BA", "OBP", "SLG", "HR", "SO", "BB", "PA"]
+PCA_FEATURES = ["BA", "OBP", "SLG", "HR/PA", "K%", "BB%"]
+N_CLUSTERS = 4
+
+
+# Average of the key stats for each decade
+def decade_averages(decade_data):
+    decade_avg = {}
+    for decade, df in decade_data.items():
+        df = df[KEY_STATS].copy()  # Take only key stats
+        df.rename(columns={"SO": "K"}, inplace=True)  # Rename strikeouts to 'K'
+        df["HR/PA"] = df["HR"] / df["PA"]  # Add home runs per plate appearance
+        df["K%"] = df["K"] / df["PA"]  # Add strikeout rate
+        df["BB%"] = df["BB"] / df["PA"]  # Add walk rate
+        decade_avg[decade] = df.mean()  # Store the average for each decade
+    return pd.DataFrame(decade_avg).T
+
+
+# PCA fit on the decade averages, every season projected onto it, and the seasons clustered with KMeans
+def fit_evolution(decade_data, yearly_cube=None):
+    decade_means = decade_averages(decade_data)
+    scaler = StandardScaler()
+    pca = PCA(n_components=2)
+    decade_scores = pd.DataFrame(pca.fit_transform(scaler.fit_transform(decade_means[PCA_FEATURES])),
+                                 columns=["PC1", "PC2"], index=decade_means.index)
+    model = {
+        "features": PCA_FEATURES,
+        "decade_means": decade_means,
+        "scaler": scaler,
+        "pca": pca,
+        "decade_scores": decade_scores,
+        "loadings": pd.DataFrame(pca.components_.T, index=PCA_FEATURES, columns=["PC1", "PC2"]),
+        "explained_variance": pca.explained_variance_ratio_,
+        "year_means": None, "year_scores": None, "kmeans": None, "clusters": None,
+    }
+    if yearly_cube is None or yearly_cube.empty:
+        return model
+
+    year_means = cube.slice_means(yearly_cube, "Year", PCA_FEATURES).dropna()
+    year_scores = pd.DataFrame(pca.transform(scaler.transform(year_means)),
+                               columns=["PC1", "PC2"], index=year_means.index)
+    kmeans = KMeans(n_clusters=N_CLUSTERS, random_state=42)
+    clusters = pd.Series(kmeans.fit_predict(year_scores[["PC1", "PC2"]]), index=year_scores.index, name="Cluster")
+    model.update(year_means=year_means, year_scores=year_scores, kmeans=kmeans, clusters=clusters)
+    return model
+
+
+# MinMaxScaler for the Contact / Power scores and the top-25% cut-offs used to label hitters
+def fit_contact_power(decade_data):
+    X = scoring.decade_frame(decade_data)[scoring.SCALE_COLS].to_numpy(dtype=float)
+    scaler = MinMaxScaler().fit(X)
+    _, contact, power = scoring.score_arrays(X, scaler.scale_, scaler.min_)
+    thresholds = {"ContactScore": float(np.quantile(contact, 0.75)), "PowerScore": float(np.quantile(power, 0.75))}
+    return {"features": scoring.SCALE_COLS, "scaler": scaler, "thresholds": thresholds}
+
+
+def model_path(version):
+    return os.path.join(MODEL_DIR, f"models_{version}.joblib")
+
+
+# Fit every model for the current data
+def build_models(version):
+    decade_data = data_store.load_decades()
+    yearly_file = os.path.join(data_store.DATA_DIR, data_store.YEARLY_FILES["All Players"])
+    yearly_cube = cube.load_yearly_cube() if os.path.exists(yearly_file) else None
+    return {"version": version, "sklearn": sklearn.__version__,
+            "evolution": fit_evolution(decade_data, yearly_cube),
+            "contact_power": fit_contact_power(decade_data)}
+
+
+# Models for a data version (pass data_store.data_version()): from memory, then disk, then fit and saved
+# Files saved by a different scikit-learn version are refit rather than trusted
+@lru_cache(maxsize=2)
+def load_models(version):
+    path = model_path(version)
+    if os.path.exists(path):
+        try:
+            models = joblib.load(path)
+            if models.get("version") == version and models.get("sklearn") == sklearn.__version__:
+                return models
+        except Exception:
+            pass  # Refit a broken or incompatible file
+
+    models = build_models(version)
+    try:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        tmp = path + ".tmp"
+        joblib.dump(models, tmp)
+        os.replace(tmp, path)
+        # Only keep the newest few data versions
+        old = sorted(glob.glob(os.path.join(MODEL_DIR, "models_*.joblib")), key=os.path.getmtime)
+        for stale in old[:-KEEP_VERSIONS]:
+            os.remove(stale)
+    except OSError:
+        pass  # Still usable for this process even if it can't be saved
+    return models
+
+
+if __name__ == "__main__":
+    # Fit (or load) the models for the current data and show what's in them
+    models = load_models(data_store.data_version())
+    evolution = models["evolution"]
+    print(f"Models for data version {models['version']} -> {model_path(models['version'])}")
+    print("Explained variance:", [round(float(v), 4) for v in evolution["explained_variance"]])
+    print(evolution["loadings"].round(3).to_string())
+    print("Contact / Power thresholds:", models["contact_power"]["thresholds"])
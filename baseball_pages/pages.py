@@ -0,0 +1,92 @@
+# Page registry for main.py
+# Each page's module is only imported when that page is opened, so starting the app (or opening the Dashboard)
+# doesn't pull in scikit-learn, openai, plotly and the rest for pages nobody has visited yet.
+# Running this file prints how long each page takes to import on a cold start:
+#   python -m baseball_pages.pages
+#   python -m baseball_pages.pages --budget-ms 2000    (exits with 1 if starting the app takes longer)
+import argparse  # for the command line report
+import importlib  # for importing pages by name
+import os  # for the project folder
+import re  # for reading -X importtime output
+import subprocess  # for cold-start imports in a fresh interpreter
+import sys  # for the Python executable
+
+# Sidebar title -> module with a show() function, in sidebar order
+PAGES = {
+    "Dashboard": "baseball_pages.dashboard",
+    "Year by Year TSNE": "baseball_pages.video",
+    "Players (Contact vs Power)": "baseball_pages.players",
+    "Analysis of Hitting Evolution": "baseball_pages.hitting_evolution",
+    "Decade Hitting Trends Analysis": "baseball_pages.decade_trends",
+    "Year by Year Hitting Analysis": "baseball_pages.yearly_analysis",
+    "Chatbot": "baseball_pages.chatbot",
+}
+DEFAULT_PAGE = "Dashboard"
+# Modules main.py imports before any page (keep in sync with the top of main.py)
+STARTUP_MODULES = ["streamlit", "baseball_pages.pages", "baseball_pages.analytics", "baseball_pages.timing"]
+COLD_START_BUDGET_MS = 2500  # Starting the app and opening the Dashboard should fit in this
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKER = "baseball_pages.pages: page imports start"
+
+
+# The page's module, imported the first time it's needed (Python keeps it after that)
+def load_page(title):
+    return importlib.import_module(PAGES[title])
+
+
+# Import `modules` in a fresh interpreter with -X importtime and return what they added after the startup
+# modules: (total ms, {top-level package: ms}), so sklearn, openai, plotly... each show up on their own
+def measure_imports(modules, startup=STARTUP_MODULES):
+    code = "; ".join([f"import {m}" for m in startup] + [f"import sys; print({MARKER!r}, file=sys.stderr)"]
+                     + [f"import {m}" for m in modules])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {modules} failed:\n{result.stderr[-2000:]}")
+    lines = result.stderr.split(MARKER, 1)[1].splitlines() if MARKER in result.stderr else []
+    packages = {}
+    for line in lines:
+        # "import time: self [us] | cumulative | imported package"; each module's own time goes to its package
+        match = re.match(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)", line)
+        if match:
+            package = match.group(2).split(".")[0]
+            packages[package] = packages.get(package, 0) + int(match.group(1)) / 1000
+    return sum(packages.values()), dict(sorted(packages.items(), key=lambda item: -item[1]))
+
+
+# Import time of every page on its own, after the startup modules: list of dicts, slowest first
+def import_report(titles=None, top=5):
+    rows = []
+    for title in titles or PAGES:
+        total, packages = measure_imports([PAGES[title]])
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in list(packages.items())[:top])
+        rows.append({"page": title, "module": PAGES[title], "import_ms": round(total, 1), "heaviest_ms": heaviest})
+    return sorted(rows, key=lambda row: -row["import_ms"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start import time for each page of the app")
+    parser.add_argument("--page", action="append", choices=list(PAGES), help="only report these pages")
+    parser.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS,
+                        help="most ms allowed for the startup imports plus the default page")
+    args = parser.parse_args()
+
+    startup_ms, startup_packages = measure_imports(STARTUP_MODULES, startup=[])  # What every visitor pays
+    print(f"Startup imports ({', '.join(STARTUP_MODULES)}): {startup_ms:.0f} ms")
+    print("  " + ", ".join(f"{name} {ms:.0f}" for name, ms in list(startup_packages.items())[:5]))
+    print()
+    rows = import_report(args.page)
+    width = max(len(row["page"]) for row in rows)
+    for row in rows:
+        print(f"{row['page']:<{width}}  {row['import_ms']:8.1f} ms   {row['heaviest_ms']}")
+
+    # Cold start: a new visitor gets the startup imports plus the default page
+    default_ms = next((row["import_ms"] for row in rows if row["page"] == DEFAULT_PAGE), None)
+    if default_ms is None:
+        default_ms = import_report([DEFAULT_PAGE])[0]["import_ms"]
+    cold_start = startup_ms + default_ms
+    print()
+    print(f"Cold start (startup + {DEFAULT_PAGE}): {cold_start:.0f} ms, budget {args.budget_ms:.0f} ms")
+    if cold_start > args.budget_ms:
+        print("Over budget")
+        sys.exit(1)
@@ -0,0 +1,232 @@
+# Lookup index keyed on the Baseball-Reference player ID ("Player-additional")
+# Each player maps to the positions of all of their decade and season rows, so looking a player up
+# never scans the whole frame, and the display name is kept apart from the handedness marker
+import re  # for splitting names and questions into words
+import unicodedata  # for dropping accents
+from functools import lru_cache  # to keep one index per data version
+import pandas as pd  # for data processing
+from baseball_pages import scoring  # for the scored frames
+from baseball_pages import data_store  # for the yearly data
+
+ID_COL = "Player-additional"
+HANDEDNESS = {"*": "L", "#": "S"}  # Name suffixes: * bats left, # switch hitter, nothing bats right
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}  # Left off when matching names
+# Words that are never part of a player's name in a question
+QUESTION_WORDS = {"how", "what", "which", "who", "when", "did", "does", "do", "was", "were", "is", "are", "the",
+                  "a", "an", "in", "of", "for", "and", "or", "vs", "versus", "compare", "with", "his", "their",
+                  "many", "much", "hit", "hits", "season", "seasons", "career", "year", "years", "to", "than",
+                  "best", "most", "home", "runs", "run", "average", "stats", "hitting", "hitter", "mlb"}
+
+
+# Split "Barry Bonds*" into ("Barry Bonds", "L")
+def split_name(name):
+    name = str(name).strip()
+    bats = "R"
+    while name and name[-1] in HANDEDNESS:
+        bats = HANDEDNESS[name[-1]]
+        name = name[:-1]
+    return name.strip(), bats
+
+
+# Undo names read with the wrong encoding (once or twice), like "RubÃ©n" -> "Rubén"
+def fix_encoding(name):
+    for _ in range(2):
+        try:
+            name = name.encode("latin-1").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            break
+    return name
+
+
+# Lowercase ASCII name for matching: "RubÃ©n Amaro Sr." -> "ruben amaro sr"
+def normalize_name(name):
+    name = fix_encoding(split_name(name)[0])
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    name = re.sub(r"[.'`]", "", name.lower())  # "J.R." -> "jr", "O'Neill" -> "oneill"
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+# Letter triples of a name, with spaces at the ends so first and last letters count too
+def trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PlayerIndex:
+    def __init__(self, player_df, yearly_df=None):
+        self.player_df = player_df  # Scored decade rows
+        self.yearly_df = yearly_df if yearly_df is not None else pd.DataFrame()  # Scored season rows
+        self.players = {}  # ID -> {"name", "bats", "label"}
+        self.decade_pos = {}  # ID -> row positions in player_df
+        self.season_pos = {}  # ID -> row positions in yearly_df
+        self.by_name = {}  # Display name -> list of IDs (different players can share a name)
+
+        for frame, positions in [(self.player_df, self.decade_pos), (self.yearly_df, self.season_pos)]:
+            if frame.empty or ID_COL not in frame.columns:
+                continue
+            for pid, rows in frame.groupby(ID_COL, sort=False, observed=True).indices.items():
+                if pid == "-9999":  # League Average row
+                    continue
+                positions[pid] = rows
+                if pid not in self.players:
+                    label = frame["Player"].iat[rows[0]]
+                    name, bats = split_name(label)
+                    self.players[pid] = {"name": name, "bats": bats, "label": label}
+                    self.by_name.setdefault(name.lower(), []).append(pid)
+
+    def __contains__(self, pid):
+        return pid in self.players
+
+    def __len__(self):
+        return len(self.players)
+
+    # Name as shown on Baseball-Reference, including the handedness marker
+    def label(self, pid):
+        return self.players[pid]["label"]
+
+    def name(self, pid):
+        return self.players[pid]["name"]
+
+    def bats(self, pid):
+        return self.players[pid]["bats"]
+
+    # IDs for a display name (with or without the * / # marker)
+    def ids_for_name(self, name):
+        return list(self.by_name.get(split_name(name)[0].lower(), []))
+
+    # All of a player's decade rows
+    def decade_rows(self, pid):
+        return self.player_df.iloc[self.decade_pos.get(pid, [])]
+
+    # All of a player's season rows
+    def season_rows(self, pid):
+        if self.yearly_df.empty:
+            return self.yearly_df
+        return self.yearly_df.iloc[self.season_pos.get(pid, [])]
+
+    # The player's decade row with the most PA, optionally only rows with a given Hitter Type
+    # None if the player only shows up in the season data (no decade row to score or compare)
+    def best_row(self, pid, hitter_type=None):
+        rows = self.decade_rows(pid)
+        if rows.empty:
+            return None
+        if hitter_type is not None and (rows["Hitter Type"] == hitter_type).any():
+            rows = rows[rows["Hitter Type"] == hitter_type]
+        return rows.loc[rows["PA"].idxmax()]
+
+    # Side-by-side table of stats for any number of players (one column per player)
+    # Players without a decade row are left out
+    def compare(self, pids, stats, hitter_types=None):
+        hitter_types = hitter_types or [None] * len(pids)
+        table = {"Stat": stats}
+        for pid, hitter_type in zip(pids, hitter_types):
+            row = self.best_row(pid, hitter_type)
+            if row is None:
+                continue
+            column = f"{self.name(pid)} ({int(row['Decade'])}s)"
+            while column in table:  # Same player picked twice
+                column += " "
+            table[column] = [row[s] for s in stats]
+        return pd.DataFrame(table)
+
+
+# Finds the players named in a chatbot question
+# Full names and aliases (with and without Jr./Sr., no middle names) are looked up directly, and a Jr. / Sr.
+# after a shorter alias rules out players with the other suffix. A capitalized two word name with a typo in
+# one of the words ("Mark McGwir") is found by trigram overlap with the names sharing the other word.
+# A last name on its own doesn't count, since it is as often a first name or a city ("Walker", "Boston").
+class NameSearch:
+    def __init__(self, index):
+        self.index = index
+        self.aliases = {}  # Normalized name or alias -> IDs
+        self.suffixes = {}  # ID -> "jr", "sr", ... or "" if the name has none
+        self.grams = {}  # Alias -> its trigrams
+        self.by_word = {}  # First or last word -> aliases starting or ending with it
+        self.pa = {}  # ID -> {year: PA}, for picking the likeliest player when a name is shared
+
+        for pid, info in index.players.items():
+            words = normalize_name(info["label"]).split()
+            if not words:
+                continue
+            full = " ".join(words)  # With the Jr. / Sr. kept, checked before the shorter aliases
+            while len(words) > 2 and words[-1] in SUFFIXES:
+                words = words[:-1]
+            self.suffixes[pid] = full[len(" ".join(words)):].strip()
+            for alias in {full, " ".join(words), f"{words[0]} {words[-1]}"}:
+                self.aliases.setdefault(alias, []).append(pid)
+
+        for alias in self.aliases:
+            self.grams[alias] = trigrams(alias)
+            words = alias.split()
+            for word in {words[0], words[-1]}:
+                self.by_word.setdefault(word, []).append(alias)
+
+        yearly = index.yearly_df
+        if not yearly.empty and {"Year", "PA"}.issubset(yearly.columns):
+            totals = yearly.groupby([ID_COL, "Year"], observed=True)["PA"].sum()  # One pass for every player
+            for (pid, year), pa in totals.items():
+                self.pa.setdefault(pid, {})[int(year)] = float(pa)
+
+    # The closest alias by trigram overlap, or None
+    # Only aliases sharing the first or last word are scored, which keeps this to a few hundred names at most
+    def fuzzy(self, text, threshold=0.6):
+        grams = trigrams(text)
+        words = text.split()
+        best, best_score = None, threshold
+        for alias in set(self.by_word.get(words[0], [])) | set(self.by_word.get(words[-1], [])):
+            other = self.grams[alias]
+            score = len(grams & other) / len(grams | other)
+            if score >= best_score:
+                best, best_score = alias, score
+        return best
+
+    # Most plate appearances first, counting only the given years if any
+    def rank(self, pids, years=None):
+        def weight(pid):
+            seasons = self.pa.get(pid, {})
+            return sum(pa for year, pa in seasons.items() if not years or year in years)
+        return sorted(pids, key=weight, reverse=True)
+
+    # IDs of the players named in a question, in the order they're named
+    def find(self, question, years=None, limit=3):
+        years = {int(y) for y in years or []}
+        raw = re.findall(r"[^\W\d_][\w.'`]*", question)  # Words as typed, to check capitals
+        words = [normalize_name(w) for w in raw]
+        used = [w in QUESTION_WORDS or not w for w in words]
+        capitalized = [w[:1].isupper() for w in raw]
+        found = {}  # ID -> position of the name in the question
+
+        def add(pids, position):
+            for pid in self.rank(pids, years)[:1]:  # The likeliest player with that name
+                found.setdefault(pid, position)
+
+        for n in (4, 3, 2):  # Full names first, longest first
+            for i in range(len(words) - n + 1):
+                if any(used[i:i + n]):
+                    continue
+                text = " ".join(words[i:i + n])
+                alias = text if text in self.aliases else None
+                if alias is None and n == 2 and all(capitalized[i:i + 2]):  # Typo'd names only if typed as a name
+                    alias = self.fuzzy(text)
+                if alias:
+                    pids, width = self.aliases[alias], n
+                    suffix = words[i + n] if i + n < len(words) and not used[i + n] else ""
+                    if suffix in SUFFIXES:  # "Ken Griffey Sr." when the data only labels Jr.: not Jr.
+                        pids = [pid for pid in pids if self.suffixes[pid] in ("", suffix)] or pids
+                        width += 1
+                    add(pids, i)
+                    used[i:i + width] = [True] * width
+        return sorted(found, key=found.get)[:limit]
+
+
+# Build the index once per data version (pass data_store.data_version())
+@lru_cache(maxsize=2)
+def load_index(version):
+    player_df, yearly_df, _ = scoring.load_scored(version)
+    return PlayerIndex(player_df, yearly_df)
+
+
+# Name search over every season in the combined yearly data, once per data version
+@lru_cache(maxsize=2)
+def load_name_search(version):
+    return NameSearch(PlayerIndex(pd.DataFrame(), data_store.load_yearly("All Players")))
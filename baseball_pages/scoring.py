@@ -0,0 +1,97 @@
+# Contact / Power scoring for the Players page
+# Builds the labelled decade and yearly frames in one NumPy pass and keeps the result per data version,
+# so moving a slider or picking a player only filters frames that are already scored.
+# The scaling and cut-offs come from the MinMaxScaler fit saved in models.py, so they're only fit once per
+# data version (and reloaded after a restart).
+import os  # for file paths
+from functools import lru_cache  # to keep results per data version
+import numpy as np  # for the vectorized scoring
+import pandas as pd  # for data processing
+from baseball_pages import data_store  # for loading the data
+
+# Columns used from the decade files
+KEY_STATS = ["BA", "OBP", "HR", "SO", "BB", "PA", "SLG", "Player", "AB", "Player-additional"]
+SCALE_COLS = ["BA", "OBP", "K%", "BB%", "ISO", "HR/PA"]  # Columns min-max scaled before scoring
+BA, OBP, K, BB, ISO, HRPA = range(len(SCALE_COLS))  # Positions of each column in the array
+
+
+# Decade rows with the rate stats added, like the original Players page built them
+def decade_frame(decade_data):
+    frames = []
+    for decade, df in decade_data.items():
+        if not set(KEY_STATS).issubset(df.columns):  # Skip if key stats are missing
+            continue
+        df = df[KEY_STATS].copy()
+        df.rename(columns={"SO": "K"}, inplace=True)  # Rename "SO" to "K"
+        df["HR/PA"] = df["HR"] / df["PA"]
+        df["K%"] = df["K"] / df["PA"]
+        df["BB%"] = df["BB"] / df["PA"]
+        df["ISO"] = df["SLG"] - df["BA"]
+        df["Decade"] = int(decade)  # Add decade as a column
+        frames.append(df)
+    player_df = pd.concat(frames, ignore_index=True)
+    return player_df.dropna(subset=SCALE_COLS)
+
+
+# Min-max scale with K% flipped so higher is better, then work out both scores
+# Uses the same arithmetic as sklearn's MinMaxScaler (x * scale + min) so the numbers match the old page
+def score_arrays(X, scale, offset):
+    S = X * scale + offset
+    S[:, K] = 1 - S[:, K]
+    contact = 0.4 * S[:, BA] + 0.4 * S[:, OBP] + 0.1 * S[:, BB] + 0.1 * S[:, K]
+    power = 0.5 * S[:, ISO] + 0.5 * S[:, HRPA]
+    return S, contact, power
+
+
+# "Power Hitter" if in the top 25% of power, "Contact Hitter" if top 25% of contact without being a power hitter
+def label_hitters(contact, power, c_thresh, p_thresh):
+    return np.select([power > p_thresh, contact > c_thresh], ["Power Hitter", "Contact Hitter"], "Balanced")
+
+
+# Score the decade rows and the yearly rows together
+# fit is models.load_models(...)["contact_power"]: the MinMaxScaler and cut-offs fit on the decade rows,
+# which the yearly rows use too
+def score_players(decade_data, yearly_df, fit):
+    player_df = decade_frame(decade_data)
+    scale, offset = fit["scaler"].scale_, fit["scaler"].min_
+    thresholds = fit["thresholds"]
+    c_thresh, p_thresh = thresholds["ContactScore"], thresholds["PowerScore"]
+
+    X = player_df[SCALE_COLS].to_numpy(dtype=float)
+    S, contact, power = score_arrays(X, scale, offset)
+
+    S[:, K] = 1 - S[:, K]  # Show K% the normal way round again
+    player_df[SCALE_COLS] = S
+    player_df["ContactScore"] = contact
+    player_df["PowerScore"] = power
+    player_df["Hitter Type"] = label_hitters(contact, power, c_thresh, p_thresh)
+
+    player_df = data_store.compact(player_df)  # Categoricals and float32 scores to keep the shared frame small
+    if yearly_df is None or yearly_df.empty:
+        return player_df, pd.DataFrame(), thresholds
+
+    # Yearly rows (K% here is per at bat, as on the original page)
+    yearly_df = yearly_df.copy()
+    yearly_df["HR/PA"] = yearly_df["HR"] / yearly_df["PA"]
+    yearly_df["K%"] = yearly_df["SO"] / yearly_df["AB"]
+    yearly_df["BB%"] = yearly_df["BB"] / yearly_df["PA"]
+    yearly_df["ISO"] = yearly_df["SLG"] - yearly_df["BA"]
+
+    S, contact, power = score_arrays(yearly_df[SCALE_COLS].to_numpy(dtype=float), scale, offset)
+    yearly_df[SCALE_COLS] = S
+    yearly_df["ContactScore"] = contact
+    yearly_df["PowerScore"] = power
+    yearly_df["Hitter Type"] = label_hitters(contact, power, c_thresh, p_thresh)
+    return player_df, data_store.compact(yearly_df), thresholds
+
+
+# Load and score everything once per data version (pass data_store.data_version())
+# The returned frames are shared, so callers should filter them rather than change them
+@lru_cache(maxsize=2)
+def load_scored(version):
+    from baseball_pages import models  # Imported here since models.py imports this module
+    fit = models.load_models(version)["contact_power"]
+    decade_data = data_store.load_decades()
+    yearly_file = os.path.join(data_store.DATA_DIR, data_store.YEARLY_FILES["All Players"])
+    yearly_df = data_store.load_yearly("All Players") if os.path.exists(yearly_file) else pd.DataFrame()
+    return score_players(decade_data, yearly_df, fit)
@@ -0,0 +1,168 @@
+# Timing for the slow parts of each page: loading data, computing, drawing charts and network calls
+# Wrap a step in `with timing.span("load", "decade cube"):` and its time is added to that stage.
+# main.py wraps each page run in timing.request(page), which adds up the page's spans by stage, keeps the last
+# few hundred runs in memory and writes one JSON line per run to data/cache/timings.jsonl. Once that file passes
+# TIMINGS_LOG_MB it is moved to timings.jsonl.1 (replacing the older one), so at most two files are kept.
+# Spans inside other spans only count their own time, so the stages of a run never add up to more than the run.
+# The sidebar panel with p50 / p95 per stage shows up with ?debug=1 in the URL (or TIMINGS_PANEL=1).
+# Only the standard library is used here so main.py can import it without slowing down the app's start.
+import collections  # for the rolling store
+import contextlib  # for the span context managers
+import json  # for the log file
+import os  # for the settings and log folder
+import threading  # every session shares the store; each session runs in its own thread
+import time  # for the clock and timestamps
+import streamlit as st  # for the debug panel
+
+STAGES = ["load", "compute", "render", "network"]
+OTHER = "other"  # Time in a page run outside every span (Streamlit widgets, text, ...)
+BACKGROUND = "(background)"  # Page name for spans outside a page run, like the page view webhooks
+MAX_RUNS = int(os.environ.get("TIMINGS_HISTORY", 500))  # Runs kept in memory
+# One JSON line per run, next to the other logs in data_store.CACHE_DIR (not imported here, it pulls in pandas)
+LOG_PATH = os.environ.get("TIMINGS_LOG", os.path.join("data", "cache", "timings.jsonl"))
+MAX_LOG_BYTES = int(float(os.environ.get("TIMINGS_LOG_MB", 5)) * 1024 * 1024)  # Size before the log is rotated
+
+_local = threading.local()  # The page run of the current session's thread
+
+
+class TimingStore:
+    # max_runs: runs kept (oldest dropped first), path: JSONL file each run is added to (None to skip),
+    # max_bytes: size at which the file is moved to path + ".1" and a new one started
+    def __init__(self, max_runs=MAX_RUNS, path=LOG_PATH, max_bytes=MAX_LOG_BYTES):
+        self.runs = collections.deque(maxlen=max_runs)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def add(self, run):
+        with self._lock:
+            self.runs.append(run)
+            if self.path:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                        os.replace(self.path, self.path + ".1")  # Keep one older file, drop anything before it
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(run) + "\n")
+                except OSError:
+                    pass  # Timing should never stop a page
+
+    # Runs kept in memory, oldest first (only one page's if page is given)
+    def recent(self, page=None):
+        with self._lock:
+            return [run for run in self.runs if page is None or run["page"] == page]
+
+    # One row per page and stage: runs that used the stage and their p50 / p95 / max ms, plus the whole run
+    def summary(self, page=None):
+        by_stage = collections.defaultdict(list)
+        for run in self.recent(page):
+            by_stage[(run["page"], "total")].append(run["total_ms"])
+            for stage, ms in run["stages"].items():
+                by_stage[(run["page"], stage)].append(ms)
+        order = STAGES + [OTHER, "total"]
+        rows = []
+        for run_page, stage in sorted(by_stage, key=lambda key: (key[0], order.index(key[1]))):
+            values = by_stage[(run_page, stage)]
+            rows.append({"page": run_page, "stage": stage, "runs": len(values), "p50_ms": percentile(values, 50),
+                         "p95_ms": percentile(values, 95), "max_ms": round(max(values), 1)})
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self.runs.clear()
+
+    def __len__(self):
+        return len(self.runs)
+
+
+_store = None  # Shared store, made on first use
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TimingStore()
+        return _store
+
+
+# Percentile with linear interpolation between the closest values (same as numpy's default)
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return round(values[low] + (values[high] - values[low]) * (position - low), 1)
+
+
+# Time one page run: every span inside it (on this thread) is added to the run's stages
+@contextlib.contextmanager
+def request(page, store=None):
+    run = {"page": page, "time": round(time.time(), 3), "stages": {}, "spans": [], "_stack": []}
+    outer = getattr(_local, "run", None)
+    _local.run = run
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        # Also runs when the page stops early (st.stop, a rerun or an error), so slow partial runs still show up
+        total = (time.perf_counter() - start) * 1000
+        _local.run = outer
+        del run["_stack"]
+        run["total_ms"] = round(total, 3)
+        run["stages"][OTHER] = round(max(total - sum(run["stages"].values()), 0.0), 3)
+        (store or get_store()).add(run)
+
+
+# Time one step of a page; stage is one of STAGES, name says which step it was (like "decade cube")
+# Outside a page run (a background thread) the span is saved as a run of its own under BACKGROUND
+@contextlib.contextmanager
+def span(stage, name=None):
+    if stage not in STAGES:
+        raise ValueError(f"Unknown timing stage {stage!r}, expected one of {STAGES}")
+    run = getattr(_local, "run", None)
+    if run is None:
+        with request(BACKGROUND):
+            with span(stage, name):
+                yield
+        return
+    frame = {"children_ms": 0.0}
+    run["_stack"].append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        run["_stack"].pop()
+        if run["_stack"]:
+            run["_stack"][-1]["children_ms"] += elapsed  # The enclosing span doesn't count this time again
+        own = elapsed - frame["children_ms"]
+        run["stages"][stage] = round(run["stages"].get(stage, 0.0) + own, 3)
+        run["spans"].append({"stage": stage, "name": name, "ms": round(elapsed, 3)})
+
+
+# Whether to show the debug panel: ?debug=1 in the URL or TIMINGS_PANEL=1
+def panel_enabled():
+    return os.environ.get("TIMINGS_PANEL") == "1" or st.query_params.get("debug") == "1"
+
+
+# Sidebar panel with p50 / p95 per stage for this page (and every page below it)
+def show_panel(page):
+    with st.sidebar.expander("⏱️ Page timings (debug)"):
+        store = get_store()
+        rows = store.summary(page)
+        if not rows:
+            st.write("No timings yet.")
+            return
+        st.caption(f"{page}: last {rows[-1]['runs']} runs, ms")
+        st.dataframe([{k: v for k, v in row.items() if k != "page"} for row in rows], hide_index=True)
+        last = store.recent(page)[-1]
+        slowest = sorted(last["spans"], key=lambda s: -s["ms"])[:5]
+        st.caption("Slowest steps last run (ms): "
+                   + ", ".join(f"{s['name'] or s['stage']} {s['ms']:.0f}" for s in slowest))
+        if st.checkbox("All pages", key="timings_all_pages"):
+            st.dataframe(store.summary(), hide_index=True)
+        st.caption(f"Each run is also saved to {store.path}")
@@ -0,0 +1,90 @@
+# Smoothing for per-year series (a metric by year, or a PCA score by year)
+# Rolling means use cumulative sums so every window costs the same no matter how wide it is, windows shrink at
+# the ends of the series instead of dropping points, and results are kept so reruns don't redo them
+import warnings  # for quieting all-missing windows
+from functools import lru_cache  # to keep smoothed series
+import numpy as np  # for the vectorized windows
+import pandas as pd  # for Series in and out
+
+METHODS = ["mean", "median", "ewma"]
+
+
+# First and last position of each point's window (centered, or trailing if center=False)
+def window_bounds(n, window, center=True):
+    positions = np.arange(n)
+    left = window // 2 if center else window - 1
+    right = window - 1 - left if center else 0
+    return np.maximum(positions - left, 0), np.minimum(positions + right, n - 1)
+
+
+# Mean of each window in O(n) from cumulative sums (missing values are skipped)
+def rolling_mean(values, window=5, center=True):
+    values = np.asarray(values, dtype=float)
+    start, end = window_bounds(len(values), window, center)
+    present = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(present, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(present)])
+    n = counts[end + 1] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[end + 1] - sums[start]) / n, np.nan)
+
+
+# Median of each window (sorting can't use cumulative sums, so this is O(n * window), still without a Python loop)
+def rolling_median(values, window=5, center=True):
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    left = window // 2 if center else window - 1
+    right = window - 1 - left if center else 0
+    padded = np.concatenate([np.full(left, np.nan), values, np.full(right, np.nan)])  # Shrink at the ends
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-missing windows give NaN
+        return np.nanmedian(windows, axis=1)
+
+
+# Exponentially weighted mean (same as pandas ewm(span=...).mean()), O(n)
+# span works like a window size: alpha = 2 / (span + 1)
+def ewma(values, span=5, alpha=None):
+    from scipy.signal import lfilter  # For the EWMA recursion (imported here, scipy is slow to import)
+    values = np.asarray(values, dtype=float)
+    alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+    present = ~np.isnan(values)
+    decay = [1.0, -(1.0 - alpha)]
+    weighted = lfilter([1.0], decay, np.where(present, values, 0.0))
+    weights = lfilter([1.0], decay, present.astype(float))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = np.where(weights > 0, weighted / weights, np.nan)
+    # Missing years carry the last value forward (only matters when alpha is 1)
+    last = np.maximum.accumulate(np.where(present, np.arange(len(values)), 0))
+    return result[last]
+
+
+@lru_cache(maxsize=256)
+def _smooth_cached(data, method, window, center):
+    values = np.frombuffer(data, dtype=float)
+    if method == "mean":
+        result = rolling_mean(values, window, center)
+    elif method == "median":
+        result = rolling_median(values, window, center)
+    elif method == "ewma":
+        result = ewma(values, span=window)
+    else:
+        raise ValueError(f"Unknown smoothing method {method!r}, expected one of {METHODS}")
+    result.setflags(write=False)  # Shared between callers
+    return result
+
+
+# Smooth any per-year series: method is "mean", "median" or "ewma", window is the number of years
+# Returns the same type it was given (a Series keeps its index)
+def smooth(values, method="mean", window=5, center=True):
+    array = np.ascontiguousarray(values, dtype=float)
+    result = _smooth_cached(array.tobytes(), method, int(window), bool(center))
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result.copy()
+
+
+# Smooth both coordinates of a path, like PC1 / PC2 by year
+def smooth_path(x, y, method="mean", window=5, center=True):
+    return smooth(x, method, window, center), smooth(y, method, window, center)
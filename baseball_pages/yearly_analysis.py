@@ -1,7 +1,13 @@
 # Import necessary libraries
 import streamlit as st  # Streamlit for creating the web app
-import pandas as pd  # Pandas for data manipulation
 import plotly.express as px  # Plotly for creating interactive visualizations
+from baseball_pages import cube  # Precomputed yearly aggregates
+from baseball_pages import data_store  # For the data version
+from baseball_pages import trajectory  # Rolling averages over several years
+from baseball_pages import timing  # Load / compute / render timings
+
+# Smoothing options shown on the page and the trajectory method behind each
+SMOOTHING = {"None": None, "Rolling mean": "mean", "Rolling median": "median", "Exponential (EWMA)": "ewma"}
 
 # Define the main function to display the page
 def show():
@@ -18,15 +24,15 @@ def show():
         ["All Players", "Starters Only (PA ≥ 100)"]  # Options for the user to choose from
     )
 
-    # Set the file path based on the user's choice
-    if data_choice == "All Players":
-        data_path = "data/combined_yearly_stats_all_players.csv"  # Path for all players dataset
-    else:
-        data_path = "data/combined_yearly_stats_starters_only.csv"  # Path for starters-only dataset
+    # Cached loader for the precomputed yearly cube (both datasets are slices of it), once per data version
+    @st.cache_data
+    def load_data(version):
+        return cube.load_yearly_cube()
 
     # Try to load the selected dataset
     try:
-        df = pd.read_csv(data_path)  # Read the CSV file into a DataFrame
+        with timing.span("load", "yearly cube"):
+            df = load_data(data_store.data_version())  # Load the cube of yearly aggregates
     except FileNotFoundError:  # Handle the case where the file is not found
         st.error("🚫 Data file not found. Please check your file paths or run the combiner script.")  # Show an error message
         return  # Exit the function if the file is not found
@@ -37,20 +43,37 @@ def show():
         options=["HR", "SO", "BB", "BA", "OBP", "SLG", "K%", "BB%", "HR/PA"]  # List of metrics to choose from
     )
 
-    # Group the data by year and calculate the average of the selected metric
-    agg_df = df.groupby("Year")[metric].mean().reset_index()  # Group by year and calculate the mean
-    agg_df["Year"] = agg_df["Year"].astype(int)  # Convert the year column to integers
-    agg_df["Year"] = agg_df["Year"].apply(lambda x: str(x))  # Convert the year column to strings
+    # Optional multi-year view laid over the yearly line
+    col1, col2 = st.columns(2)
+    smoothing = col1.selectbox("Smooth over several years:", options=list(SMOOTHING))
+    window = col2.slider("Years in window:", min_value=2, max_value=15, value=5,
+                         disabled=SMOOTHING[smoothing] is None)
+    centered = st.checkbox("Center the window on each year (otherwise use only earlier years)", value=True,
+                           disabled=SMOOTHING[smoothing] in (None, "ewma"))
+
+    # Average of the selected metric by year, added up from the cube slices
+    with timing.span("compute", "yearly means"):
+        agg_df = cube.slice_means(df, "Year", [metric],
+                                  starters_only=data_choice == "Starters Only (PA ≥ 100)").reset_index()
+        agg_df["Year"] = agg_df["Year"].astype(int)  # Convert the year column to integers
+        y_cols = [metric]
+        method = SMOOTHING[smoothing]
+        if method is not None:
+            smooth_col = f"{metric} ({window}-yr {'EWMA' if method == 'ewma' else method})"
+            agg_df[smooth_col] = trajectory.smooth(agg_df[metric], method, window, centered)
+            y_cols.append(smooth_col)
+        agg_df["Year"] = agg_df["Year"].apply(lambda x: str(x))  # Convert the year column to strings
 
     # Create a line plot using Plotly
-    fig = px.line(
-        agg_df,  # Data for the plot
-        x="Year",  # X-axis: Year
-        y=metric,  # Y-axis: Selected metric
-        title=f"Average {metric} by Year ({data_choice})",  # Title of the plot
-        markers=True  # Add markers to the line plot
-    )
-    st.plotly_chart(fig, use_container_width=True)  # Display the plot in the Streamlit app
+    with timing.span("render", "yearly chart"):
+        fig = px.line(
+            agg_df,  # Data for the plot
+            x="Year",  # X-axis: Year
+            y=y_cols,  # Y-axis: Selected metric (and its smoothed version)
+            title=f"Average {metric} by Year ({data_choice})",  # Title of the plot
+            markers=True  # Add markers to the line plot
+        )
+        st.plotly_chart(fig, use_container_width=True)  # Display the plot in the Streamlit app
 
     # Display the data table of average values by year
     st.write("Average Values by Year of Selected Metric:")  # Add a label for the table
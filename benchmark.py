@@ -0,0 +1,232 @@
+# Time the data, scoring, modeling, prompt and combiner steps outside Streamlit at several data sizes
+# Each scale builds its own copy of the data in a temp folder: every decade file's player rows repeated
+# `scale` times (with their own IDs) and one season file per year for combine_yearly_data.py, then runs the
+# same functions the pages use on it. Results are saved as JSON so two runs can be compared:
+#   python benchmark.py                                  (1x, 10x and 100x -> benchmark_results.json)
+#                                                        (100x is ~5.5 million yearly rows, so give it 10+ GB of RAM)
+#   python benchmark.py --scales 1 10 --repeat 5 --output before.json
+#   python benchmark.py --scales 1 10 --compare before.json   (exits with 1 if anything got slower)
+#   python benchmark.py --synthetic                      (generated seasons from generate_data.py instead of copies)
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DATA = os.path.join(PROJECT_DIR, "data")
+ID_COL = "Player-additional"
+LEAGUE_AVERAGE_ID = "-9999"  # Kept once per file rather than repeated
+QUESTIONS = [  # Prompts built for the prompt benchmark (one of each kind of summary)
+    "How did strikeouts change over the decades?",
+    "What was the league batting average in 1968?",
+    "Compare home runs and walks in 1998 and 2001",
+    "How many HR did Hank Aaron hit in 1957?",
+    "Who had the best OBP overall?",
+]
+
+
+# Read one of the source CSVs and repeat its player rows `scale` times, each copy with its own IDs
+def scale_rows(path, scale):
+    df = pd.read_csv(path, encoding="ISO-8859-1")
+    if scale == 1:
+        return df
+    ids = df[ID_COL].astype(str)
+    league = df[ids == LEAGUE_AVERAGE_ID]
+    players = df[ids != LEAGUE_AVERAGE_ID]
+    copies = [players] + [players.assign(**{ID_COL: players[ID_COL].astype(str) + f"-{k}"}) for k in range(1, scale)]
+    return pd.concat(copies + [league], ignore_index=True)
+
+
+# Build a project folder for one scale: data/ with the decade files, data_combined/ with a file per season
+# Each season uses its decade's rows (1957 -> 1950stats.csv), which is enough to time the combiner
+# With synthetic=True every season is generated instead (different players and numbers each year)
+def build_fixture(root, scale, first_year=1950, last_year=2010, synthetic=False, seed=42):
+    if synthetic:
+        import generate_data
+        return generate_data.generate(root, seed, scale, first_year, last_year)
+    data_dir = os.path.join(root, "data")
+    season_dir = os.path.join(root, "data_combined")
+    os.makedirs(data_dir)
+    os.makedirs(season_dir)
+    decade_rows = {}
+    for decade in range(1950, 2020, 10):
+        src = os.path.join(SOURCE_DATA, f"{decade}stats.csv")
+        if os.path.exists(src):
+            decade_rows[decade] = scale_rows(src, scale)
+            decade_rows[decade].to_csv(os.path.join(data_dir, f"{decade}stats.csv"), index=False,
+                                       encoding="ISO-8859-1")
+    for year in range(first_year, last_year + 1):
+        rows = decade_rows.get(year // 10 * 10)
+        if rows is not None:
+            rows.to_csv(os.path.join(season_dir, f"{year}stats.csv"), index=False, encoding="ISO-8859-1")
+    return sum(len(df) for df in decade_rows.values())
+
+
+# Run fn `repeat` times and return the times in ms (before() runs ahead of each try and isn't timed)
+def time_it(fn, repeat, before=None):
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+# Every benchmark for one scale, run inside the fixture folder (the modules use paths relative to it)
+# Returns a list of result dicts
+def run_scale(scale, repeat, only=None):
+    # The modules use paths relative to the working folder, so they read and write inside the fixture
+    import combine_yearly_data
+    from baseball_pages import data_store, cube, scoring, models, kselect, chat_prompts, player_index
+    from baseball_pages import decade_trends
+
+    results = []
+
+    def record(name, fn, before=None, rows=None):
+        if only and not any(name.startswith(o) for o in only):
+            return
+        ms = time_it(fn, repeat, before)
+        results.append({"benchmark": name, "scale": scale, "rows": rows, "repeat": repeat,
+                        "min_ms": round(min(ms), 3), "median_ms": round(statistics.median(ms), 3),
+                        "max_ms": round(max(ms), 3)})
+        print(f"  {name:<28} {statistics.median(ms):10.1f} ms")
+
+    # Combiner first, since it writes the yearly files everything else reads
+    season_files = combine_yearly_data.find_season_files()
+    record("combiner.combine_all", lambda: combine_yearly_data.combine_all(season_files))
+    record("combiner.stream", lambda: combine_yearly_data.combine_streaming(season_files))
+    if not os.path.exists(combine_yearly_data.full_output_path):  # Combiner skipped with --only
+        combine_yearly_data.combine_all(season_files)
+
+    # Loading: parsing the CSVs (no Parquet copies yet), then reading the Parquet copies
+    def clear_cache():
+        shutil.rmtree(data_store.CACHE_DIR, ignore_errors=True)
+
+    def load_all():
+        data_store.load_decades()
+        data_store.load_yearly("All Players")
+
+    record("data.load_csv", load_all, before=clear_cache)
+    load_all()  # Make sure the Parquet copies exist
+    record("data.load_parquet", load_all)
+    decade_data = data_store.load_decades()
+    yearly_df = data_store.load_yearly("All Players")
+    decade_rows, yearly_rows = sum(len(df) for df in decade_data.values()), len(yearly_df)
+
+    # Decade trends page: building the decade cube and process_data on it
+    def clear_decade_cube():
+        if os.path.exists(cube.DECADE_CUBE):
+            os.remove(cube.DECADE_CUBE)
+
+    record("trends.decade_cube", cube.load_decade_cube, before=clear_decade_cube, rows=decade_rows)
+    decade_cube = cube.load_decade_cube()
+    record("trends.process_data", lambda: (decade_trends.process_data(decade_cube, "All Players"),
+                                           decade_trends.process_data(decade_cube, "Starters Only (PA ≥ 100)")),
+           rows=decade_rows)
+
+    # Players page: scoring and labelling every decade and yearly row
+    fit = models.fit_contact_power(decade_data)
+    record("scoring.score_players", lambda: scoring.score_players(decade_data, yearly_df, fit),
+           rows=decade_rows + yearly_rows)
+
+    # Hitting Evolution page: PCA + KMeans, then the elbow curves for seasons and player seasons
+    yearly_cube = cube.load_yearly_cube()
+    record("modeling.fit_evolution", lambda: models.fit_evolution(decade_data, yearly_cube), rows=yearly_rows)
+    evolution = models.fit_evolution(decade_data, yearly_cube)
+    season_points = evolution["year_scores"][["PC1", "PC2"]].to_numpy()
+    record("modeling.elbow_seasons", lambda: kselect.elbow_curve(season_points), rows=len(season_points))
+    rows = yearly_df[yearly_df["PA"] >= kselect.MIN_PA][evolution["features"]].astype("float64").dropna()
+    player_points = evolution["pca"].transform(evolution["scaler"].transform(rows))
+    record("modeling.elbow_players", lambda: kselect.elbow_curve(player_points), rows=len(player_points))
+
+    # Chatbot: the summaries behind the prompts, then building prompts (per question)
+    record("prompt.summarize_by_decade", lambda: chat_prompts.summarize_by_decade(yearly_df), rows=yearly_rows)
+    summaries = chat_prompts.build_summaries(yearly_df)
+    search = player_index.NameSearch(player_index.PlayerIndex(pd.DataFrame(), yearly_df))
+    record("prompt.generate_prompt", lambda: [chat_prompts.generate_prompt(q, summaries, search=search)
+                                              for q in QUESTIONS], rows=yearly_rows)
+    if results and results[-1]["benchmark"] == "prompt.generate_prompt":
+        results[-1]["per_question_ms"] = round(results[-1]["median_ms"] / len(QUESTIONS), 3)
+
+    peak = combine_yearly_data.peak_rss_mb()
+    for r in results:
+        r["rows"] = r["rows"] if r["rows"] is not None else yearly_rows
+    return results, {"decade_rows": decade_rows, "yearly_rows": yearly_rows,
+                     "peak_rss_mb": round(peak, 1) if peak is not None else None}
+
+
+# Compare with an earlier results file; returns the benchmarks that got slower than `tolerance` times
+def compare(results, old_path, tolerance):
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["benchmark"], r["scale"]): r for r in json.load(f)["results"]}
+    slower = []
+    print(f"\nCompared with {old_path} (median ms, new / old):")
+    for r in results:
+        before = old.get((r["benchmark"], r["scale"]))
+        if not before or not before["median_ms"]:
+            continue
+        ratio = r["median_ms"] / before["median_ms"]
+        flag = "  SLOWER" if ratio > tolerance else ""
+        print(f"  {r['benchmark']:<28} {r['scale']:>4}x  {before['median_ms']:10.1f} -> {r['median_ms']:10.1f}"
+              f"  ({ratio:.2f}x){flag}")
+        if ratio > tolerance:
+            slower.append(r)
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the data, scoring, modeling, prompt and combiner steps")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="data size multipliers")
+    parser.add_argument("--repeat", type=int, default=3, help="times each step is run (the median is reported)")
+    parser.add_argument("--only", nargs="+", help="only run benchmarks starting with these names, like prompt data.load")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to save the results")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown that counts as a regression")
+    parser.add_argument("--keep", action="store_true", help="keep the generated data folders")
+    parser.add_argument("--synthetic", action="store_true", help="use generate_data.py seasons instead of copies")
+    parser.add_argument("--seed", type=int, default=42, help="seed for --synthetic")
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_DIR)
+    # Seasons copied from their decade have repeated points, which KMeans warns about at high k
+    warnings.filterwarnings("ignore", message="Number of distinct clusters")
+    output = os.path.abspath(args.output)
+    cwd = os.getcwd()
+    results, sizes = [], {}
+    for scale in args.scales:
+        root = tempfile.mkdtemp(prefix=f"baseball_bench_{scale}x_")
+        try:
+            print(f"{scale}x: building data in {root}")
+            build_fixture(root, scale, synthetic=args.synthetic, seed=args.seed)
+            os.chdir(root)
+            scale_results, sizes[scale] = run_scale(scale, args.repeat, args.only)
+            results += scale_results
+        finally:
+            os.chdir(cwd)
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+        "pandas": pd.__version__, "repeat": args.repeat, "synthetic": args.synthetic, "sizes": sizes,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
@@ -1,41 +1,304 @@
 import pandas as pd
 import os
 import glob
+import json
+import time
+import hashlib
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from baseball_pages import cube
 
 # Folder containing the yearly CSVs
 folder_path = "data_combined"
 
+# Where the combined files and the manifest of processed seasons are written
+full_output_path = "data/combined_yearly_stats_all_players.csv"
+starters_output_path = "data/combined_yearly_stats_starters_only.csv"
+manifest_path = "data/combined_yearly_manifest.json"
+
+# Columns read as text; every other column is read as a float, which is what a whole season file gives anyway
+# (the blank League Average row makes the counts floats). Fixing the types means a chunk of a file is read
+# the same way as the whole file, so streaming writes exactly what a full rebuild does.
+TEXT_COLUMNS = ["Player", "Team", "Lg", "Pos", "Awards", "Player-additional"]
+CUBE_BATCH = 256  # Chunk cubes merged at a time in stream mode
+
+
 # Collect all CSV files
-csv_files = sorted(glob.glob(os.path.join(folder_path, "*stats.csv")))
+def find_season_files():
+    return sorted(glob.glob(os.path.join(folder_path, "*stats.csv")))
+
 
-# Initialize a list to collect DataFrames
-df_list = []
+# Read a season file (or an iterator of chunks of it) with the same column types every time
+def read_season_csv(file, **kwargs):
+    header = pd.read_csv(file, encoding="ISO-8859-1", nrows=0).columns
+    dtypes = {col: str if col.strip().replace("ï»¿", "") in TEXT_COLUMNS else "float64" for col in header}
+    return pd.read_csv(file, encoding="ISO-8859-1", dtype=dtypes, **kwargs)
 
-# Load and process each file
-for file in csv_files:
+
+# Load one season file and add the derived columns
+def load_season(file):
     year = int(os.path.basename(file)[:4])  # Extract year from filename
-    df = pd.read_csv(file, encoding="ISO-8859-1")
+    df = read_season_csv(file)
     df["Year"] = year
-    df_list.append(df)
 
-# Combine all into one DataFrame
-combined_df = pd.concat(df_list, ignore_index=True)
+    # Clean column names
+    df.columns = df.columns.str.strip().str.replace("ï»¿", "")
 
-# Clean column names
-combined_df.columns = combined_df.columns.str.strip().str.replace("ï»¿", "")
+    # Add HR/PA, K%, BB% columns to match decade view logic
+    df["HR/PA"] = df["HR"] / df["PA"]
+    df["K%"] = df["SO"] / df["PA"]
+    df["BB%"] = df["BB"] / df["PA"]
+    return df
 
-# Add HR/PA, K%, BB% columns to match decade view logic
-combined_df["HR/PA"] = combined_df["HR"] / combined_df["PA"]
-combined_df["K%"] = combined_df["SO"] / combined_df["PA"]
-combined_df["BB%"] = combined_df["BB"] / combined_df["PA"]
 
-# Save the fully combined dataset
-full_output_path = "data/combined_yearly_stats_all_players.csv"
-combined_df.to_csv(full_output_path, index=False)
+# Load several season files, spreading them over worker processes when workers > 1
+# The results come back in the same (Year) order as the files, so the output is the same either way
+def load_seasons(csv_files, workers=1):
+    if workers <= 1 or len(csv_files) <= 1:
+        return [load_season(file) for file in csv_files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(load_season, csv_files))
+
 
 # Filter for starters only (PA >= 100)
-starters_df = combined_df[combined_df["PA"] >= 100]
-starters_output_path = "data/combined_yearly_stats_starters_only.csv"
-starters_df.to_csv(starters_output_path, index=False)
+def starters_only(df):
+    return df[df["PA"] >= 100]
+
+
+# Hash a file's contents so edited seasons are noticed even if the name is the same
+def file_hash(file):
+    h = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Read the manifest from the last run (empty if there was none)
+def load_manifest():
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+# Build the manifest entries for the current season files
+# The size and modified time are checked first so unchanged files are not re-hashed
+def scan_seasons(csv_files, old_manifest):
+    manifest = {}
+    for file in csv_files:
+        name = os.path.basename(file)
+        stat = os.stat(file)
+        old = old_manifest.get(name)
+        if old and old["size"] == stat.st_size and old["mtime"] == stat.st_mtime_ns:
+            manifest[name] = old
+        else:
+            manifest[name] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": file_hash(file)}
+    return manifest
+
+
+def save_manifest(manifest):
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, manifest_path)
+
+
+# Rebuild both combined files from every season file
+def combine_all(csv_files, workers=1):
+    # Load and process each file
+    df_list = load_seasons(csv_files, workers)
+
+    # Combine all into one DataFrame
+    combined_df = pd.concat(df_list, ignore_index=True)
+
+    # Save the fully combined dataset
+    combined_df.to_csv(full_output_path, index=False)
+
+    # Save the starters only dataset
+    starters_only(combined_df).to_csv(starters_output_path, index=False)
+
+    # Save the aggregate cube the trend pages read from
+    cube.save_cube(cube.build_cube(combined_df), cube.YEARLY_CUBE)
+    return combined_df
+
+
+# Only re-process seasons that were added, changed or removed since the last run
+def combine_incremental(csv_files, workers=1):
+    old_manifest = load_manifest()
+    manifest = scan_seasons(csv_files, old_manifest)
+
+    changed = [f for f in csv_files
+               if old_manifest.get(os.path.basename(f), {}).get("sha256") != manifest[os.path.basename(f)]["sha256"]]
+    removed_years = {int(name[:4]) for name in old_manifest if name not in manifest}
+
+    # Without earlier outputs there is nothing to patch
+    if not old_manifest or not os.path.exists(full_output_path) or not os.path.exists(starters_output_path):
+        print(f"No previous build found, combining all {len(csv_files)} season files")
+        combined_df = combine_all(csv_files, workers)
+        save_manifest(manifest)
+        return combined_df
+
+    if not changed and not removed_years:
+        print("All seasons are up to date")
+        return None
+
+    new_dfs = load_seasons(changed, workers)
+    changed_years = {int(os.path.basename(f)[:4]) for f in changed}
+    kept_max_year = max((int(name[:4]) for name in old_manifest
+                         if name in manifest and int(name[:4]) not in changed_years), default=None)
+
+    all_new = not any(os.path.basename(f) in old_manifest for f in changed)  # An edited season has old rows
+    if all_new and not removed_years and (kept_max_year is None or min(changed_years) > kept_max_year):
+        # Only brand new later seasons, so the rows can be appended to the end of the files
+        added_df = pd.concat(new_dfs, ignore_index=True)
+        header = pd.read_csv(full_output_path, nrows=0).columns
+        if list(added_df.columns) == list(header):
+            added_df.to_csv(full_output_path, mode="a", header=False, index=False)
+            starters_only(added_df).to_csv(starters_output_path, mode="a", header=False, index=False)
+            if os.path.exists(cube.YEARLY_CUBE):  # The new seasons' groups can just be added to the old cube
+                yearly_cube = cube.merge_cubes([pd.read_parquet(cube.YEARLY_CUBE), cube.build_cube(added_df)])
+            else:
+                yearly_cube = cube.build_cube(pd.read_csv(full_output_path, float_precision="round_trip"))
+            cube.save_cube(yearly_cube, cube.YEARLY_CUBE)
+            save_manifest(manifest)
+            print(f"Appended seasons: {sorted(changed_years)}")
+            return added_df
+
+    # Otherwise drop the stale seasons from the old output and put the new rows in year order
+    old_df = pd.read_csv(full_output_path, float_precision="round_trip")  # Read floats back exactly as written
+    old_df = old_df[~old_df["Year"].isin(changed_years | removed_years)]
+    combined_df = pd.concat([old_df] + new_dfs, ignore_index=True)
+    combined_df = combined_df.sort_values("Year", kind="stable", ignore_index=True)
+    combined_df.to_csv(full_output_path, index=False)
+    starters_only(combined_df).to_csv(starters_output_path, index=False)
+    cube.save_cube(cube.build_cube(combined_df), cube.YEARLY_CUBE)
+    save_manifest(manifest)
+    print(f"Re-processed seasons: {sorted(changed_years)}, removed seasons: {sorted(removed_years)}")
+    return combined_df
+
+
+# Work out the output columns up front from the file headers, in the same order pd.concat would give
+def output_columns(csv_files):
+    columns = []
+    for file in csv_files:
+        header = pd.read_csv(file, encoding="ISO-8859-1", nrows=0).columns.str.strip().str.replace("ï»¿", "")
+        for col in list(header) + ["Year", "HR/PA", "K%", "BB%"]:
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+
+# Combine one season (or one chunk of a season) at a time and append it straight to the outputs,
+# so memory stays about the size of one chunk no matter how many files there are
+def combine_streaming(csv_files, chunksize=None):
+    columns = output_columns(csv_files)
+    full_tmp = full_output_path + ".tmp"
+    starters_tmp = starters_output_path + ".tmp"
+    rows = 0
+    cubes = []  # Cube totals are added up chunk by chunk so it never needs all the rows
+
+    try:
+        with open(full_tmp, "w", newline="") as full_out, open(starters_tmp, "w", newline="") as starters_out:
+            # Write the headers once
+            pd.DataFrame(columns=columns).to_csv(full_out, index=False)
+            pd.DataFrame(columns=columns).to_csv(starters_out, index=False)
+
+            for file in csv_files:
+                year = int(os.path.basename(file)[:4])  # Extract year from filename
+                if chunksize:
+                    chunks = read_season_csv(file, chunksize=chunksize)
+                else:
+                    chunks = [read_season_csv(file)]
+
+                for df in chunks:
+                    df["Year"] = year
+                    df.columns = df.columns.str.strip().str.replace("ï»¿", "")
+                    df["HR/PA"] = df["HR"] / df["PA"]
+                    df["K%"] = df["SO"] / df["PA"]
+                    df["BB%"] = df["BB"] / df["PA"]
+                    df = df.reindex(columns=columns)  # Line up with the full set of columns
+
+                    df.to_csv(full_out, header=False, index=False)
+                    starters_only(df).to_csv(starters_out, header=False, index=False)
+                    rows += len(df)
+                    cubes.append(cube.build_cube(df))
+                    if len(cubes) >= CUBE_BATCH:  # Merge a batch at a time rather than after every chunk
+                        cubes = [cube.merge_cubes(cubes)]
+
+        # Swap the finished files in so a failed run never leaves half written outputs
+        os.replace(full_tmp, full_output_path)
+        os.replace(starters_tmp, starters_output_path)
+    finally:
+        for tmp in (full_tmp, starters_tmp):  # Left over only if something went wrong
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    cube.save_cube(cube.merge_cubes(cubes), cube.YEARLY_CUBE)
+    print(f"Streamed {rows} rows from {len(csv_files)} season files")
+    return rows
+
+
+# Highest memory use of this process so far in MB (None where the resource module is missing, e.g. Windows)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)  # macOS reports bytes
+    return peak / 1024  # Linux reports kilobytes
+
+
+# Keep checking the folder and patch the outputs whenever a season file is added or changed
+def watch(interval, workers=1):
+    print(f"Watching {folder_path} every {interval}s (Ctrl+C to stop)")
+    last_seen = None
+    try:
+        while True:
+            csv_files = find_season_files()
+            try:
+                seen = [(f, os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in csv_files]
+                if seen != last_seen:
+                    combine_incremental(csv_files, workers)
+                    last_seen = seen
+            except (FileNotFoundError, pd.errors.EmptyDataError, pd.errors.ParserError):
+                pass  # A file is still being copied in, try again next time
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Combine the yearly stats files in data_combined/")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-process seasons that changed since the last run")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and update the outputs when season files change")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between checks in watch mode")
+    parser.add_argument("--stream", action="store_true",
+                        help="write the outputs one season at a time to keep memory use flat")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="rows to read at a time in stream mode (default: one whole season)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes used to parse season files (0 = one per CPU core)")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    if args.watch:
+        watch(args.interval, workers)
+    elif args.incremental:
+        combine_incremental(find_season_files(), workers)
+    elif args.stream:
+        combine_streaming(find_season_files(), args.chunksize)
+        save_manifest(scan_seasons(find_season_files(), {}))
+    else:
+        combined_df = combine_all(find_season_files(), workers)
+        save_manifest(scan_seasons(find_season_files(), {}))
+        print(combined_df.head())
 
-print(combined_df.head())
+    # Report peak memory so the streaming limit can be checked
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"Peak RSS: {peak:.1f} MB")
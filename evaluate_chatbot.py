@@ -0,0 +1,137 @@
+# Run a file of questions through the chatbot's prompt logic and save the answers
+# Questions are sent at the same time with asyncio, limited by --concurrency and --rate, and each answer is
+# written to a JSONL file with its latency and prompt size so runs can be compared
+#   python mock_openai_server.py --port 8001 &
+#   python evaluate_chatbot.py questions.txt --base-url http://127.0.0.1:8001/v1 --concurrency 8 --rate 5
+# The questions file has one question per line (blank lines and lines starting with # are skipped),
+# or is a .jsonl file with a "question" field on each line
+import argparse
+import asyncio
+import json
+import os
+import time
+from openai import AsyncOpenAI
+from baseball_pages import data_store
+from baseball_pages import chat_prompts
+from baseball_pages import chat_context
+from baseball_pages import chat_query
+from baseball_pages import player_index
+
+
+def read_questions(path):
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            questions.append(json.loads(line)["question"] if path.endswith(".jsonl") else line)
+    return questions
+
+
+# Spaces requests out so no more than `rate` start each second (0 = no limit)
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Answer one question the way the chatbot page would (minus the saved answer cache)
+async def evaluate(index, question, client, args, data, semaphore, limiter):
+    summaries, search, engine = data
+    record = {"index": index, "question": question}
+    start = time.perf_counter()
+
+    local = None if args.no_local or "outside knowledge" in question.lower() else engine.answer(question)
+    if local:
+        record.update(path="local", intent=local["intent"], answer=local["text"], prompt_tokens=0, prompt_chars=0)
+    else:
+        prompt, context = chat_prompts.prompt_for_question(question, summaries, search, args.budget)
+        record.update(path="gpt", summary=context, prompt_tokens=chat_context.estimate_tokens(prompt),
+                      prompt_chars=len(prompt))
+        async with semaphore:
+            await limiter.wait()
+            sent = time.perf_counter()
+            try:
+                response = await client.chat.completions.create(
+                    model=args.model, messages=[{"role": "user", "content": prompt}])
+                record["answer"] = response.choices[0].message.content
+                if response.usage is not None:
+                    record["usage"] = {"prompt_tokens": response.usage.prompt_tokens,
+                                       "completion_tokens": response.usage.completion_tokens}
+            except Exception as e:
+                record.update(path="error", error=f"{type(e).__name__}: {e}")
+            record["request_ms"] = round((time.perf_counter() - sent) * 1000, 2)
+    record["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return record
+
+
+async def run(questions, args):
+    version = data_store.data_version()
+    data = (chat_prompts.load_summaries(version), player_index.load_name_search(version),
+            chat_query.load_engine(version))
+    client = AsyncOpenAI(api_key=args.api_key, base_url=args.base_url, max_retries=args.retries,
+                         timeout=args.timeout)
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    limiter = RateLimiter(args.rate)
+    try:
+        return await asyncio.gather(*[evaluate(i, q, client, args, data, semaphore, limiter)
+                                      for i, q in enumerate(questions)])
+    finally:
+        await client.close()
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a file of chatbot questions and save the answers as JSONL")
+    parser.add_argument("questions", help="text file with one question per line, or .jsonl with a question field")
+    parser.add_argument("--output", default="chatbot_answers.jsonl", help="where to write the answers")
+    parser.add_argument("--concurrency", type=int, default=4, help="most requests waiting on the API at once")
+    parser.add_argument("--rate", type=float, default=0.0, help="most requests started per second (0 = no limit)")
+    parser.add_argument("--base-url", default=os.environ.get("OPENAI_BASE_URL"),
+                        help="OpenAI-compatible endpoint, like http://127.0.0.1:8001/v1 for mock_openai_server.py")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY", "not-needed-for-a-stub"))
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    parser.add_argument("--budget", type=int, default=None, help="prompt token budget (default CHAT_TOKEN_BUDGET)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a request gives up")
+    parser.add_argument("--retries", type=int, default=2, help="retries for failed requests")
+    parser.add_argument("--no-local", action="store_true",
+                        help="send every question to the model, even ones the data can answer directly")
+    args = parser.parse_args()
+
+    questions = read_questions(args.questions)
+    started = time.perf_counter()
+    results = asyncio.run(run(questions, args))
+    elapsed = time.perf_counter() - started
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for record in results:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # Short summary of the run
+    latencies = [r["request_ms"] for r in results if r["path"] == "gpt"]
+    paths = {p: sum(r["path"] == p for r in results) for p in ("local", "gpt", "error")}
+    prompt_sizes = [r["prompt_tokens"] for r in results if r.get("prompt_tokens")]
+    print(f"{len(results)} questions in {elapsed:.2f}s -> {args.output}")
+    print(f"Answered locally: {paths['local']}, by the model: {paths['gpt']}, errors: {paths['error']}")
+    if latencies:
+        print(f"Model latency p50 {percentile(latencies, 0.5):.0f} ms, p95 {percentile(latencies, 0.95):.0f} ms")
+    if prompt_sizes:
+        print(f"Prompt size avg {sum(prompt_sizes) / len(prompt_sizes):.0f} tokens, max {max(prompt_sizes)} tokens")
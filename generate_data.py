@@ -0,0 +1,380 @@
+# Make synthetic stats files in the same format as the Baseball-Reference exports in data/, for testing at
+# sizes the real data can't reach. Everything comes from --seed, so the same command always writes the same files.
+#   python generate_data.py --out synthetic --scale 25          (~1.4 million player seasons)
+#   python generate_data.py --out synthetic --decades-only      (just the seven decade files)
+# Writes <out>/data/<decade>stats.csv (the 1950, 1960, ... seasons, like data/) and
+# <out>/data_combined/<year>stats.csv (every season, the input of combine_yearly_data.py).
+#
+# Players have careers: each one keeps the same contact / power / eye / speed talent from season to season
+# (with an age curve and season-to-season noise), so the same IDs show up across years and the counting
+# stats are drawn from the talents one after another (walks, then strikeouts, home runs and hits from
+# what's left), which keeps HR, PA, SO, BB, BA, OBP and SLG correlated the way the real files are.
+import argparse
+import os
+import time
+import unicodedata
+import numpy as np
+import pandas as pd
+
+FIRST_YEAR, LAST_YEAR = 1950, 2010
+COLUMNS = ["Rk", "Player", "Age", "Team", "Lg", "WAR", "G", "PA", "AB", "R", "H", "2B", "3B", "HR", "RBI", "SB",
+           "CS", "BB", "SO", "BA", "OBP", "SLG", "OPS", "OPS+", "rOBA", "Rbat+", "TB", "GIDP", "HBP", "SH", "SF",
+           "IBB", "Pos", "Awards", "Player-additional"]
+COUNTS = ["G", "PA", "AB", "R", "H", "2B", "3B", "HR", "RBI", "SB", "CS", "BB", "SO", "TB", "GIDP", "HBP", "SH", "SF",
+          "IBB"]  # Counting stats (split between teams for traded players)
+SF_FROM = 1960  # Older exports have no SF column
+BOM_FROM = 1970  # and no byte order mark
+BOM = b"\xef\xbb\xbf"
+LEAGUE_AVERAGE_ID = "-9999"
+
+# Player rows per season in the real files and league rates for players with 100+ PA, by decade
+# (rates per PA, except babip per ball in play and the 2B / 3B shares of non-HR hits)
+ERAS = pd.DataFrame({
+    "rows": [576, 637, 919, 783, 874, 1255, 1245],
+    "k": [0.089, 0.121, 0.136, 0.119, 0.142, 0.157, 0.177],
+    "bb": [0.107, 0.091, 0.095, 0.083, 0.089, 0.099, 0.087],
+    "hr": [0.0229, 0.0245, 0.0247, 0.0201, 0.0217, 0.0314, 0.0260],
+    "babip": [0.285, 0.284, 0.288, 0.293, 0.294, 0.307, 0.304],
+    "double": [0.185, 0.181, 0.176, 0.182, 0.196, 0.228, 0.225],
+    "triple": [0.040, 0.035, 0.031, 0.031, 0.026, 0.025, 0.023],
+    "sb": [0.0072, 0.0106, 0.0138, 0.0213, 0.0214, 0.0160, 0.0167],
+    "hbp": [0.0047, 0.0054, 0.0056, 0.0042, 0.0054, 0.0084, 0.0086],
+    "sh": [0.0108, 0.0087, 0.0071, 0.0093, 0.0068, 0.0053, 0.0050],
+}, index=[1950, 1960, 1970, 1980, 1990, 2000, 2010])
+
+# Teams as (code, league, first season, last season)
+TEAMS = [
+    ("BOS", "AL", 1950, 2010), ("NYY", "AL", 1950, 2010), ("CLE", "AL", 1950, 2010), ("DET", "AL", 1950, 2010),
+    ("CHW", "AL", 1950, 2010), ("PHA", "AL", 1950, 1954), ("KCA", "AL", 1955, 1967), ("OAK", "AL", 1968, 2010),
+    ("SLB", "AL", 1950, 1953), ("BAL", "AL", 1954, 2010), ("WSH", "AL", 1950, 1960), ("MIN", "AL", 1961, 2010),
+    ("WSA", "AL", 1961, 1971), ("TEX", "AL", 1972, 2010), ("LAA", "AL", 1961, 1964), ("CAL", "AL", 1965, 1996),
+    ("ANA", "AL", 1997, 2004), ("LAA", "AL", 2005, 2010), ("KCR", "AL", 1969, 2010), ("SEP", "AL", 1969, 1969),
+    ("MIL", "AL", 1970, 1997), ("SEA", "AL", 1977, 2010), ("TOR", "AL", 1977, 2010), ("TBD", "AL", 1998, 2007),
+    ("TBR", "AL", 2008, 2010), ("BRO", "NL", 1950, 1957), ("LAD", "NL", 1958, 2010), ("NYG", "NL", 1950, 1957),
+    ("SFG", "NL", 1958, 2010), ("BSN", "NL", 1950, 1952), ("MLN", "NL", 1953, 1965), ("ATL", "NL", 1966, 2010),
+    ("PHI", "NL", 1950, 2010), ("PIT", "NL", 1950, 2010), ("STL", "NL", 1950, 2010), ("CHC", "NL", 1950, 2010),
+    ("CIN", "NL", 1950, 2010), ("NYM", "NL", 1962, 2010), ("HOU", "NL", 1962, 2010), ("MON", "NL", 1969, 2004),
+    ("WSN", "NL", 2005, 2010), ("SDP", "NL", 1969, 2010), ("COL", "NL", 1993, 2010), ("FLA", "NL", 1993, 2010),
+    ("ARI", "NL", 1998, 2010), ("MIL", "NL", 1998, 2010),
+]
+
+FIRST_NAMES = ["Al", "Bill", "Bob", "Bobby", "Brian", "Carl", "Charlie", "Chris", "Dave", "Dick", "Don", "Eddie",
+               "Frank", "Fred", "Gary", "George", "Hank", "Jack", "Jeff", "Jim", "Jimmy", "Joe", "John", "Johnny",
+               "José", "Juan", "Ken", "Larry", "Luis", "Mark", "Matt", "Mike", "Pete", "Ralph", "Ray", "Rich",
+               "Rick", "Roberto", "Ron", "Sam", "Scott", "Steve", "Ted", "Tim", "Tom", "Tony", "Walt", "Willie"]
+LAST_NAMES = ["Adams", "Allen", "Anderson", "Baker", "Bell", "Brown", "Campbell", "Carter", "Clark", "Collins",
+              "Cruz", "Davis", "Díaz", "Edwards", "Evans", "Fernández", "Fisher", "Garcia", "Gómez", "Gonzalez",
+              "Green", "Griffin", "Hall", "Harris", "Hernández", "Hill", "Howard", "Hughes", "Jackson", "Johnson",
+              "Jones", "Kelly", "King", "Lee", "Lewis", "Lopez", "Martin", "Martínez", "Miller", "Mitchell",
+              "Moore", "Morgan", "Murphy", "Nelson", "Ortiz", "Parker", "Peña", "Perez", "Phillips", "Powell",
+              "Reed", "Reynolds", "Rivera", "Roberts", "Robinson", "Rodríguez", "Rogers", "Ross", "Russell",
+              "Sánchez", "Scott", "Smith", "Stewart", "Taylor", "Thomas", "Thompson", "Torres", "Turner", "Walker",
+              "Ward", "Watson", "White", "Williams", "Wilson", "Wood", "Wright", "Young"]
+FIELD_POSITIONS = np.array(["2", "3", "4", "5", "6", "7", "8", "9"])
+# Correlation of the hitting talents: contact, power, eye (walks), speed
+TALENT_CORR = np.array([[1.00, -0.10, 0.25, 0.20],
+                        [-0.10, 1.00, 0.45, -0.30],
+                        [0.25, 0.45, 1.00, -0.05],
+                        [0.20, -0.30, -0.05, 1.00]])
+PITCHER_SHARE = 0.35  # Share of players who are pitchers (most of their rows have few or no PA)
+MEAN_CAREER = 5.0  # Average seasons per player
+
+
+# League rates for a season, linearly between the decade values
+def era(year):
+    decades = ERAS.index.to_numpy()
+    return {col: float(np.interp(year, decades, ERAS[col].to_numpy())) for col in ERAS.columns}
+
+
+# Baseball-Reference style ID stem from a name ("Fernández", "Tony") -> "fernato"
+def id_stem(last, first):
+    ascii_name = unicodedata.normalize("NFKD", last + "|" + first).encode("ascii", "ignore").decode().lower()
+    last, first = ascii_name.split("|")
+    return last.replace(" ", "")[:5] + first[:2]
+
+
+# Everyone who plays between first_year and last_year, with their talents and careers (depends only on the seed)
+def player_pool(seed, scale, first_year=FIRST_YEAR, last_year=LAST_YEAR):
+    rng = np.random.default_rng([seed, 0])
+    debut_years = np.arange(first_year - 20, last_year + 1)
+    per_year = np.maximum(np.round([era(max(y, first_year))["rows"] * scale / MEAN_CAREER for y in debut_years]), 1)
+    debut = np.repeat(debut_years, per_year.astype(int))
+    n = len(debut)
+    career = np.minimum(rng.geometric(1 / MEAN_CAREER, n), 23)
+    keep = debut + career > first_year  # Only players still active in the first season
+    debut, career = debut[keep], career[keep]
+    n = len(debut)
+
+    talent = rng.multivariate_normal(np.zeros(4), TALENT_CORR, n)
+    pitcher = rng.random(n) < PITCHER_SHARE
+    first = rng.integers(len(FIRST_NAMES), size=n)
+    last = rng.integers(len(LAST_NAMES), size=n)
+    bats = rng.choice(np.array(["", "*", "#"]), size=n, p=[0.63, 0.28, 0.09])
+    pool = pd.DataFrame({
+        "debut": debut, "career": career, "pitcher": pitcher,
+        "contact": talent[:, 0], "power": talent[:, 1], "eye": talent[:, 2], "speed": talent[:, 3],
+        # Playing time follows how good a hitter is, so counts (HR, SO, BB) rise with PA together
+        "quality": 0.55 * talent[:, 0] + 0.55 * talent[:, 1] + 0.3 * talent[:, 2] + 0.4 * rng.standard_normal(n),
+        "birth": debut - np.clip(np.round(rng.normal(23.5, 2.0, n)), 19, 30).astype(int),
+        "position": rng.choice(FIELD_POSITIONS, size=n),
+        "team_key": rng.integers(1 << 30, size=n),
+        "stint": 1 + rng.geometric(0.35, n),  # Seasons with a team before moving on
+        "Player": [f"{FIRST_NAMES[f]} {LAST_NAMES[l]}" for f, l in zip(first, last)],
+        "bats": bats,
+    })
+    stems = np.array([[id_stem(l, f) for l in LAST_NAMES] for f in FIRST_NAMES])  # Every first/last pair once
+    stems = pd.Series(stems[first, last])
+    pool["Player-additional"] = stems + (stems.groupby(stems).cumcount() + 1).map("{:02d}".format)
+    return pool
+
+
+def teams_for(year):
+    return [(code, lg) for code, lg, start, end in TEAMS if start <= year <= end]
+
+
+# Sort by PA like the exports and number the players (traded players' team rows share their total's Rk)
+def rank_rows(df):
+    df = df.sort_values(["PA", "Player"], ascending=[False, True], kind="stable")
+    df["Rk"] = np.arange(1, len(df) + 1)
+    return df
+
+
+# Rate stats for a season's rows, plus the league numbers OPS+ and Rbat+ are relative to
+def add_rates(df, league=None):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ab = df["AB"].to_numpy(float)
+        on_base_den = (df["AB"] + df["BB"] + df["HBP"] + df["SF"]).to_numpy(float)
+        df["BA"] = np.where(ab > 0, df["H"] / ab, np.nan).round(3)
+        df["OBP"] = np.where(on_base_den > 0, (df["H"] + df["BB"] + df["HBP"]) / on_base_den, np.nan).round(3)
+        df["SLG"] = np.where(ab > 0, df["TB"] / ab, np.nan).round(3)
+        df["OPS"] = (df["OBP"] + df["SLG"]).round(3)
+        singles = df["H"] - df["2B"] - df["3B"] - df["HR"]
+        woba_den = (df["AB"] + df["BB"] - df["IBB"] + df["SF"] + df["HBP"]).to_numpy(float)
+        woba = (0.69 * (df["BB"] - df["IBB"]) + 0.72 * df["HBP"] + 0.89 * singles + 1.27 * df["2B"]
+                + 1.62 * df["3B"] + 2.1 * df["HR"])
+        df["rOBA"] = np.where(woba_den > 0, woba / woba_den, np.nan).round(3)
+        if league is None:
+            totals = df.sum(numeric_only=True)
+            league = {"BA": totals["H"] / totals["AB"],
+                      "OBP": (totals["H"] + totals["BB"] + totals["HBP"])
+                      / (totals["AB"] + totals["BB"] + totals["HBP"] + totals["SF"]),
+                      "SLG": totals["TB"] / totals["AB"]}
+            league["rOBA"] = float(np.nansum(woba) / np.nansum(woba_den))
+        df["OPS+"] = np.round(100 * (df["OBP"] / league["OBP"] + df["SLG"] / league["SLG"] - 1))
+        df["Rbat+"] = np.round(100 + 1.25 * 100 * (df["rOBA"] - league["rOBA"]) / league["rOBA"])
+    return df, league
+
+
+# Per-player rates around a league rate: exp(lift) spreads players out, then everything is scaled so the
+# PA-weighted average of the regulars (100+ PA) lands on the league rate again (capped so nobody hits 90 HR)
+def around(rate, lift, weights):
+    spread = np.exp(np.clip(lift, -1.5, 1.0))
+    return rate * spread / np.average(spread, weights=weights) if weights.sum() > 0 else rate * spread
+
+
+# Counting stats drawn one after another from the talents and the season's league rates
+def season_counts(rng, players, year, american_league):
+    rates = era(year)
+    n = len(players)
+    age = year - players["birth"].to_numpy()
+    aging = -0.006 * (age - 28) ** 2  # Peak around 27-29
+    noise = lambda scale: scale * rng.standard_normal(n)
+    contact = players["contact"].to_numpy() + aging + noise(0.3)
+    power = players["power"].to_numpy() + aging + noise(0.3)
+    eye = players["eye"].to_numpy() + noise(0.3)
+    speed = players["speed"].to_numpy() + 1.5 * aging + noise(0.3)
+    pitcher = players["pitcher"].to_numpy()
+    quality = players["quality"].to_numpy() + aging + noise(0.5)
+
+    # Plate appearances: everyday players get 500-750, bench players a few dozen to a few hundred
+    games = 154 if year < 1961 else 162
+    share = 1 / (1 + np.exp(-(1.7 * quality + 0.2)))
+    pa = np.round(games * 4.5 * share ** 1.6 * rng.uniform(0.6, 1.05, n))
+    pitcher_pa = np.round(rng.gamma(0.7, 28, n) * np.where(american_league & (year >= 1973), 0.05, 1.0))  # DH
+    pa = np.where(pitcher, np.minimum(pitcher_pa, 110), pa).astype(int)
+    regulars = np.where(~pitcher & (pa >= 100), pa, 0)
+
+    # Per-PA rates for each player (pitchers hit much worse)
+    k = around(rates["k"], 0.25 * power - 0.30 * contact - 0.10 * eye, regulars) * np.where(pitcher, 2.4, 1.0)
+    bb = around(rates["bb"], 0.30 * eye + 0.10 * power, regulars) * np.where(pitcher, 0.45, 1.0)
+    hr = around(rates["hr"], 0.45 * power, regulars) * np.where(pitcher, 0.15, 1.0)
+    babip_lift = 0.018 * contact + 0.008 * speed
+    babip = rates["babip"] + babip_lift - np.average(babip_lift, weights=regulars) - np.where(pitcher, 0.08, 0.0)
+    hbp = rates["hbp"] * np.exp(noise(0.5))
+    sh = rates["sh"] * np.exp(-0.5 * power) * np.where(pitcher, 6.0, 1.0)
+    clip = lambda p: np.clip(p, 0.0, 0.95)
+
+    out = {"PA": pa}
+    out["BB"] = rng.binomial(pa, clip(bb))
+    out["HBP"] = rng.binomial(pa - out["BB"], clip(hbp))
+    out["SH"] = rng.binomial(pa - out["BB"] - out["HBP"], clip(sh))
+    out["SF"] = rng.binomial(pa - out["BB"] - out["HBP"] - out["SH"], 0.008)
+    out["IBB"] = rng.binomial(out["BB"], clip(0.07 * np.exp(0.8 * power)))
+    ab = pa - out["BB"] - out["HBP"] - out["SH"] - out["SF"]
+    out["AB"] = ab
+    used = clip(bb + hbp + sh)
+    out["SO"] = rng.binomial(ab, clip(k / (1 - used)))
+    out["HR"] = rng.binomial(ab - out["SO"], clip(hr / np.maximum(1 - used - k, 0.05)))
+    in_play_hits = rng.binomial(ab - out["SO"] - out["HR"], clip(babip))
+    out["2B"] = rng.binomial(in_play_hits, clip(rates["double"] * np.exp(0.2 * power)))
+    out["3B"] = rng.binomial(in_play_hits - out["2B"], clip(rates["triple"] * np.exp(0.5 * speed)))
+    out["H"] = in_play_hits + out["HR"]
+    out["TB"] = out["H"] + out["2B"] + 2 * out["3B"] + 3 * out["HR"]
+    on_base = out["H"] + out["BB"] + out["HBP"]
+    out["R"] = rng.binomial(on_base - out["HR"], clip(0.30 + 0.06 * speed)) + out["HR"]
+    out["RBI"] = rng.binomial(out["H"], clip(0.25 + 0.08 * power)) + out["HR"]
+    attempts = rng.binomial(on_base - out["HR"] - out["2B"] - out["3B"], clip(rates["sb"] / 0.25 * np.exp(0.9 * speed)))
+    out["SB"] = rng.binomial(attempts, clip(0.68 + 0.05 * speed))
+    out["CS"] = attempts - out["SB"]
+    out["GIDP"] = rng.binomial(ab - out["SO"], clip(0.022 * np.exp(-0.4 * speed)))
+    games_played = np.where(pitcher, rng.integers(5, 75, n), np.round(pa / 4.1 + rng.normal(5, 4, n)))
+    out["G"] = np.clip(games_played, 1, games).astype(int)
+    out["Age"] = age
+    return pd.DataFrame(out, index=players.index)
+
+
+# Position column like the exports: "*6/H" for an everyday shortstop, "/1" for a pitcher who barely played
+def position_strings(rng, players, counts, year):
+    n = len(players)
+    pos = players["position"].to_numpy().astype(object)
+    if year >= 1973:  # Some hitters are mostly designated hitters
+        pos = np.where((players["position"].isin(["3", "7", "9"]) & (rng.random(n) < 0.15)).to_numpy(), "D", pos)
+    g = counts["G"].to_numpy()
+    regular = g >= 100
+    tail = np.where(rng.random(n) < 0.45, "/H", "")
+    hitter = np.where(regular, "*" + pos + tail, np.where(g >= 30, pos + "/H", "/" + pos + "H"))
+    pitcher = np.where(g >= 20, "1", "/1")
+    return np.where(players["pitcher"].to_numpy(), pitcher, hitter)
+
+
+# All rows for one season, in the same layout (and order) as the export for that season
+def season_rows(seed, pool, year):
+    rng = np.random.default_rng([seed, year])
+    players = pool[(pool["debut"] <= year) & (year < pool["debut"] + pool["career"])]
+
+    # Team for this stint; the key picks among the teams that existed that season
+    teams = teams_for(year)
+    stint = (year - players["debut"].to_numpy()) // players["stint"].to_numpy()
+    team_idx = (players["team_key"].to_numpy() + stint * 7919) % len(teams)
+    leagues = np.array([teams[i][1] for i in team_idx])
+    counts = season_counts(rng, players, year, leagues == "AL")
+    df = pd.DataFrame({
+        "Player": (players["Player"] + players["bats"]).to_numpy(),
+        "Team": [teams[i][0] for i in team_idx], "Lg": leagues,
+        "Player-additional": players["Player-additional"].to_numpy(),
+    })
+    for col in ["Age"] + COUNTS:
+        df[col] = counts[col].to_numpy()
+    df["Pos"] = position_strings(rng, players, counts, year)
+    df, league = add_rates(df)
+
+    # WAR: batting above average plus playing time, with some noise (pitchers' batting barely counts)
+    per_600 = df["PA"] / 600
+    war = (np.nan_to_num(df["OPS+"].to_numpy(float), nan=60) - 90) / 30 * per_600 + 1.2 * per_600 \
+        + 0.6 * rng.standard_normal(len(df)) * np.sqrt(per_600)
+    df["WAR"] = np.where(players["pitcher"].to_numpy(), np.round(rng.normal(0.5, 1.2, len(df)), 1),
+                         np.round(war, 1))
+
+    # All-Stars and MVP votes for the best players in each league
+    df["Awards"] = ""
+    qualified = df["PA"] >= 3.1 * (154 if year < 1961 else 162)
+    for lg in df["Lg"].unique():
+        best = df[qualified & (df["Lg"] == lg)].sort_values("WAR", ascending=False)
+        n_stars = 3 * sum(team_lg == lg for _, team_lg in teams)  # About three All-Stars per team
+        df.loc[best.index[:n_stars], "Awards"] = "AS"
+        for rank, idx in enumerate(best.index[:10], 1):
+            df.loc[idx, "Awards"] = df.loc[idx, "Awards"] + f"MVP-{rank}"
+
+    # About 6% of everyday and part-time players are traded: a 2TM total row plus one row per team
+    df = rank_rows(df)
+    traded = df[(df["PA"] >= 40) & (rng.random(len(df)) < 0.06)]
+    splits = []
+    if len(traded):
+        first_share = rng.uniform(0.2, 0.8, len(traded))
+        other = (team_idx[traded.index.to_numpy()] + rng.integers(1, len(teams), len(traded))) % len(teams)
+        for part, share in ((0, first_share), (1, 1 - first_share)):
+            part_rows = traded.copy()
+            for col in COUNTS:
+                first_part = np.floor(traded[col].to_numpy() * first_share).astype(int)
+                part_rows[col] = first_part if part == 0 else traded[col].to_numpy() - first_part
+            if part == 1:
+                part_rows["Team"] = [teams[i][0] for i in other]
+                part_rows["Lg"] = [teams[i][1] for i in other]
+            part_rows["WAR"] = np.round(traded["WAR"].to_numpy() * share, 1)
+            part_rows["Pos"] = part_rows["Pos"].str.lstrip("*")
+            part_rows["Awards"] = ""
+            part_rows, _ = add_rates(part_rows, league)
+            part_rows["order"] = part + 1
+            splits.append(part_rows)
+        same_league = [teams[i][1] for i in other] == traded["Lg"].to_numpy()
+        df.loc[traded.index, "Lg"] = np.where(same_league, traded["Lg"], "2LG")
+        df.loc[traded.index, "Team"] = "2TM"
+    df["order"] = 0
+    df = pd.concat([df] + splits).sort_values(["Rk", "order"], kind="stable").drop(columns="order")
+
+    # League Average row at the bottom, with only the rate columns filled in like the exports
+    average = {"Player": "League Average", "BA": round(league["BA"], 3), "OBP": round(league["OBP"], 3),
+               "SLG": round(league["SLG"], 3), "OPS+": 100, "rOBA": round(league["rOBA"], 3), "Rbat+": 100,
+               "Player-additional": LEAGUE_AVERAGE_ID}
+    average["OPS"] = round(average["OBP"] + average["SLG"], 3)
+    df = pd.concat([df, pd.DataFrame([average])], ignore_index=True)
+
+    columns = COLUMNS if year >= SF_FROM else [c for c in COLUMNS if c != "SF"]
+    df = df.reindex(columns=columns)
+    for col in columns:
+        if col not in ("Player", "Team", "Lg", "Pos", "Awards", "Player-additional", "WAR", "BA", "OBP", "SLG",
+                       "OPS", "rOBA"):
+            df[col] = df[col].astype("Int64")  # Whole numbers, blank for the League Average row
+    df["Awards"] = df["Awards"].replace("", np.nan)
+    return df
+
+
+# A season's file contents, the way the exports look: comma separated, "\n" line ends, BOM on newer files
+# (player rows go out as plain ints where nothing is blank, which pandas writes much faster than Int64,
+# then the League Average row)
+def season_csv(df, year):
+    players = df.iloc[:-1]
+    ints = {col: "int64" for col in df.columns if df[col].dtype == "Int64" and players[col].notna().all()}
+    text = players.astype(ints).to_csv(index=False, lineterminator="\n", float_format="%g") \
+        + df.iloc[-1:].to_csv(index=False, header=False, lineterminator="\n", float_format="%g")
+    return (BOM if year >= BOM_FROM else b"") + text.encode("utf-8")
+
+
+# Write every season between first_year and last_year; returns the number of player rows written
+def generate(out, seed=42, scale=1.0, first_year=FIRST_YEAR, last_year=LAST_YEAR, decades_only=False):
+    data_dir = os.path.join(out, "data")
+    season_dir = os.path.join(out, "data_combined")
+    os.makedirs(data_dir, exist_ok=True)
+    if not decades_only:
+        os.makedirs(season_dir, exist_ok=True)
+    pool = player_pool(seed, scale)
+    rows = 0
+    for year in range(first_year, last_year + 1):
+        if decades_only and year % 10:
+            continue
+        df = season_rows(seed, pool, year)
+        rows += len(df) - 1
+        contents = season_csv(df, year)
+        paths = [] if decades_only else [os.path.join(season_dir, f"{year}stats.csv")]
+        if year % 10 == 0:
+            paths.append(os.path.join(data_dir, f"{year}stats.csv"))
+        for path in paths:
+            with open(path, "wb") as f:
+                f.write(contents)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic stats files in the Baseball-Reference export format")
+    parser.add_argument("--out", default="synthetic_data", help="folder to write data/ and data_combined/ into")
+    parser.add_argument("--seed", type=int, default=42, help="same seed, same files")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="players per season compared with the real files (25 gives about 1.4 million rows)")
+    parser.add_argument("--first-year", type=int, default=FIRST_YEAR)
+    parser.add_argument("--last-year", type=int, default=LAST_YEAR)
+    parser.add_argument("--decades-only", action="store_true", help="only write the decade files")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = generate(args.out, args.seed, args.scale, args.first_year, args.last_year, args.decades_only)
+    print(f"Wrote {rows} player rows to {args.out} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,116 @@
+# Small OpenAI-compatible server for trying the chatbot without an API key
+# Answers POST /v1/chat/completions (streamed or not) with a made-up answer, one word at a time
+# Run it, then point the chatbot at it:
+#   python mock_openai_server.py --port 8001
+#   OPENAI_BASE_URL=http://127.0.0.1:8001/v1 streamlit run main.py   (any OPENAI_API_KEY works)
+import argparse
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FILLER = ("Looking at the data summary, batting averages stayed fairly steady while strikeouts rose "
+          "decade after decade and home runs per plate appearance climbed after the late 1980s.")
+
+
+# Made-up answer that mentions the question so it's easy to tell answers apart
+def make_answer(prompt, words):
+    question = prompt.split("QUESTION:")[-1].split("Answer:")[0].strip() or prompt.strip()
+    text = f"(stub) You asked: {question}. " + FILLER
+    return text.split(" ")[:max(words, 1)] if words else text.split(" ")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.02  # Seconds between streamed words
+    latency = 0.0  # Seconds before the first word
+    words = 0  # Number of words in each answer (0 = the whole answer)
+    lock = threading.Lock()
+    requests_served = 0
+
+    def log_message(self, *args):
+        pass  # Keep the console quiet
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self.send_json(200, {"object": "list", "data": [{"id": "gpt-3.5-turbo", "object": "model"}]})
+        else:
+            self.send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+        model = body.get("model", "gpt-3.5-turbo")
+        words = make_answer(prompt, self.words)
+        with self.lock:
+            StubHandler.requests_served += 1
+            request_id = f"chatcmpl-stub-{StubHandler.requests_served}"
+        time.sleep(self.latency)
+
+        if not body.get("stream"):
+            time.sleep(self.delay * len(words))
+            self.send_json(200, {
+                "id": request_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": " ".join(words)}}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(words),
+                          "total_tokens": len(prompt) // 4 + len(words)}
+            })
+            return
+
+        # Server-sent events, one word per chunk, like the real streaming API
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def send_chunk(delta, finish_reason=None):
+            chunk = {"id": request_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            send_chunk({"role": "assistant", "content": ""})
+            for i, word in enumerate(words):
+                send_chunk({"content": word if i == 0 else " " + word})
+                time.sleep(self.delay)
+            send_chunk({}, "stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client stopped reading (for example the question was cancelled)
+
+
+def serve(port=8001, host="127.0.0.1", delay=0.02, latency=0.0, words=0):
+    StubHandler.delay, StubHandler.latency, StubHandler.words = delay, latency, words
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stub for the chatbot")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds between streamed words")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first word")
+    parser.add_argument("--words", type=int, default=0, help="words per answer (0 = the whole stub answer)")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.host, args.delay, args.latency, args.words)
+    print(f"Stub OpenAI server on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
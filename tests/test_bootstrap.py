@@ -0,0 +1,95 @@
+import hashlib  # for the expected checksums
+import http.server  # for the local test server
+import os  # for checking the data folder
+import threading  # to run the server next to the test
+import pytest  # for the fixtures
+from baseball_pages import bootstrap
+
+FILES = {"1950stats.csv": b"Rk,Player,HR\n1,Ralph Kiner,47\n", "1960stats.csv": b"Rk,Player,HR\n1,Roger Maris,61\n"}
+CHECKSUMS = {name: hashlib.sha256(body).hexdigest() for name, body in FILES.items()}
+
+
+# Serves FILES with an ETag, answers 304 when the ETag is sent back, and can cut a download short
+class Handler(http.server.BaseHTTPRequestHandler):
+    requests_seen = []
+    truncate = set()  # File names sent with only half their bytes
+
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        self.requests_seen.append(name)
+        body = FILES.get(name)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{CHECKSUMS[name][:8]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body[:len(body) // 2] if name in self.truncate else body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.requests_seen, Handler.truncate = [], set()
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def ensure(url, data_dir, checksums=CHECKSUMS, **kwargs):
+    return bootstrap.ensure_data(list(FILES), url, str(data_dir), checksums=checksums, **kwargs)
+
+
+def test_download_then_not_modified(server, tmp_path):
+    assert ensure(server, tmp_path) == {name: ("downloaded", "") for name in FILES}
+    for name, body in FILES.items():
+        assert (tmp_path / name).read_bytes() == body
+
+    assert ensure(server, tmp_path) == {name: ("cached", "") for name in FILES}  # Checked recently
+    Handler.requests_seen.clear()
+    assert ensure(server, tmp_path, max_age=0) == {name: ("not modified", "") for name in FILES}
+    assert sorted(Handler.requests_seen) == sorted(FILES)
+
+
+def test_truncated_download_is_thrown_away(server, tmp_path):
+    Handler.truncate = {"1960stats.csv"}
+    results = ensure(server, tmp_path)
+    assert results["1950stats.csv"] == ("downloaded", "")
+    assert results["1960stats.csv"][0] == "error"
+    assert sorted(os.listdir(tmp_path)) == [".downloads.json", "1950stats.csv"]  # No partial file left
+
+
+def test_checksum_mismatch_is_thrown_away(server, tmp_path):
+    results = ensure(server, tmp_path, checksums=dict(CHECKSUMS, **{"1950stats.csv": "0" * 64}))
+    assert results["1950stats.csv"] == ("error", "checksum mismatch")
+    assert not (tmp_path / "1950stats.csv").exists()
+    assert results["1960stats.csv"] == ("downloaded", "")
+
+
+def test_local_files_are_never_replaced(server, tmp_path):
+    (tmp_path / "1950stats.csv").write_bytes(b"built locally\n")  # No download record
+    ensure(server, tmp_path)
+    (tmp_path / "1960stats.csv").write_bytes(b"edited\n")  # Downloaded, then changed
+    Handler.requests_seen.clear()
+    results = ensure(server, tmp_path, max_age=0)
+    assert results["1960stats.csv"] == ("local", "")
+    assert Handler.requests_seen == []
+    assert (tmp_path / "1950stats.csv").read_bytes() == b"built locally\n"
+    assert (tmp_path / "1960stats.csv").read_bytes() == b"edited\n"
+
+
+def test_checked_in_checksums_match_the_decade_files():
+    checksums = bootstrap.load_checksums()
+    for name, expected in checksums.items():
+        assert bootstrap.file_sha256(os.path.join("data", name)) == expected
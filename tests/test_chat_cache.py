@@ -0,0 +1,35 @@
+import pytest  # for the parametrized pairs
+from baseball_pages.chat_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "responses.sqlite"))
+
+
+# Saves an answer for `saved`, then looks up `asked` (a different prompt, so only a similar match can hit)
+def lookup(cache, saved, asked, context="1998"):
+    cache.put(saved, "prompt: " + saved, "v1", "saved answer", context)
+    return cache.get(asked, "prompt: " + asked, "v1", context)
+
+
+def test_reworded_question_reuses_the_answer(cache):
+    assert lookup(cache, "Who hit the most home runs in 1998?",
+                  "Who hit the most home runs in 1998") == ("saved answer", "similar")
+
+
+@pytest.mark.parametrize("saved, asked", [
+    ("Which players had the highest batting average, on base percentage and slugging percentage in 1998?",
+     "Which players had the lowest batting average, on base percentage and slugging percentage in 1998?"),
+    ("Did Ken Griffey Jr. hit more home runs than Barry Bonds in 1997?",
+     "Did Ken Griffey Sr. hit more home runs than Barry Bonds in 1997?"),
+    ("Who hit the most home runs in 1998?", "Who hit the most home runs in 1999?"),
+    ("Who had the most walks and home runs in 1998?", "Who had the most strikeouts and home runs in 1998?"),
+])
+def test_opposite_questions_dont_share_answers(cache, saved, asked):
+    assert lookup(cache, saved, asked) is None
+
+
+def test_different_players_dont_share_answers(cache):
+    cache.put("How did Ken Griffey hit in 1990?", "prompt a", "v1", "Jr.'s answer", "1990|griffke02")
+    assert cache.get("How did Ken Griffey hit in 1990", "prompt b", "v1", "1990|griffke01") is None
@@ -0,0 +1,54 @@
+import pandas as pd  # for the small test frame
+import pytest  # for the parametrized questions
+from baseball_pages.chat_query import QueryEngine, parse_question
+
+
+@pytest.fixture(scope="module")
+def engine():
+    yearly_df = pd.DataFrame({
+        "Player": ["Mark McGwire", "Sammy Sosa", "Barry Bonds*", "League Average"],
+        "Player-additional": ["mcgwima01", "sosasa01", "bondsba01", "-9999"],
+        "Team": ["STL", "CHC", "SFG", None],
+        "Year": [1998, 1998, 2001, 1998],
+        "PA": [681, 722, 664, 300],
+        "AB": [509, 643, 476, 270],
+        "HR": [70, 66, 73, 8],
+        "SO": [155, 171, 93, 50],
+        "K%": [0.228, 0.237, 0.140, 0.167],
+        "BA": [0.299, 0.308, 0.328, 0.260],
+    })
+    return QueryEngine(yearly_df)
+
+
+@pytest.mark.parametrize("question, intent, label", [
+    ("Who led MLB in HR in 1998?", "leaderboard", "1998"),
+    ("Top 5 K% in the 1990s", "leaderboard", "the 1990s"),
+    ("Average K% in 1968", "average", "1968"),
+    ("League batting average between 1990 and 1995", "average", "1990-1995"),
+    ("Who hit the most home runs?", "leaderboard", "1950-2010"),
+])
+def test_questions_answered_locally(engine, question, intent, label):
+    parsed = parse_question(question, engine)
+    assert (parsed["intent"], parsed["label"]) == (intent, label)
+
+
+@pytest.mark.parametrize("question", [
+    # Teams, per-game numbers and several separate years
+    "What was the most home runs by a team in 1998?",
+    "Who hit the most triples for the Yankees in 1955?",
+    "Average strikeouts per game in 1968",
+    "most HR in 1998 and 2001",
+    # Time periods the parser doesn't understand
+    "Who hit the most home runs in the 90s?",
+    "Who hit the most home runs in the '90s?",
+    "Who hit the most home runs in the 2010s?",
+    "Who hit the most home runs since 2000?",
+    "Who hit the most home runs before 1960?",
+    "Who hit the most home runs after 1990?",
+    "Who hit the most home runs until 1970?",
+    "Who hit the most home runs in the early 1970s?",
+    "Who hit the most home runs in the last 5 years?",
+    "Who hit the most home runs in 1945?",
+])
+def test_questions_left_for_gpt(engine, question):
+    assert parse_question(question, engine) is None
@@ -0,0 +1,49 @@
+import threading  # to run the stub server next to the test
+import pytest  # for the fixtures
+import mock_openai_server
+from baseball_pages import chat_stream
+from baseball_pages.chat_cache import ResponseCache
+
+PROMPT = "QUESTION:\nWho hit the most home runs in 1998?\nAnswer:"
+
+
+@pytest.fixture(scope="module")
+def client():
+    server = mock_openai_server.serve(port=0, delay=0.001)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield chat_stream.make_client("not-needed", f"http://127.0.0.1:{server.server_port}/v1")
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_hands_back_the_whole_answer(client):
+    done = []
+    pieces = list(chat_stream.stream_answer(client, PROMPT, on_done=done.append))
+    expected = " ".join(mock_openai_server.make_answer(PROMPT, 0))
+    assert len(pieces) > 1  # Streamed a word at a time
+    assert "".join(pieces) == expected
+    assert done == [expected]
+
+
+def test_closed_stream_is_not_reported_as_done(client):
+    done = []
+    pieces = chat_stream.stream_answer(client, PROMPT, on_done=done.append)
+    assert next(pieces).startswith("(stub)")
+    pieces.close()  # What the page does when a new question interrupts the answer
+    assert done == []
+
+
+# The chatbot page saves an answer through on_done, so only finished answers end up in the cache
+def test_only_finished_answers_are_cached(client, tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"))
+
+    def save(answer):
+        cache.put("Who hit the most home runs in 1998?", PROMPT, "v1", answer, "1998")
+
+    pieces = chat_stream.stream_answer(client, PROMPT, on_done=save)
+    next(pieces)
+    pieces.close()
+    assert len(cache) == 0
+
+    answer = "".join(chat_stream.stream_answer(client, PROMPT, on_done=save))
+    assert cache.get("Who hit the most home runs in 1998?", PROMPT, "v1", "1998") == (answer, "exact")
@@ -0,0 +1,60 @@
+import os  # for the scratch folders
+import pandas as pd  # for reading the outputs back
+import combine_yearly_data as combine
+from baseball_pages import cube
+
+HEADER = "Rk,Player,Age,Team,Lg,G,PA,AB,H,HR,BB,SO,BA,Pos,Player-additional\n"
+
+
+# A small season file: one row per player plus the League Average row
+def write_season(folder, year, hr):
+    rows = [f"1,Ralph Kiner,27,PIT,NL,150,672,547,149,{hr},122,79,0.272,*7,kinerra01",
+            "2,Al Rosen,26,CLE,AL,155,668,554,159,37,100,72,0.287,*5/H,rosenal01",
+            "3,Joe Bench,30,NYY,AL,40,60,55,12,1,4,10,0.218,H,benchjo01",
+            ",League Average,28,,,60,250,220,57,5,22,25,0.259,,-9999"]
+    with open(os.path.join(folder, f"{year}stats.csv"), "w") as f:
+        f.write(HEADER + "\n".join(rows) + "\n")
+
+
+# Point the script at a scratch copy of the folders
+def use_scratch_folders(tmp_path, monkeypatch):
+    seasons, data = tmp_path / "data_combined", tmp_path / "data"
+    seasons.mkdir()
+    data.mkdir()
+    monkeypatch.setattr(combine, "folder_path", str(seasons))
+    monkeypatch.setattr(combine, "full_output_path", str(data / "all.csv"))
+    monkeypatch.setattr(combine, "starters_output_path", str(data / "starters.csv"))
+    monkeypatch.setattr(combine, "manifest_path", str(data / "manifest.json"))
+    monkeypatch.setattr(cube, "YEARLY_CUBE", str(data / "cache" / "cube.parquet"))
+    return str(seasons)
+
+
+def test_editing_the_last_season_replaces_its_rows(tmp_path, monkeypatch):
+    seasons = use_scratch_folders(tmp_path, monkeypatch)
+    write_season(seasons, 1950, 54)
+    write_season(seasons, 1951, 47)
+    combine.combine_incremental(combine.find_season_files())
+
+    write_season(seasons, 1951, 42)  # Correct the newest season
+    os.utime(os.path.join(seasons, "1951stats.csv"), ns=(1, 1))  # Make sure the size / time check sees it
+    combine.combine_incremental(combine.find_season_files())
+
+    full = pd.read_csv(combine.full_output_path)
+    assert (full["Year"] == 1951).sum() == 4
+    assert full.loc[(full["Year"] == 1951) & (full["Player-additional"] == "kinerra01"), "HR"].tolist() == [42]
+    assert len(pd.read_csv(combine.starters_output_path)) == 6  # Kiner, Rosen and the average row, twice
+    yearly_cube = pd.read_parquet(cube.YEARLY_CUBE)
+    assert yearly_cube.loc[yearly_cube["Year"] == 1951, "Players"].sum() == 4
+
+
+def test_new_later_season_is_appended(tmp_path, monkeypatch):
+    seasons = use_scratch_folders(tmp_path, monkeypatch)
+    write_season(seasons, 1950, 54)
+    combine.combine_incremental(combine.find_season_files())
+    write_season(seasons, 1951, 47)
+    combine.combine_incremental(combine.find_season_files())
+
+    full = pd.read_csv(combine.full_output_path)
+    assert full["Year"].tolist() == [1950] * 4 + [1951] * 4
+    yearly_cube = pd.read_parquet(cube.YEARLY_CUBE)
+    assert yearly_cube.groupby("Year")["Players"].sum().tolist() == [4, 4]
@@ -0,0 +1,16 @@
+from baseball_pages.pages import COLD_START_BUDGET_MS, DEFAULT_PAGE, PAGES, STARTUP_MODULES, measure_imports
+
+HEAVY_PACKAGES = ["sklearn", "openai", "plotly"]  # Only the pages that need them should import these
+
+
+# A new visitor pays for main.py's startup imports plus the default page, in a fresh interpreter
+def test_cold_start_fits_the_budget():
+    total, packages = measure_imports(STARTUP_MODULES + [PAGES[DEFAULT_PAGE]], startup=[])
+    assert total < COLD_START_BUDGET_MS, f"cold start took {total:.0f} ms: {packages}"
+
+
+# Streamlit itself imports plotly (for its chart theme), so this checks what the app's modules add on top of it
+def test_startup_skips_the_heavy_packages():
+    app_modules = [m for m in STARTUP_MODULES if m != "streamlit"] + [PAGES[DEFAULT_PAGE]]
+    _, packages = measure_imports(app_modules, startup=["streamlit"])
+    assert not [name for name in HEAVY_PACKAGES if name in packages]
@@ -0,0 +1,78 @@
+import pandas as pd  # for the small test frames
+from baseball_pages.player_index import NameSearch, PlayerIndex
+
+STATS = ["BA", "HR/PA"]
+
+
+# Two players with decade rows and one who only shows up in the season data
+def make_index():
+    player_df = pd.DataFrame({
+        "Player": ["Barry Bonds*", "Barry Bonds*", "Tony Gwynn*"],
+        "Player-additional": ["bondsba01", "bondsba01", "gwynnto01"],
+        "Decade": [1990, 2000, 1990],
+        "PA": [6000, 4000, 5500],
+        "Hitter Type": ["Power Hitter", "Power Hitter", "Contact Hitter"],
+        "BA": [0.302, 0.322, 0.344],
+        "HR/PA": [0.060, 0.078, 0.010],
+    })
+    yearly_df = pd.DataFrame({
+        "Player": ["Barry Bonds*", "Joe Smith"],
+        "Player-additional": ["bondsba01", "smithjo99"],
+        "Year": [2001, 1955],
+        "PA": [664, 12],
+        "BA": [0.328, 0.250],
+        "HR/PA": [0.110, 0.0],
+    })
+    return PlayerIndex(player_df, yearly_df)
+
+
+def test_best_row_picks_the_decade_with_the_most_pa():
+    row = make_index().best_row("bondsba01")
+    assert row["Decade"] == 1990
+
+
+def test_yearly_only_player_has_no_best_row():
+    index = make_index()
+    assert "smithjo99" in index
+    assert "smithjo99" not in index.decade_pos
+    assert index.best_row("smithjo99") is None
+
+
+def test_compare_skips_yearly_only_players():
+    table = make_index().compare(["bondsba01", "smithjo99", "gwynnto01"], STATS,
+                                 ["Power Hitter", None, "Contact Hitter"])
+    assert list(table.columns) == ["Stat", "Barry Bonds (1990s)", "Tony Gwynn (1990s)"]
+    assert table["Tony Gwynn (1990s)"].tolist() == [0.344, 0.010]
+
+
+# Season rows for a few players whose last names are also first names or cities
+def make_search():
+    names = {"walkela01": "Larry Walker*", "evansdw01": "Dwight Evans", "bostoda01": "Daryl Boston*",
+             "mcgwima01": "Mark McGwire", "griffke02": "Ken Griffey Jr.*"}
+    yearly_df = pd.DataFrame({"Player": list(names.values()), "Player-additional": list(names),
+                              "Year": [1997] * len(names), "PA": [600] * len(names)})
+    return NameSearch(PlayerIndex(pd.DataFrame(), yearly_df))
+
+
+def test_find_full_names_and_typos():
+    search = make_search()
+    assert search.find("Did Larry Walker hit well in 1997?") == ["walkela01"]
+    assert search.find("Did Ken Griffey hit more than Mark McGwir?") == ["griffke02", "mcgwima01"]
+
+
+def test_find_ignores_last_names_on_their_own():
+    search = make_search()
+    assert search.find("Did Walker Evans hit well?") == []
+    assert search.find("Who led the Boston Red Sox in hits in 1967?") == []
+
+
+# Father and son, labelled with and without the Sr. the way the season files have both
+def test_find_jr_and_sr():
+    for sr_label in ["Ken Griffey Sr.*", "Ken Griffey*"]:
+        names = {"griffke01": sr_label, "griffke02": "Ken Griffey Jr.*"}
+        yearly_df = pd.DataFrame({"Player": list(names.values()), "Player-additional": list(names),
+                                  "Year": [1990, 1990], "PA": [100, 666]})
+        search = NameSearch(PlayerIndex(pd.DataFrame(), yearly_df))
+        assert search.find("How did Ken Griffey Sr. hit in 1990?", [1990]) == ["griffke01"]
+        assert search.find("How did Ken Griffey Jr. hit in 1990?", [1990]) == ["griffke02"]
+        assert search.find("How did Ken Griffey hit in 1990?", [1990]) == ["griffke02"]  # Most PA that year